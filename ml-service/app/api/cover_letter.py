@@ -1,10 +1,24 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 import logging
 import json
+import time
 
-from app.services.cover_letter_generator import CoverLetterGenerator
+from app.services.cover_letter_generator import (
+    CoverLetterGenerator,
+    ParagraphGenerationError,
+    GENERATION_MODES,
+    PARALLEL,
+    COVER_LETTER_BATCH_MAX_LETTERS,
+)
+from app.services.executors import ExecutorSaturatedError
+from app.services.llm_scheduler import (
+    SchedulerSaturatedError,
+    DeadlineExceededError,
+    ClientDisconnectedError,
+)
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -23,6 +37,11 @@ def _ensure_json_structure(cover_letter_data: Dict) -> Dict:
     }
 
 
+def _sse(event: str, data: Dict) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
 # ------------------- Schemas -------------------
 
 class CoverLetterRequest(BaseModel):
@@ -31,6 +50,29 @@ class CoverLetterRequest(BaseModel):
     candidate_name: Optional[str] = Field(default="")
     temperature: Optional[float] = Field(default=0.7)
     max_tokens: Optional[int] = Field(default=1000)
+    # Seconds for queueing plus generation (default LLM_DEFAULT_DEADLINE)
+    deadline_seconds: Optional[float] = Field(default=None, gt=0)
+    # sequential or parallel (one concurrent decode per paragraph); default COVER_LETTER_MODE
+    mode: Optional[str] = Field(default=None)
+
+class CoverLetterBatchRequest(BaseModel):
+    resume_analysis: Dict[str, Any] = Field(...)
+    jobs: List[Dict[str, str]] = Field(...)
+    # Every job in each of these tones; default: each job's own tone
+    tones: Optional[List[str]] = Field(default=None)
+    candidate_name: Optional[str] = Field(default="")
+    # Seconds per letter once it enters the LLM queue (default LLM_DEFAULT_DEADLINE)
+    deadline_seconds: Optional[float] = Field(default=None, gt=0)
+
+class ParagraphRegenerateRequest(BaseModel):
+    resume_analysis: Dict[str, Any] = Field(...)
+    job_info: Dict[str, str] = Field(...)
+    # Structured letter as returned by /generate-cover-letter
+    cover_letter: Dict[str, Any] = Field(...)
+    # 0-based index into cover_letter.body
+    paragraph_index: int = Field(..., ge=0)
+    candidate_name: Optional[str] = Field(default="")
+    deadline_seconds: Optional[float] = Field(default=None, gt=0)
 
 class CoverLetterResponse(BaseModel):
     company_name: str
@@ -38,6 +80,9 @@ class CoverLetterResponse(BaseModel):
     tone: str
     cover_letter: Dict[str, Any]
 
+class ParagraphRegenerateResponse(CoverLetterResponse):
+    paragraph_index: int
+
 
 class HealthResponse(BaseModel):
     status: str
@@ -45,47 +90,79 @@ class HealthResponse(BaseModel):
     model: Optional[str] = None
     supported_models: Optional[List[str]] = None
     error: Optional[str] = None
+    monitor: Optional[Dict[str, Any]] = None
+    scheduler: Optional[Dict[str, Any]] = None
+    token_budget: Optional[Dict[str, Any]] = None
 
 
-# ------------------- Routes -------------------
+TONES = ["formal", "confident", "friendly"]
 
-@router.post("/generate-cover-letter", response_model=CoverLetterResponse)
-async def generate_cover_letter(request: CoverLetterRequest):
 
-    try:
-        # Validate resume fields actually used
-        for field in ["skills", "projects", "experience"]:
-            if field not in request.resume_analysis:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"resume_analysis missing required field: {field}"
-                )
-
-        # Validate job_info
-        for field in ["company_name", "job_title", "job_description"]:
-            if not request.job_info.get(field):
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"job_info missing required field: {field}"
-                )
-
-        tone = request.job_info.get("tone", "formal")
-        if tone not in ["formal", "confident", "friendly"]:
+def _validate_resume_analysis(resume_analysis: Dict) -> None:
+    # Validate resume fields actually used
+    for field in ["skills", "projects", "experience"]:
+        if field not in resume_analysis:
+            raise HTTPException(
+                status_code=400,
+                detail=f"resume_analysis missing required field: {field}"
+            )
+
+
+def _validate_job_info(job_info: Dict, name: str = "job_info") -> str:
+    """Validate a job_info and return its tone."""
+    for field in ["company_name", "job_title", "job_description"]:
+        if not job_info.get(field):
             raise HTTPException(
                 status_code=400,
-                detail="tone must be one of: formal, confident, friendly"
+                detail=f"{name} missing required field: {field}"
             )
 
+    return _validate_tone(job_info.get("tone", "formal"))
+
+
+def _validate_tone(tone: str) -> str:
+    if tone not in TONES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"tone must be one of: {', '.join(TONES)}"
+        )
+    return tone
+
+
+def _validate_request(request: CoverLetterRequest) -> str:
+    """Validate the fields generation relies on and return the tone."""
+    _validate_resume_analysis(request.resume_analysis)
+    tone = _validate_job_info(request.job_info)
+
+    if request.mode is not None and request.mode not in GENERATION_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"mode must be one of: {', '.join(GENERATION_MODES)}"
+        )
+    return tone
+
+
+# ------------------- Routes -------------------
+
+@router.post("/generate-cover-letter", response_model=CoverLetterResponse)
+async def generate_cover_letter(request: CoverLetterRequest, http_request: Request):
+
+    try:
+        tone = _validate_request(request)
+
         logger.info(
             "Generating cover letter for %s - %s",
             request.job_info["company_name"],
             request.job_info["job_title"]
         )
 
-        result = cover_letter_generator.generate_cover_letter(
+        result = await cover_letter_generator.generate_cover_letter(
             resume_analysis=request.resume_analysis,
             job_info=request.job_info,
             candidate_name=request.candidate_name,
+            deadline_seconds=request.deadline_seconds,
+            is_disconnected=http_request.is_disconnected,
+            mode=request.mode,
         )
 
         # Use request parameters if provided, otherwise defaults
@@ -94,10 +171,13 @@ async def generate_cover_letter(request: CoverLetterRequest):
 
         # Regenerate with user-specified parameters if needed
         if temp != 0.7 or max_tok != 1000:
-            result = cover_letter_generator.generate_cover_letter(
+            result = await cover_letter_generator.generate_cover_letter(
                 resume_analysis=request.resume_analysis,
                 job_info=request.job_info,
                 candidate_name=request.candidate_name,
+                deadline_seconds=request.deadline_seconds,
+                is_disconnected=http_request.is_disconnected,
+                mode=request.mode,
             )
             # Note: In production, you'd modify the LLM client to accept these params
             # For now, we'll use the defaults
@@ -112,18 +192,219 @@ async def generate_cover_letter(request: CoverLetterRequest):
             "cover_letter": structured_cover_letter,
         }
 
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
-    except ConnectionError as e:
+    except ClientDisconnectedError as e:
+        # Nobody is listening; the generation was cancelled
+        logger.info("Cover letter request abandoned: %s", e)
+        raise HTTPException(status_code=499, detail=str(e))
+    except DeadlineExceededError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except (ConnectionError, SchedulerSaturatedError, ExecutorSaturatedError) as e:
         raise HTTPException(status_code=503, detail=str(e))
+    except ParagraphGenerationError as e:
+        # The model answered, but not with a paragraph
+        raise HTTPException(status_code=502, detail=str(e))
     except Exception as e:
         logger.exception("Cover letter generation failed")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.post("/generate-cover-letter/stream")
+async def generate_cover_letter_stream(request: CoverLetterRequest):
+    """
+    Stream a cover letter as Server-Sent Events: `queue` events while
+    waiting for Ollama, `token` events as the LLM decodes, `section` events
+    as greeting/body/closing complete, then one `done` event with the same
+    payload as /generate-cover-letter plus timings (or an `error` event).
+    """
+    tone = _validate_request(request)
+    if request.mode == PARALLEL:
+        raise HTTPException(
+            status_code=400,
+            detail="parallel mode is not streamed; use /generate-cover-letter"
+        )
+
+    logger.info(
+        "Streaming cover letter for %s - %s",
+        request.job_info["company_name"],
+        request.job_info["job_title"]
+    )
+
+    # Disconnecting cancels this generator, which leaves the queue or closes the Ollama stream
+    events = cover_letter_generator.stream_cover_letter(
+        resume_analysis=request.resume_analysis,
+        job_info=request.job_info,
+        candidate_name=request.candidate_name,
+        deadline_seconds=request.deadline_seconds,
+    )
+
+    # The first event (queue position) follows fact selection; a full queue is a 503 before streaming
+    try:
+        first = await events.__anext__()
+    except (SchedulerSaturatedError, ExecutorSaturatedError) as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    async def event_stream():
+        try:
+            yield _sse(*first)
+            async for event, data in events:
+                if event == "done":
+                    data = {
+                        "company_name": request.job_info["company_name"],
+                        "job_title": request.job_info["job_title"],
+                        "tone": tone,
+                        "cover_letter": _ensure_json_structure(data["cover_letter"]),
+                        "timings": data["timings"],
+                    }
+                yield _sse(event, data)
+        except DeadlineExceededError as e:
+            yield _sse("error", {"detail": str(e)})
+        except Exception:
+            logger.exception("Cover letter streaming failed")
+            yield _sse("error", {"detail": "Cover letter generation failed"})
+        finally:
+            await events.aclose()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        # no caching or proxy buffering, so tokens reach the client as they arrive
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/generate-cover-letter/batch")
+async def generate_cover_letter_batch(request: CoverLetterBatchRequest):
+    """
+    Generate letters for many jobs and/or tones from one resume, streamed
+    as Server-Sent Events: one `letter` event per letter as soon as it is
+    finished (completion order; `index` is its position in jobs x tones),
+    then one `done` event with the batch totals (or an `error` event).
+    """
+    _validate_resume_analysis(request.resume_analysis)
+
+    if not request.jobs:
+        raise HTTPException(status_code=400, detail="jobs cannot be empty")
+    for tone in request.tones or []:
+        _validate_tone(tone)
+
+    # Tone variants of a job are adjacent, so their prompts follow each other
+    variants = []
+    for i, job_info in enumerate(request.jobs):
+        tone = _validate_job_info(job_info, f"jobs[{i}]")
+        variants += [{**job_info, "tone": t} for t in request.tones or [tone]]
+
+    if len(variants) > COVER_LETTER_BATCH_MAX_LETTERS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: at most {COVER_LETTER_BATCH_MAX_LETTERS} letters (jobs x tones) per request"
+        )
+
+    logger.info("Generating %d cover letters for %d jobs", len(variants), len(request.jobs))
+
+    start = time.perf_counter()
+    results = cover_letter_generator.generate_cover_letter_batch(
+        resume_analysis=request.resume_analysis,
+        jobs=variants,
+        candidate_name=request.candidate_name,
+        deadline_seconds=request.deadline_seconds,
+    )
+
+    async def event_stream():
+        succeeded = 0
+        try:
+            async for result in results:
+                job_info = variants[result["index"]]
+                cover_letter = result["cover_letter"]
+                succeeded += result["status"] == "ok"
+                yield _sse("letter", {
+                    "index": result["index"],
+                    "company_name": job_info["company_name"],
+                    "job_title": job_info["job_title"],
+                    "tone": job_info["tone"],
+                    "status": result["status"],
+                    "cover_letter": _ensure_json_structure(cover_letter) if cover_letter else None,
+                    "error": result["error"],
+                })
+            yield _sse("done", {
+                "count": len(variants),
+                "succeeded": succeeded,
+                "failed": len(variants) - succeeded,
+                "total_ms": round((time.perf_counter() - start) * 1000, 1),
+            })
+        except Exception:
+            logger.exception("Cover letter batch failed")
+            yield _sse("error", {"detail": "Cover letter batch failed"})
+        finally:
+            # Disconnecting stops the letters still queued or generating
+            await results.aclose()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/regenerate-paragraph", response_model=ParagraphRegenerateResponse)
+async def regenerate_paragraph(request: ParagraphRegenerateRequest, http_request: Request):
+    """
+    Rewrite one body paragraph of an existing letter, conditioned on its
+    neighbours, and return the whole letter with that paragraph replaced.
+    """
+    try:
+        _validate_resume_analysis(request.resume_analysis)
+        tone = _validate_job_info(request.job_info)
+
+        logger.info(
+            "Regenerating paragraph %d for %s - %s",
+            request.paragraph_index,
+            request.job_info["company_name"],
+            request.job_info["job_title"]
+        )
+
+        result = await cover_letter_generator.regenerate_paragraph(
+            resume_analysis=request.resume_analysis,
+            job_info=request.job_info,
+            cover_letter=request.cover_letter,
+            paragraph_index=request.paragraph_index,
+            candidate_name=request.candidate_name,
+            deadline_seconds=request.deadline_seconds,
+            is_disconnected=http_request.is_disconnected,
+        )
+
+        return {
+            "company_name": request.job_info["company_name"],
+            "job_title": request.job_info["job_title"],
+            "tone": tone,
+            "cover_letter": _ensure_json_structure(result),
+            "paragraph_index": request.paragraph_index,
+        }
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ClientDisconnectedError as e:
+        logger.info("Paragraph request abandoned: %s", e)
+        raise HTTPException(status_code=499, detail=str(e))
+    except DeadlineExceededError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except (ConnectionError, SchedulerSaturatedError, ExecutorSaturatedError) as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except ParagraphGenerationError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+    except Exception:
+        logger.exception("Paragraph regeneration failed")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
 @router.get("/health", response_model=HealthResponse)
 async def health_check():
-    return cover_letter_generator.health_check()
+    return await cover_letter_generator.health_check()
 
 
 @router.get("/models")
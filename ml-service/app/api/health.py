@@ -1,4 +1,9 @@
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.services.executors import executor_stats
+from app.services.lru_cache import cache_stats
+from app.services.model_registry import readiness
 
 #Create a router
 
@@ -9,3 +14,24 @@ async def health_check():
         "status": "ok",
         "service": "ml-service"
     }
+
+
+@router.get("/ready")
+async def ready():
+    # 503 until models are usable, so orchestrators hold traffic back
+    report = readiness()
+    return JSONResponse(status_code=200 if report["ready"] else 503, content=report)
+
+
+@router.get("/executors")
+async def executors():
+    return{
+        "executors": executor_stats()
+    }
+
+
+@router.get("/caches")
+async def caches():
+    return{
+        "caches": cache_stats()
+    }
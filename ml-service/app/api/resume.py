@@ -3,19 +3,48 @@ from pydantic import BaseModel
 from typing import List, Optional
 
 from app.services.resume_parser import extract_textpdf, extract_textdocs
-from app.services.resume_analyzer import get_analysis
-from app.services.ats_scorer import compute_ats_score
-from app.services.job_matcher import match_job_with_resume
+from app.services.batch_analyzer import analyze_resume, analyze_batch, MAX_BATCH_SIZE
+from app.services.job_matcher import (
+    match_job_with_resume,
+    match_job_with_resume_many,
+    MAX_JOBS_PER_MATCH
+)
+from app.services.candidate_index import (
+    get_candidate_index,
+    upsert_candidates,
+    rank_candidates,
+    CANDIDATE_SHORTLIST_SIZE
+)
+from app.services.executors import run_blocking, ExecutorSaturatedError
 
 router = APIRouter()
 
 class ResumeAnalyzeRequest(BaseModel):
     content: str
 
+class ResumeBatchAnalyzeRequest(BaseModel):
+    contents: List[str]
+
 class JobMatchRequest(BaseModel):
     resume_analysis: dict
     job_description: str
 
+class JobMatchManyRequest(BaseModel):
+    resume_analysis: dict
+    job_descriptions: List[str]
+
+class Candidate(BaseModel):
+    id: str
+    resume_analysis: dict
+
+class CandidateUpsertRequest(BaseModel):
+    candidates: List[Candidate]
+
+class RankCandidatesRequest(BaseModel):
+    job_description: str
+    top_k: int = 20
+    shortlist_size: int = CANDIDATE_SHORTLIST_SIZE
+
 @router.post("/extract-text")
 async def extract_text(file: UploadFile = File(...)):
 
@@ -29,9 +58,9 @@ async def extract_text(file: UploadFile = File(...)):
         content = await file.read()
 
         if extension=='pdf':
-            text = extract_textpdf(content)
+            text = await run_blocking("parse", extract_textpdf, content)
         elif extension == "docx":
-            text = extract_textdocs(content)
+            text = await run_blocking("parse", extract_textdocs, content)
         else:
             raise HTTPException(status_code=422, detail="Unsupported file format. Please upload PDF or DOCX.")
         
@@ -47,6 +76,8 @@ async def extract_text(file: UploadFile = File(...)):
         }
     except HTTPException:
         raise
+    except ExecutorSaturatedError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
 
@@ -54,24 +85,49 @@ async def extract_text(file: UploadFile = File(...)):
 @router.post("/analyze")
 async def analyze_text(request: ResumeAnalyzeRequest):
     try:
-        content = request.content
+        return await run_blocking("analysis", analyze_resume, request.content)
 
-        analysis = get_analysis(content)
-        ats = compute_ats_score(analysis, content)
+    except ExecutorSaturatedError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error analyzing content: {str(e)}")
 
-        analysis.pop("raw_sections")
-        
-        return {
-            **analysis,
-            **ats
-        }
 
-        
-        
+@router.post("/analyze-batch")
+async def analyze_text_batch(request: ResumeBatchAnalyzeRequest):
+    """
+    Analyze many resumes in one call using a pool of worker processes.
+    
+    Expects:
+        - contents: List of raw resume texts
+    
+    Returns:
+        - count / succeeded / failed: Batch totals
+        - results: One entry per resume, in input order, each with
+          'index', 'status' ("ok" or "error"), 'analysis' and 'error'
+    """
+    if not request.contents:
+        raise HTTPException(status_code=400, detail="contents cannot be empty")
 
+    if len(request.contents) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: at most {MAX_BATCH_SIZE} resumes per request"
+        )
 
+    try:
+        results = await analyze_batch(request.contents)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error analyzing content: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error analyzing batch: {str(e)}")
+
+    succeeded = sum(1 for r in results if r["status"] == "ok")
+
+    return {
+        "count": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "results": results
+    }
 
 
 @router.post("/job-match")
@@ -119,7 +175,9 @@ async def job_match(request: JobMatchRequest):
             )
         
         # Perform job matching
-        result = match_job_with_resume(
+        result = await run_blocking(
+            "nlp",
+            match_job_with_resume,
             resume_analysis=request.resume_analysis,
             job_description=request.job_description
         )
@@ -128,8 +186,182 @@ async def job_match(request: JobMatchRequest):
     
     except HTTPException:
         raise
+    except ExecutorSaturatedError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error performing job match: {str(e)}"
+        )
+
+
+@router.post("/job-match-many")
+async def job_match_many(request: JobMatchManyRequest):
+    """
+    Match one resume against many job descriptions in a single call.
+    
+    Expects:
+        - resume_analysis: Output from /analyze endpoint (with 'skills' and 'ats_score')
+        - job_descriptions: List of raw job description texts
+    
+    Returns:
+        - count: Number of job descriptions
+        - results: One /job-match result per job, each with its input
+          'index', ranked by job_fit_score (highest first)
+    """
+    try:
+        # Validate input
+        if not request.resume_analysis:
+            raise HTTPException(
+                status_code=400,
+                detail="resume_analysis is required"
+            )
+        
+        for field in ("skills", "ats_score"):
+            if field not in request.resume_analysis:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"resume_analysis must contain '{field}' field"
+                )
+        
+        if not request.job_descriptions:
+            raise HTTPException(
+                status_code=400,
+                detail="job_descriptions cannot be empty"
+            )
+        
+        if len(request.job_descriptions) > MAX_JOBS_PER_MATCH:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Too many job descriptions: at most {MAX_JOBS_PER_MATCH} per request"
+            )
+        
+        empty = [i for i, jd in enumerate(request.job_descriptions) if not jd or not jd.strip()]
+        if empty:
+            raise HTTPException(
+                status_code=400,
+                detail=f"job_descriptions cannot contain empty entries (indexes {empty[:10]})"
+            )
+        
+        results = await run_blocking(
+            "nlp",
+            match_job_with_resume_many,
+            resume_analysis=request.resume_analysis,
+            job_descriptions=request.job_descriptions
+        )
+        
+        return {
+            "count": len(results),
+            "results": results
+        }
+    
+    except HTTPException:
+        raise
+    except ExecutorSaturatedError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Error performing job match: {str(e)}"
         )
+
+
+@router.post("/candidates")
+async def add_candidates(request: CandidateUpsertRequest):
+    """
+    Add or replace candidates in the recruiter-mode index.
+    
+    Expects:
+        - candidates: List of {id, resume_analysis}; resume_analysis is the
+          output of /analyze (with 'skills' and 'ats_score')
+    
+    Returns:
+        - upserted: Number of candidates written
+        - total: Number of candidates in the index
+    """
+    try:
+        if not request.candidates:
+            raise HTTPException(
+                status_code=400,
+                detail="candidates cannot be empty"
+            )
+        
+        for candidate in request.candidates:
+            for field in ("skills", "ats_score"):
+                if field not in candidate.resume_analysis:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"resume_analysis of candidate '{candidate.id}' must contain '{field}' field"
+                    )
+        
+        return await run_blocking(
+            "nlp",
+            upsert_candidates,
+            [(c.id, c.resume_analysis) for c in request.candidates]
+        )
+    
+    except HTTPException:
+        raise
+    except ExecutorSaturatedError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error indexing candidates: {str(e)}"
+        )
+
+
+@router.get("/candidates")
+async def candidate_index_stats():
+    return get_candidate_index().stats()
+
+
+@router.post("/rank-candidates")
+async def rank_candidate_pool(request: RankCandidatesRequest):
+    """
+    Rank stored candidates against one job description.
+    
+    An approximate nearest-neighbour search over pooled skill embeddings
+    picks a shortlist, which is re-scored with the /job-match logic.
+    
+    Expects:
+        - job_description: Raw job description text
+        - top_k: Number of candidates to return (default 20)
+        - shortlist_size: ANN candidates to re-score (default CANDIDATE_SHORTLIST_SIZE)
+    
+    Returns:
+        - job_skills: Skills extracted from the job description
+        - indexed / shortlisted: Candidates in the index and in the shortlist
+        - candidates: /job-match results with 'candidate_id' and 'ann_score',
+          ranked by job_fit_score
+    """
+    try:
+        if not request.job_description or not request.job_description.strip():
+            raise HTTPException(
+                status_code=400,
+                detail="job_description cannot be empty"
+            )
+        
+        if request.top_k < 1 or request.shortlist_size < 1:
+            raise HTTPException(
+                status_code=400,
+                detail="top_k and shortlist_size must be positive"
+            )
+        
+        return await run_blocking(
+            "nlp",
+            rank_candidates,
+            request.job_description,
+            top_k=request.top_k,
+            shortlist_size=request.shortlist_size
+        )
+    
+    except HTTPException:
+        raise
+    except ExecutorSaturatedError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error ranking candidates: {str(e)}"
+        )
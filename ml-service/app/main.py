@@ -1,9 +1,32 @@
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api import resume,health,cover_letter
+from app.services.executors import shutdown_executors
+from app.services.semantic_skill_matcher import save_embedding_cache
+from app.services.model_registry import start_prewarm
+from app.services.llm_client import close_http_client
+from app.services.llm_health import start_health_monitors, stop_health_monitors
 
-app = FastAPI(title = "CareerCraft ML Service")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load models in the background when ML_PREWARM is set
+    start_prewarm()
+    # Probe Ollama in the background instead of per request
+    start_health_monitors()
+    yield
+    await stop_health_monitors()
+    # Release worker threads and processes
+    shutdown_executors()
+    # Close pooled connections to Ollama
+    await close_http_client()
+    # Keep learned skill embeddings for the next start
+    save_embedding_cache()
+
+
+app = FastAPI(title = "CareerCraft ML Service", lifespan=lifespan)
 
 # Allow all origins for local development
 app.add_middleware(
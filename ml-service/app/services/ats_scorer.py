@@ -1,10 +1,13 @@
-from sklearn.feature_extraction.text import TfidfVectorizer
 from collections import Counter
 import re
-from textstat.textstat import textstat
+
+from app.services.skill_automaton import skills_in_range
 
 
 # --- SECTION ---
+def _span_length(span) -> int:
+    return span[1] - span[0] if span else 0
+
 def score_section_completeness(analysis: dict) -> float:
     REQUIRED_SECTIONS = ["skills", "education", "experience", "projects"]
 
@@ -19,7 +22,7 @@ def score_section_completeness(analysis: dict) -> float:
             if content and isinstance(content, list) and len(content) > 0:
                 score += 7.5
             # raw section exists but poorly populated
-            elif analysis["raw_sections"].get(section):
+            elif _span_length(analysis["section_spans"].get(section)) > 0:
                 score += 3.5
 
     return score
@@ -64,12 +67,15 @@ def score_skill_diversity(skills: list[str]) -> float:
         return 2
 
 def score_skill_reuse(skills: list[str], analysis: dict) -> float:
-    text = (
-        analysis["raw_sections"].get("experience", "") +
-        analysis["raw_sections"].get("projects", "")
-    ).lower()
+    mentioned = set()
+
+    # reuse the full-text skill scan from get_analysis
+    for section in ("experience", "projects"):
+        span = analysis["section_spans"].get(section)
+        if span:
+            mentioned.update(skills_in_range(analysis["skill_mentions"], *span))
 
-    reused = sum(1 for s in skills if s in text)
+    reused = sum(1 for s in skills if s in mentioned)
 
     ratio = reused / max(len(skills), 1)
 
@@ -94,6 +100,9 @@ def score_skills(analysis: dict) -> float:
 
 # --- KEYWORD ---
 def extract_top_keywords(text: str, top_k: int = 30) -> list[str]:
+    # Imported here: sklearn adds seconds to service startup
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
     vectorizer = TfidfVectorizer(
         stop_words="english",
         max_features=top_k
@@ -164,6 +173,8 @@ def score_keyword_optimization(analysis: dict, content: str) -> float:
 
 # --- READABILITY ---
 def score_flesch(text: str) -> float:
+    from textstat.textstat import textstat
+
     score = textstat.flesch_reading_ease(text)
 
     if score >= 50:
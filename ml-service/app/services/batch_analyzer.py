@@ -0,0 +1,99 @@
+"""
+Batch Analyzer Service
+Runs resume analysis and ATS scoring for one or many resumes.
+"""
+
+import os
+import asyncio
+import logging
+from typing import Dict, List
+
+from app.services.resume_analyzer import get_analysis
+from app.services.ats_scorer import compute_ats_score
+from app.services.executors import run_blocking
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on resumes accepted in a single batch request
+MAX_BATCH_SIZE = int(os.getenv("BATCH_ANALYSIS_MAX_ITEMS", "500"))
+
+
+def analyze_resume(content: str) -> Dict:
+    """
+    Run full analysis and ATS scoring for a single resume.
+
+    Args:
+        content: Raw resume text
+
+    Returns:
+        Analysis merged with ATS score, breakdown and feedback
+    """
+    analysis = get_analysis(content)
+    ats = compute_ats_score(analysis, content)
+
+    # internal fields consumed by scoring only
+    analysis.pop("section_spans")
+    analysis.pop("skill_mentions")
+
+    return {
+        **analysis,
+        **ats
+    }
+
+
+def analyze_batch_item(index: int, content: str) -> Dict:
+    """
+    Analyze one resume of a batch, reporting failures inline.
+
+    Args:
+        index: Position of the resume in the batch
+        content: Raw resume text
+
+    Returns:
+        Result entry with either an analysis or an error message
+    """
+    try:
+        return {
+            "index": index,
+            "status": "ok",
+            "analysis": analyze_resume(content),
+            "error": None
+        }
+    except Exception as e:
+        logger.warning("Batch item %d failed: %s", index, e)
+        return {
+            "index": index,
+            "status": "error",
+            "analysis": None,
+            "error": str(e)
+        }
+
+
+async def analyze_batch(contents: List[str]) -> List[Dict]:
+    """
+    Analyze many resumes concurrently on the batch process pool.
+
+    Args:
+        contents: Raw resume texts
+
+    Returns:
+        Result entries in the same order as the input
+    """
+    results = await asyncio.gather(
+        *(
+            run_blocking("batch", analyze_batch_item, i, content)
+            for i, content in enumerate(contents)
+        ),
+        return_exceptions=True
+    )
+
+    # Items rejected by a saturated pool are reported inline like any other failure
+    return [
+        result if not isinstance(result, BaseException) else {
+            "index": i,
+            "status": "error",
+            "analysis": None,
+            "error": str(result)
+        }
+        for i, result in enumerate(results)
+    ]
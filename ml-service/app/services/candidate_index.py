@@ -0,0 +1,658 @@
+"""
+Candidate Index Service
+In-process approximate nearest-neighbour index over stored resume analyses
+for recruiter mode: rank a candidate pool against one job description.
+
+Each candidate is represented by the mean of its normalized skill
+embeddings (same MiniLM model as job matching). Search uses an inverted
+file (IVF) index: vectors are clustered with k-means and a query only
+scans the nprobe closest clusters. The ANN shortlist is then re-scored
+with the full job-match logic.
+
+Persistence: every upsert appends only its rows to a log next to the
+snapshot file; the full snapshot is rewritten in the background once the
+log holds as many rows as the snapshot, and the log is then cleared.
+"""
+
+import os
+import json
+import shutil
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.semantic_skill_matcher import (
+    EMBEDDING_MODEL_ID,
+    compute_skill_embeddings,
+    normalize_rows
+)
+from app.services.job_skill_extractor import extract_job_skills
+from app.services.job_matcher import match_resumes_with_job
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "data",
+    "candidate_index.npz"
+)
+
+# Index snapshot (.npz); upserts since the last snapshot go to <path>.log
+CANDIDATE_INDEX_PATH = os.getenv("CANDIDATE_INDEX_PATH") or DEFAULT_INDEX_PATH
+
+# Below this many candidates search is exact; above it the IVF index is trained
+CANDIDATE_INDEX_MIN_TRAIN = int(os.getenv("CANDIDATE_INDEX_MIN_TRAIN", "1000"))
+
+# Number of closest clusters scanned per query
+CANDIDATE_INDEX_NPROBE = int(os.getenv("CANDIDATE_INDEX_NPROBE", "32"))
+
+# Default ANN shortlist size re-scored by the full job-match logic
+CANDIDATE_SHORTLIST_SIZE = int(os.getenv("CANDIDATE_SHORTLIST_SIZE", "200"))
+
+# k-means settings
+KMEANS_ITERATIONS = 15
+KMEANS_MAX_POINTS_PER_CENTROID = 256
+KMEANS_CHUNK = 8192
+
+# The snapshot is rewritten once the upsert log holds this many rows, or
+# as many as the snapshot if that is more (amortized O(1) per upserted row)
+LOG_COMPACT_MIN_ROWS = 1000
+
+
+def pooled_skill_embeddings(skill_lists: List[List[str]]) -> np.ndarray:
+    """
+    Mean of normalized skill embeddings per skill list, L2-normalized.
+
+    Every unique skill across all lists is embedded once.
+
+    Args:
+        skill_lists: One list of skills per resume or job description
+
+    Returns:
+        float32 array of shape (len(skill_lists), dim); lists without
+        skills get an all-zero row
+    """
+    union = list(dict.fromkeys(s for skills in skill_lists for s in skills))
+    if not union:
+        return np.zeros((len(skill_lists), 0), dtype=np.float32)
+
+    vectors = normalize_rows(compute_skill_embeddings(union))
+    row = {skill: i for i, skill in enumerate(union)}
+
+    pooled = np.zeros((len(skill_lists), vectors.shape[1]), dtype=np.float32)
+    for i, skills in enumerate(skill_lists):
+        if skills:
+            pooled[i] = vectors[[row[s] for s in skills]].mean(axis=0)
+
+    return normalize_rows(pooled)
+
+
+def _nearest_centroids(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Index of the most similar centroid for every vector, in chunks."""
+    assignments = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), KMEANS_CHUNK):
+        chunk = vectors[start:start + KMEANS_CHUNK]
+        assignments[start:start + KMEANS_CHUNK] = (chunk @ centroids.T).argmax(axis=1)
+    return assignments
+
+
+def kmeans(vectors: np.ndarray, n_clusters: int, seed: int = 0) -> np.ndarray:
+    """
+    Spherical k-means (cosine) over unit vectors.
+
+    Trains on at most KMEANS_MAX_POINTS_PER_CENTROID points per centroid.
+
+    Args:
+        vectors: Unit vectors, shape (n, dim)
+        n_clusters: Number of centroids
+        seed: Random seed for sampling and initialization
+
+    Returns:
+        Unit centroids, shape (n_clusters, dim)
+    """
+    rng = np.random.default_rng(seed)
+
+    sample_size = min(len(vectors), n_clusters * KMEANS_MAX_POINTS_PER_CENTROID)
+    sample = vectors[rng.choice(len(vectors), sample_size, replace=False)]
+
+    centroids = sample[rng.choice(len(sample), n_clusters, replace=False)].copy()
+
+    for _ in range(KMEANS_ITERATIONS):
+        assignments = _nearest_centroids(sample, centroids)
+
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, sample)
+        counts = np.bincount(assignments, minlength=n_clusters)
+
+        # Re-seed empty clusters with random points
+        empty = np.flatnonzero(counts == 0)
+        if len(empty):
+            sums[empty] = sample[rng.choice(len(sample), len(empty), replace=False)]
+
+        centroids = normalize_rows(sums)
+
+    return centroids
+
+
+def choose_n_clusters(n: int) -> int:
+    """About 4 * sqrt(n) clusters, with at least ~39 points per cluster."""
+    return max(1, min(int(4 * np.sqrt(n)), n // 39))
+
+
+class CandidateIndex:
+    """
+    IVF index of pooled candidate embeddings plus the fields needed to
+    re-score a shortlist (skills and ATS score).
+
+    Thread-safe; search and upsert can run from different request threads.
+    """
+
+    def __init__(self, model_name: str, path: Optional[str] = None):
+        self.model_name = model_name
+        self.path = path or None
+        self.log_path = f"{self.path}.log" if self.path else None
+        # A log being folded into a snapshot; left behind only by a crash
+        self.pending_log_path = f"{self.path}.log.pending" if self.path else None
+
+        # Rows in the last snapshot and rows appended to the log since
+        self.saved_rows = 0
+        self.log_rows = 0
+        self._compacting = False
+
+        self.ids: List[str] = []
+        self.rows: Dict[str, int] = {}
+        self.candidates: List[Dict] = []          # {"skills": [...], "ats_score": n}
+        self.vectors = np.zeros((0, 0), dtype=np.float32)
+
+        # IVF state (None until trained)
+        self.centroids: Optional[np.ndarray] = None
+        self.assignments = np.zeros(0, dtype=np.int32)
+        self.trained_size = 0
+        self._lists: Optional[List[np.ndarray]] = None
+
+        # Rows updated in place while k-means runs (None when not training)
+        self._training = False
+        self._updated_rows: Optional[set] = None
+
+        self._lock = threading.RLock()
+        self._save_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    # -----------------------------------------------------
+    # Updates
+    # -----------------------------------------------------
+
+    def upsert(self, candidates: List[Tuple[str, Dict]]) -> int:
+        """
+        Add or replace candidates.
+
+        Args:
+            candidates: (candidate_id, resume_analysis) pairs; the analysis
+                needs 'skills' and 'ats_score'
+
+        Returns:
+            Number of candidates written
+        """
+        if not candidates:
+            return 0
+
+        # Last write wins for repeated ids within one call
+        latest = dict(candidates)
+        ids = list(latest)
+        records = [
+            {
+                "skills": list(latest[cid].get("skills", [])),
+                "ats_score": latest[cid].get("ats_score", 0)
+            }
+            for cid in ids
+        ]
+
+        # Embedding runs outside the lock
+        vectors = pooled_skill_embeddings([r["skills"] for r in records])
+
+        with self._lock:
+            vectors = self._apply(ids, records, vectors)
+            # Appended under the lock so the log keeps the order of the updates
+            self._append_log(ids, records, vectors)
+            compact = self._start_compaction()
+
+        self._maybe_train()
+
+        if compact:
+            threading.Thread(target=self.save, name="candidate-index-snapshot", daemon=True).start()
+
+        return len(ids)
+
+    def _apply(self, ids: List[str], records: List[Dict], vectors: np.ndarray) -> np.ndarray:
+        """
+        Write candidates into the in-memory index.
+
+        Returns:
+            The vectors as stored (widened to the index dimension if needed)
+        """
+        with self._lock:
+            dim = max(vectors.shape[1], self.vectors.shape[1])
+            if vectors.shape[1] != dim:
+                # No skills anywhere in this batch: zero vectors of the index dimension
+                vectors = np.zeros((len(ids), dim), dtype=np.float32)
+            if self.vectors.shape[1] != dim:
+                # Only skill-less candidates stored so far: widen their zero vectors
+                self.vectors = np.zeros((len(self.ids), dim), dtype=np.float32)
+
+            new_vectors = []
+            for cid, record, vector in zip(ids, records, vectors):
+                row = self.rows.get(cid)
+                if row is None:
+                    self.rows[cid] = len(self.ids)
+                    self.ids.append(cid)
+                    self.candidates.append(record)
+                    new_vectors.append(vector)
+                else:
+                    self.candidates[row] = record
+                    self.vectors[row] = vector
+                    if self._updated_rows is not None:
+                        self._updated_rows.add(row)
+                    if self.centroids is not None:
+                        self.assignments[row] = _nearest_centroids(vector[None, :], self.centroids)[0]
+
+            if new_vectors:
+                added = np.vstack(new_vectors)
+                self.vectors = np.vstack([self.vectors, added])
+                if self.centroids is not None:
+                    self.assignments = np.concatenate(
+                        [self.assignments, _nearest_centroids(added, self.centroids)]
+                    )
+
+            self._lists = None
+
+        return vectors
+
+    def _maybe_train(self) -> None:
+        """
+        (Re)train the IVF clusters once the index has doubled since the last training.
+
+        k-means runs on a copy of the vectors outside the lock, so searches
+        and upserts continue meanwhile (against the previous clusters).
+        Rows added or updated during training are assigned to the new
+        clusters when they are swapped in.
+        """
+        with self._lock:
+            n = len(self.ids)
+            if self._training or n < CANDIDATE_INDEX_MIN_TRAIN or n < 2 * self.trained_size:
+                return
+            self._training = True
+            self._updated_rows = set()
+            vectors = self.vectors.copy()
+
+        try:
+            n_clusters = choose_n_clusters(n)
+            logger.info("Training candidate index: %d candidates, %d clusters", n, n_clusters)
+
+            centroids = kmeans(vectors, n_clusters)
+            assignments = _nearest_centroids(vectors, centroids)
+
+            with self._lock:
+                if centroids.shape[1] != self.vectors.shape[1]:
+                    # The index was widened from skill-less zero vectors meanwhile
+                    return
+
+                stale = np.concatenate([
+                    np.array(sorted(self._updated_rows), dtype=np.int64),
+                    np.arange(n, len(self.ids))
+                ])
+                assignments = np.concatenate(
+                    [assignments, np.zeros(len(self.ids) - n, dtype=np.int32)]
+                )
+                if len(stale):
+                    assignments[stale] = _nearest_centroids(self.vectors[stale], centroids)
+
+                self.centroids = centroids
+                self.assignments = assignments
+                self.trained_size = n
+                self._lists = None
+        finally:
+            with self._lock:
+                self._training = False
+                self._updated_rows = None
+
+    def _inverted_lists(self) -> List[np.ndarray]:
+        """Row ids per cluster, rebuilt lazily after updates."""
+        if self._lists is None:
+            order = np.argsort(self.assignments, kind="stable")
+            counts = np.bincount(self.assignments, minlength=len(self.centroids))
+            self._lists = np.split(order, np.cumsum(counts)[:-1])
+        return self._lists
+
+    # -----------------------------------------------------
+    # Search
+    # -----------------------------------------------------
+
+    def search(
+        self,
+        query: np.ndarray,
+        k: int,
+        nprobe: int = CANDIDATE_INDEX_NPROBE
+    ) -> List[Tuple[str, Dict, float]]:
+        """
+        Approximate top-k candidates by cosine similarity to a query vector.
+
+        Args:
+            query: Unit query vector
+            k: Number of candidates to return
+            nprobe: Number of clusters to scan (exact search before training)
+
+        Returns:
+            List of (candidate_id, record, similarity), most similar first
+        """
+        with self._lock:
+            if not self.ids or k <= 0 or self.vectors.shape[1] != query.shape[0]:
+                return []
+
+            if self.centroids is None:
+                rows = np.arange(len(self.ids))
+            else:
+                nprobe = min(max(nprobe, 1), len(self.centroids))
+                probe = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+                lists = self._inverted_lists()
+                rows = np.concatenate([lists[c] for c in probe])
+
+            scores = self.vectors[rows] @ query
+
+            k = min(k, len(rows))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+
+            return [
+                (self.ids[rows[i]], self.candidates[rows[i]], float(scores[i]))
+                for i in top
+            ]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "candidates": len(self.ids),
+                "clusters": 0 if self.centroids is None else len(self.centroids),
+                "trained_size": self.trained_size,
+                "model": self.model_name,
+                "persistent": self.path is not None,
+            }
+
+    # -----------------------------------------------------
+    # Persistence
+    # -----------------------------------------------------
+
+    def _append_log(self, ids: List[str], records: List[Dict], vectors: np.ndarray) -> None:
+        """Append one upsert to the log. Caller holds the lock."""
+        if not self.log_path:
+            return
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.log_path)), exist_ok=True)
+        with open(self.log_path, "ab") as f:
+            start = f.tell()
+            try:
+                if start == 0:
+                    np.save(f, np.array(self.model_name))
+                np.save(f, np.array(ids, dtype=str))
+                np.save(f, np.array(json.dumps(records)))
+                np.save(f, vectors)
+            except Exception:
+                # A partial entry would hide every later one from replay
+                f.truncate(start)
+                raise
+
+        self.log_rows += len(ids)
+
+    def _rotate_log(self) -> None:
+        """
+        Move the log aside for the snapshot being written. Caller holds the lock.
+
+        A pending log left by a failed save holds upserts that are in no
+        snapshot, so the log is appended to it rather than replacing it.
+        """
+        if not os.path.exists(self.log_path):
+            return
+
+        if os.path.exists(self.pending_log_path) and _log_model(self.pending_log_path) == self.model_name:
+            with open(self.log_path, "rb") as src, open(self.pending_log_path, "ab") as dst:
+                np.load(src, allow_pickle=False)   # skip the model header
+                shutil.copyfileobj(src, dst)
+            os.remove(self.log_path)
+        else:
+            os.replace(self.log_path, self.pending_log_path)
+
+    def _start_compaction(self) -> bool:
+        """Whether the log has outgrown the snapshot; claims the compaction if so. Caller holds the lock."""
+        if not self.path or self._compacting:
+            return False
+        if self.log_rows < max(self.saved_rows, LOG_COMPACT_MIN_ROWS):
+            return False
+        self._compacting = True
+        return True
+
+    def save(self) -> int:
+        """
+        Write a full snapshot to self.path atomically and clear the upsert log.
+
+        The index is copied under the lock; the file is written outside it,
+        so searches and upserts are not blocked by the write.
+
+        Returns:
+            Number of candidates written
+        """
+        if not self.path:
+            return 0
+
+        with self._save_lock:
+            try:
+                with self._lock:
+                    ids = list(self.ids)
+                    candidates = list(self.candidates)
+                    arrays = {
+                        "model": np.array(self.model_name),
+                        # Rows are updated in place, so the arrays are copied
+                        "vectors": self.vectors.copy(),
+                        "assignments": self.assignments.copy(),
+                        "trained_size": np.array(self.trained_size),
+                    }
+                    if self.centroids is not None:
+                        arrays["centroids"] = self.centroids
+
+                    # Upserts from here on go to a fresh log
+                    self._rotate_log()
+                    rotated_rows = self.log_rows
+
+                arrays["ids"] = np.array(ids, dtype=str)
+                arrays["candidates"] = np.array(json.dumps(candidates))
+
+                directory = os.path.dirname(os.path.abspath(self.path))
+                os.makedirs(directory, exist_ok=True)
+
+                tmp_path = f"{self.path}.tmp.npz"
+                np.savez(tmp_path, **arrays)
+                os.replace(tmp_path, self.path)
+
+                with self._lock:
+                    self.saved_rows = len(ids)
+                    self.log_rows -= rotated_rows
+
+                if os.path.exists(self.pending_log_path):
+                    os.remove(self.pending_log_path)
+            except Exception as e:
+                # The log (or pending log) still holds every upsert since the last snapshot
+                logger.error("Could not save candidate index %s: %s", self.path, e)
+                raise
+            finally:
+                self._compacting = False
+
+        return len(ids)
+
+    def load(self) -> int:
+        """
+        Load the snapshot from self.path and replay the upsert logs, if they
+        exist and were built with the same embedding model.
+
+        Returns:
+            Number of candidates loaded
+        """
+        if not self.path:
+            return 0
+
+        if os.path.exists(self.path):
+            self._load_snapshot()
+
+        logs = [p for p in (self.pending_log_path, self.log_path) if os.path.exists(p)]
+        for log_path in logs:
+            self._replay_log(log_path)
+        self._maybe_train()
+
+        if logs:
+            # Fold the replayed upserts into a fresh snapshot and start an empty log
+            self.save()
+
+        if len(self):
+            logger.info("Loaded %d candidates from %s", len(self), self.path)
+        return len(self)
+
+    def _load_snapshot(self) -> None:
+        try:
+            with np.load(self.path, allow_pickle=False) as data:
+                if str(data["model"]) != self.model_name:
+                    logger.warning("Ignoring candidate index %s: built for another model", self.path)
+                    return
+
+                ids = data["ids"].tolist()
+                candidates = json.loads(str(data["candidates"]))
+                vectors = data["vectors"].astype(np.float32)
+                assignments = data["assignments"].astype(np.int32)
+                trained_size = int(data["trained_size"])
+                centroids = data["centroids"].astype(np.float32) if "centroids" in data else None
+        except Exception as e:
+            logger.error("Could not load candidate index %s: %s", self.path, e)
+            return
+
+        with self._lock:
+            self.ids = ids
+            self.rows = {cid: i for i, cid in enumerate(ids)}
+            self.candidates = candidates
+            self.vectors = vectors
+            self.assignments = assignments
+            self.centroids = centroids
+            self.trained_size = trained_size
+            self.saved_rows = len(ids)
+            self._lists = None
+
+    def _replay_log(self, path: str) -> None:
+        """
+        Re-apply the upserts of a log in order. A torn last entry (crash
+        mid-write) is dropped and cut off, so entries appended later stay readable.
+        """
+        with open(path, "r+b") as f:
+            good = 0
+            try:
+                if str(np.load(f, allow_pickle=False)) != self.model_name:
+                    logger.warning("Ignoring candidate index log %s: built for another model", path)
+                    return
+                good = f.tell()
+
+                while f.peek(1):
+                    ids = np.load(f, allow_pickle=False).tolist()
+                    records = json.loads(str(np.load(f, allow_pickle=False)))
+                    vectors = np.load(f, allow_pickle=False).astype(np.float32)
+                    self._apply(ids, records, vectors)
+                    good = f.tell()
+            except Exception as e:
+                logger.error("Stopped replaying candidate index log %s: %s", path, e)
+                f.truncate(good)
+
+
+def _log_model(path: str) -> Optional[str]:
+    """Model id in a log's header, or None if it cannot be read."""
+    try:
+        with open(path, "rb") as f:
+            return str(np.load(f, allow_pickle=False))
+    except Exception:
+        return None
+
+
+_index: Optional[CandidateIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_candidate_index() -> CandidateIndex:
+    """
+    Get the candidate index (cached), loading it from disk on first use.
+
+    Returns:
+        CandidateIndex instance
+    """
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                index = CandidateIndex(EMBEDDING_MODEL_ID, CANDIDATE_INDEX_PATH)
+                index.load()
+                _index = index
+    return _index
+
+
+def upsert_candidates(candidates: List[Tuple[str, Dict]]) -> Dict:
+    """
+    Add or replace candidates in the index and append them to its log.
+
+    Args:
+        candidates: (candidate_id, resume_analysis) pairs
+
+    Returns:
+        Dictionary with the number of upserted candidates and the index size
+    """
+    index = get_candidate_index()
+    upserted = index.upsert(candidates)
+
+    return {"upserted": upserted, "total": len(index)}
+
+
+def rank_candidates(
+    job_description: str,
+    top_k: int = 20,
+    shortlist_size: int = CANDIDATE_SHORTLIST_SIZE
+) -> Dict:
+    """
+    Rank stored candidates against one job description.
+
+    Cascade: the pooled job-skill embedding retrieves an ANN shortlist,
+    which is then re-scored with the full job-match logic (semantic skill
+    matching, skill match percentage, ATS weighting and feedback).
+
+    Args:
+        job_description: Raw job description text
+        top_k: Number of ranked candidates to return
+        shortlist_size: Number of ANN candidates to re-score
+
+    Returns:
+        Dictionary with the ranked candidates and cascade counts
+    """
+    index = get_candidate_index()
+    jd_skills = extract_job_skills(job_description)
+
+    query = pooled_skill_embeddings([jd_skills])[0]
+    shortlist = index.search(query, max(shortlist_size, top_k)) if query.size else []
+
+    results = match_resumes_with_job([record for _, record, _ in shortlist], jd_skills)
+
+    ranked = [
+        {"candidate_id": cid, "ann_score": round(ann_score, 4), **result}
+        for (cid, _, ann_score), result in zip(shortlist, results)
+    ]
+    # Stable sort: equal job-fit scores keep ANN order
+    ranked.sort(key=lambda r: r["job_fit_score"], reverse=True)
+
+    return {
+        "job_skills": jd_skills,
+        "indexed": len(index),
+        "shortlisted": len(shortlist),
+        "candidates": ranked[:top_k]
+    }
@@ -1,7 +1,58 @@
-from typing import Dict, Optional
+import os
+import re
+import time
+import asyncio
+import logging
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from .executors import run_blocking
 from .llm_client import LLMClient
+from .llm_health import LLMHealthMonitor, OPEN
+from .llm_scheduler import (
+    INTERACTIVE,
+    BATCH,
+    DisconnectCheck,
+    DeadlineExceededError,
+    SchedulerSaturatedError,
+    get_llm_scheduler,
+)
+from .token_budget import STOP_SEQUENCES, get_token_budget
+from .fact_selector import select_facts
 from .prompt_builder import CoverLetterPromptBuilder
-from .text_parser import CoverLetterTextParser
+from .text_parser import (
+    CoverLetterTextParser,
+    CoverLetterStreamParser,
+    MAX_BODY_PARAGRAPHS,
+    MIN_PARAGRAPH_CHARS,
+    clean_paragraph,
+    paragraph_end,
+)
+
+
+SIGN_OFF_LINE = re.compile(r"^\s*sincerely", re.IGNORECASE | re.MULTILINE)
+
+# Generation modes: one decode for the whole letter, or one concurrent
+# decode per body paragraph (needs OLLAMA_NUM_PARALLEL / LLM_MAX_CONCURRENCY > 1)
+SEQUENTIAL = "sequential"
+PARALLEL = "parallel"
+GENERATION_MODES = (SEQUENTIAL, PARALLEL)
+
+# Mode used when a request does not choose one
+COVER_LETTER_MODE = os.getenv("COVER_LETTER_MODE", SEQUENTIAL)
+
+# Upper bound on letters (jobs x tones) per batch request
+COVER_LETTER_BATCH_MAX_LETTERS = int(os.getenv("COVER_LETTER_BATCH_MAX_LETTERS", "30"))
+
+# Letters of one batch in the LLM scheduler at once (0 = LLM_MAX_CONCURRENCY);
+# the rest wait in the batch so they neither fill the shared queue nor age
+# towards their deadline
+COVER_LETTER_BATCH_WINDOW = int(os.getenv("COVER_LETTER_BATCH_WINDOW", "0"))
+
+# Decodes per paragraph before giving up on a short or empty one
+PARAGRAPH_ATTEMPTS = 2
+
+
+class ParagraphGenerationError(RuntimeError):
+    """Raised when the model returns no usable paragraph after every attempt."""
 
 
 class CoverLetterGenerator:
@@ -11,6 +62,9 @@ class CoverLetterGenerator:
         ollama_url: str = None
     ):
         self.llm_client = LLMClient(model_name, ollama_url)
+        self.health = LLMHealthMonitor(self.llm_client)
+        self.scheduler = get_llm_scheduler()
+        self.budget = get_token_budget()
         self.prompt_builder = CoverLetterPromptBuilder()
         self.text_parser = CoverLetterTextParser()
 
@@ -36,37 +90,511 @@ class CoverLetterGenerator:
             "candidate_name": candidate_name or ""
         }
 
-    def generate_cover_letter(
+    async def generate_cover_letter(
         self,
         resume_analysis: Dict,
         job_info: Dict,
-        candidate_name: Optional[str] = ""
+        candidate_name: Optional[str] = "",
+        priority: int = INTERACTIVE,
+        deadline_seconds: Optional[float] = None,
+        is_disconnected: Optional[DisconnectCheck] = None,
+        mode: Optional[str] = None
     ) -> Dict:
 
         if not resume_analysis or not job_info:
             raise ValueError("resume_analysis and job_info are required")
 
-        # Check if Ollama is available
-        if not self.llm_client.test_connection():
+        mode = mode or COVER_LETTER_MODE
+        if mode not in GENERATION_MODES:
+            raise ValueError(f"mode must be one of: {', '.join(GENERATION_MODES)}")
+
+        # Ollama health comes from the circuit breaker, without a probe per request
+        if not await self._llm_available():
             # Return mock data for testing when Ollama is unavailable
-            import logging
             logging.warning("Ollama not available - returning mock cover letter for testing")
             return self._generate_mock_cover_letter(job_info, candidate_name or "")
 
-        prompt = self.prompt_builder.build_prompt(
+        if mode == PARALLEL:
+            cover_letter = await self._generate_parallel(
+                resume_analysis, job_info, candidate_name, priority, deadline_seconds, is_disconnected
+            )
+            return self._finalize(cover_letter, job_info, candidate_name)
+
+        prompt = await self._build_prompt(resume_analysis, job_info, candidate_name)
+
+        # Waits for a free Ollama slot; cancelled at the deadline or on disconnect
+        parser, stats = await self.scheduler.run(
+            lambda: self._generate_letter(prompt, candidate_name),
+            priority=priority,
+            deadline_seconds=deadline_seconds,
+            is_disconnected=is_disconnected
+        )
+
+        _, cover_letter = self._finish_letter(parser, stats)
+        return self._finalize(cover_letter, job_info, candidate_name)
+
+    async def stream_cover_letter(
+        self,
+        resume_analysis: Dict,
+        job_info: Dict,
+        candidate_name: Optional[str] = "",
+        priority: int = INTERACTIVE,
+        deadline_seconds: Optional[float] = None
+    ) -> AsyncIterator[Tuple[str, Dict]]:
+        """
+        Generate a cover letter as a stream of (event, data) pairs:
+
+            ("queue", {"position"})                 queue position while waiting for
+                                                    Ollama; 0 once generation starts
+            ("token", {"text"})                     each chunk from the LLM
+            ("section", {"section", "index", "text"}) greeting / body / closing / sign_off,
+                                                    as soon as each is complete
+            ("done", {"cover_letter", "timings"})   same structure as generate_cover_letter
+        """
+
+        if not resume_analysis or not job_info:
+            raise ValueError("resume_analysis and job_info are required")
+
+        start = time.perf_counter()
+
+        if not await self._llm_available():
+            logging.warning("Ollama not available - streaming mock cover letter for testing")
+            async for event in self._stream_mock_cover_letter(job_info, candidate_name or "", start):
+                yield event
+            return
+
+        prompt = await self._build_prompt(resume_analysis, job_info, candidate_name)
+
+        parser = CoverLetterStreamParser()
+        stats: Dict = {}
+        first_token = None
+
+        ticket = self.scheduler.enqueue(priority, deadline_seconds)
+        try:
+            async for position in self.scheduler.wait(ticket):
+                yield "queue", {"position": position}
+            yield "queue", {"position": 0}
+
+            events = self._decode(prompt, parser, candidate_name, stats)
+            async for event, data in self.scheduler.guard_iter(ticket, events):
+                if first_token is None and event == "token":
+                    first_token = time.perf_counter()
+                yield event, data
+        finally:
+            self.scheduler.release(ticket)
+
+        sections, cover_letter = self._finish_letter(parser, stats)
+        for section in sections:
+            yield "section", section
+
+        yield "done", {
+            "cover_letter": self._finalize(cover_letter, job_info, candidate_name),
+            "timings": self._timings(start, first_token),
+        }
+
+    async def regenerate_paragraph(
+        self,
+        resume_analysis: Dict,
+        job_info: Dict,
+        cover_letter: Dict,
+        paragraph_index: int,
+        candidate_name: Optional[str] = "",
+        priority: int = INTERACTIVE,
+        deadline_seconds: Optional[float] = None,
+        is_disconnected: Optional[DisconnectCheck] = None
+    ) -> Dict:
+        """
+        Rewrite one body paragraph of an existing letter, conditioned on the
+        paragraphs around it; the rest of the letter is returned unchanged.
+        Decodes one paragraph instead of four.
+
+        Args:
+            cover_letter: Structured letter from /generate-cover-letter
+            paragraph_index: 0-based index into cover_letter["body"]
+
+        Returns:
+            The letter with body[paragraph_index] replaced
+
+        Raises:
+            ParagraphGenerationError: If the model returns no usable paragraph
+        """
+        body = cover_letter.get("body") if cover_letter else None
+        if not resume_analysis or not job_info or not isinstance(body, list) or not body:
+            raise ValueError("resume_analysis, job_info and a cover_letter with body paragraphs are required")
+        if not 0 <= paragraph_index < len(body):
+            raise ValueError(f"paragraph_index must be between 0 and {len(body) - 1}")
+
+        letter = {**cover_letter, "body": list(body)}
+        candidate_name = candidate_name or cover_letter.get("candidate_name") or ""
+
+        if not await self._llm_available():
+            logging.warning("Ollama not available - returning mock paragraph for testing")
+            mock = self._generate_mock_cover_letter(job_info, candidate_name or "")["body"]
+            letter["body"][paragraph_index] = mock[min(paragraph_index, len(mock) - 1)]
+            return self._finalize(letter, job_info, candidate_name)
+
+        prompt = await run_blocking(
+            "nlp",
+            self.prompt_builder.build_regenerate_prompt,
             resume_analysis=resume_analysis,
             job_info=job_info,
+            body=letter["body"],
+            index=paragraph_index,
             candidate_name=candidate_name
         )
+        num_predict = self.budget.paragraph_predict(MAX_BODY_PARAGRAPHS)
+
+        paragraph = await self.scheduler.run(
+            lambda: self._generate_paragraph(prompt, num_predict),
+            priority=priority,
+            deadline_seconds=deadline_seconds,
+            is_disconnected=is_disconnected
+        )
+
+        letter["body"][paragraph_index] = paragraph
+        return self._finalize(letter, job_info, candidate_name)
+
+    async def generate_cover_letter_batch(
+        self,
+        resume_analysis: Dict,
+        jobs: List[Dict],
+        candidate_name: Optional[str] = "",
+        deadline_seconds: Optional[float] = None,
+        is_disconnected: Optional[DisconnectCheck] = None
+    ) -> AsyncIterator[Dict]:
+        """
+        Generate one letter per job_info (one per job and tone variant),
+        yielding each result as soon as it is finished:
+
+            {"index", "status" ("ok" or "error"), "cover_letter", "error"}
+
+        Facts are selected once per job and shared by its tone variants,
+        whose prompts then differ only in the tone line. Letters run with
+        BATCH priority, at most COVER_LETTER_BATCH_WINDOW at a time, and a
+        failed letter is reported inline without failing the batch.
+        deadline_seconds applies to each letter from the moment it enters
+        the scheduler.
+        """
+
+        if not resume_analysis or not jobs:
+            raise ValueError("resume_analysis and jobs are required")
+
+        if not await self._llm_available():
+            logging.warning("Ollama not available - returning mock cover letters for testing")
+            for index, job_info in enumerate(jobs):
+                yield self._batch_result(index, self._generate_mock_cover_letter(job_info, candidate_name or ""))
+            return
+
+        prompts = await run_blocking(
+            "nlp",
+            self._build_batch_prompts,
+            resume_analysis,
+            jobs,
+            candidate_name
+        )
+
+        window = asyncio.Semaphore(COVER_LETTER_BATCH_WINDOW or self.scheduler.max_concurrency)
+
+        async def generate(index: int) -> Dict:
+            async with window:
+                # Availability was checked once for the batch (which may have taken
+                # the half-open trial slot); only stop once the breaker opened
+                if self.health.breaker.state == OPEN:
+                    return self._batch_result(index, error="Ollama not available")
+                try:
+                    parser, stats = await self.scheduler.run(
+                        lambda: self._generate_letter(prompts[index], candidate_name),
+                        priority=BATCH,
+                        deadline_seconds=deadline_seconds,
+                        is_disconnected=is_disconnected
+                    )
+                except (DeadlineExceededError, SchedulerSaturatedError) as e:
+                    return self._batch_result(index, error=str(e))
+                except (ConnectionError, RuntimeError) as e:
+                    logging.warning(f"Batch cover letter {index} failed: {e}")
+                    return self._batch_result(index, error="Cover letter generation failed")
 
-        raw = self.llm_client.generate_text(
+            _, cover_letter = self._finish_letter(parser, stats)
+            return self._batch_result(index, self._finalize(cover_letter, jobs[index], candidate_name))
+
+        tasks = [asyncio.ensure_future(generate(index)) for index in range(len(jobs))]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield await finished
+        finally:
+            # Client gone: stop the letters still queued or generating
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _build_batch_prompts(
+        self,
+        resume_analysis: Dict,
+        jobs: List[Dict],
+        candidate_name: Optional[str]
+    ) -> List[str]:
+        facts = {}
+        prompts = []
+        for job_info in jobs:
+            # Tone variants of a job share its facts
+            key = (job_info.get("job_title", ""), job_info.get("job_description", ""))
+            if key not in facts:
+                facts[key] = select_facts(resume_analysis, job_info)
+            prompts.append(self.prompt_builder.build_prompt(
+                resume_analysis, job_info, candidate_name, facts=facts[key]
+            ))
+        return prompts
+
+    @staticmethod
+    def _batch_result(index: int, cover_letter: Optional[Dict] = None, error: Optional[str] = None) -> Dict:
+        return {
+            "index": index,
+            "status": "error" if error else "ok",
+            "cover_letter": cover_letter,
+            "error": error,
+        }
+
+    async def _stream_mock_cover_letter(
+        self,
+        job_info: Dict,
+        candidate_name: str,
+        start: float
+    ) -> AsyncIterator[Tuple[str, Dict]]:
+        """Stream the mock cover letter word by word, so clients see the same events."""
+        letter = self._generate_mock_cover_letter(job_info, candidate_name)
+        first_token = None
+
+        parts = [("greeting", 0, letter["greeting"])]
+        parts += [("body", i, p) for i, p in enumerate(letter["body"])]
+        parts += [("closing", 0, letter["closing"]), ("sign_off", 0, letter["sign_off"])]
+
+        for name, index, text in parts:
+            for word in text.split(" "):
+                if first_token is None:
+                    first_token = time.perf_counter()
+                yield "token", {"text": word + " "}
+            yield "token", {"text": "\n\n"}
+            yield "section", {"section": name, "index": index, "text": text}
+
+        yield "done", {
+            "cover_letter": letter,
+            "timings": self._timings(start, first_token),
+        }
+
+    @staticmethod
+    def _timings(start: float, first_token: Optional[float]) -> Dict:
+        end = time.perf_counter()
+        ttft = (first_token - start) if first_token is not None else None
+        logging.info(
+            "Cover letter streamed: first token %s, total %.2fs",
+            f"{ttft:.2f}s" if ttft is not None else "n/a",
+            end - start
+        )
+        return {
+            "time_to_first_token_ms": round(ttft * 1000, 1) if ttft is not None else None,
+            "total_ms": round((end - start) * 1000, 1),
+        }
+
+    async def _decode(
+        self,
+        prompt: str,
+        parser: CoverLetterStreamParser,
+        candidate_name: Optional[str],
+        stats: Dict
+    ) -> AsyncIterator[Tuple[str, Dict]]:
+        """
+        Stream one letter from Ollama into parser, yielding token and section
+        events. Decoding stops at the sign-off (stop sequences), at the token
+        budget, or as soon as the model runs past the letter's structure.
+        """
+        num_predict = self.budget.num_predict()
+        chunks = self.llm_client.stream_text(
             prompt=prompt,
             temperature=0.7,
-            max_tokens=1000
+            max_tokens=num_predict,
+            stop=STOP_SEQUENCES,
+            num_ctx=self.budget.num_ctx(prompt, num_predict),
+            stats=stats
         )
 
-        cover_letter = self.text_parser.parse_text_response(raw)
-        return self._finalize(cover_letter, job_info, candidate_name)
+        count = 0
+        try:
+            async for chunk in chunks:
+                count += 1
+                yield "token", {"text": chunk}
+                for section in parser.feed(chunk):
+                    yield "section", section
+                if parser.overflowed:
+                    # Closing the stream stops the decode in Ollama
+                    stats["done_reason"] = "structure"
+                    break
+        except RuntimeError:
+            self.health.breaker.record_failure()
+            raise
+        finally:
+            await chunks.aclose()
+        self.health.breaker.record_success()
+
+        # Ollama streams about one token per chunk; its own count is missing when cut
+        stats.setdefault("eval_count", count)
+
+        # The stop sequence swallowed the sign-off: add it back
+        if not SIGN_OFF_LINE.search(parser.text):
+            tail = "\n\nSincerely,\n" + (candidate_name or "")
+            yield "token", {"text": tail}
+            for section in parser.end_with(tail):
+                yield "section", section
+
+    async def _generate_letter(
+        self,
+        prompt: str,
+        candidate_name: Optional[str]
+    ) -> Tuple[CoverLetterStreamParser, Dict]:
+        parser = CoverLetterStreamParser()
+        stats: Dict = {}
+        async for _ in self._decode(prompt, parser, candidate_name, stats):
+            pass
+        return parser, stats
+
+    def _finish_letter(self, parser: CoverLetterStreamParser, stats: Dict) -> Tuple[List[Dict], Dict]:
+        sections, cover_letter = parser.finish()
+
+        # Complete letters say how long a letter needs to be; truncated ones that it needs more
+        truncated = stats.get("done_reason") == "length"
+        if truncated or len(cover_letter["body"]) == MAX_BODY_PARAGRAPHS:
+            self.budget.record(stats.get("eval_count"), truncated=truncated)
+
+        logging.debug(
+            "Cover letter decoded %s tokens (%s)",
+            stats.get("eval_count"),
+            stats.get("done_reason")
+        )
+        return sections, cover_letter
+
+    async def _generate_parallel(
+        self,
+        resume_analysis: Dict,
+        job_info: Dict,
+        candidate_name: Optional[str],
+        priority: int,
+        deadline_seconds: Optional[float],
+        is_disconnected: Optional[DisconnectCheck]
+    ) -> Dict:
+        """
+        Generate the body paragraphs as concurrent decodes, each admitted by
+        the scheduler like a letter, and assemble them into the letter
+        structure. The prompts differ only in their last lines, so each
+        Ollama slot reuses the cached context.
+        """
+        prompts = await run_blocking(
+            "nlp",
+            self.prompt_builder.build_paragraph_prompts,
+            resume_analysis=resume_analysis,
+            job_info=job_info,
+            candidate_name=candidate_name
+        )
+        num_predict = self.budget.paragraph_predict(len(prompts))
+
+        tasks = [
+            asyncio.ensure_future(self.scheduler.run(
+                lambda prompt=prompt: self._generate_paragraph(prompt, num_predict),
+                priority=priority,
+                deadline_seconds=deadline_seconds,
+                is_disconnected=is_disconnected
+            ))
+            for prompt in prompts
+        ]
+        try:
+            paragraphs = await asyncio.gather(*tasks)
+        finally:
+            # One failed paragraph fails the letter: stop the others
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        text = "\n\n".join([
+            f"Dear Hiring Manager at {job_info.get('company_name', '')},",
+            *paragraphs,
+            "I look forward to discussing this opportunity further.",
+            "Sincerely,\n" + (candidate_name or ""),
+        ])
+        return self.text_parser.parse_text_response(text)
+
+    async def _generate_paragraph(self, prompt: str, num_predict: int) -> str:
+        """
+        One body paragraph, decoded again if the model returns a short or
+        empty one.
+
+        Raises:
+            ParagraphGenerationError: If no attempt gives a usable paragraph
+        """
+        for attempt in range(1, PARAGRAPH_ATTEMPTS + 1):
+            paragraph = await self._decode_paragraph(prompt, num_predict)
+            if len(paragraph) > MIN_PARAGRAPH_CHARS:
+                return paragraph
+            logging.warning(
+                "Cover letter paragraph too short (%d chars, attempt %d of %d)",
+                len(paragraph),
+                attempt,
+                PARAGRAPH_ATTEMPTS
+            )
+        raise ParagraphGenerationError("LLM returned no usable paragraph")
+
+    async def _decode_paragraph(self, prompt: str, num_predict: int) -> str:
+        """
+        Stream one paragraph and stop at the first blank line after its text.
+        Leading blank lines and label lines do not stop it, which a "\n\n"
+        stop sequence would.
+        """
+        stats: Dict = {}
+        chunks = self.llm_client.stream_text(
+            prompt=prompt,
+            temperature=0.7,
+            max_tokens=num_predict,
+            stop=STOP_SEQUENCES,
+            num_ctx=self.budget.num_ctx(prompt, num_predict),
+            stats=stats
+        )
+
+        text = ""
+        try:
+            async for chunk in chunks:
+                text += chunk
+                end = paragraph_end(text) if "\n" in chunk else None
+                if end is not None:
+                    # Closing the stream stops the decode in Ollama
+                    text = text[:end]
+                    stats["done_reason"] = "paragraph"
+                    break
+        except RuntimeError:
+            self.health.breaker.record_failure()
+            raise
+        finally:
+            await chunks.aclose()
+        self.health.breaker.record_success()
+
+        logging.debug(
+            "Cover letter paragraph decoded %s tokens (%s)",
+            stats.get("eval_count"),
+            stats.get("done_reason")
+        )
+        return clean_paragraph(text)
+
+    async def _build_prompt(self, resume_analysis: Dict, job_info: Dict, candidate_name: str) -> str:
+        # Fact selection runs spaCy and the skill embedder, so it stays off the event loop
+        return await run_blocking(
+            "nlp",
+            self.prompt_builder.build_prompt,
+            resume_analysis=resume_analysis,
+            job_info=job_info,
+            candidate_name=candidate_name
+        )
+
+    async def _llm_available(self) -> bool:
+        if self.health.last_checked is None:
+            # No probe yet (monitor not started, e.g. outside the app): probe once
+            await self.health.check()
+        return self.health.available()
 
     def _finalize(self, data: Dict, job_info: Dict, candidate_name: str) -> Dict:
         company = job_info.get("company_name", "")
@@ -80,15 +608,21 @@ class CoverLetterGenerator:
         data["candidate_name"] = candidate_name or ""
         return data
     
-    def health_check(self) -> Dict:
-        """Check if the LLM service is healthy."""
-        connected = self.llm_client.test_connection()
+    async def health_check(self) -> Dict:
+        """Report LLM health from the last background probe and the circuit breaker."""
+        if self.health.last_checked is None:
+            await self.health.check()
+
+        connected = bool(self.health.connected) and self.health.breaker.state != OPEN
         return {
             "status": "healthy" if connected else "degraded (using mock)",
             "llm_connected": connected,
             "model": self.llm_client.model_name if connected else None,
             "supported_models": self.get_supported_models() if connected else None,
-            "error": None if connected else "Ollama not available - mock mode enabled"
+            "error": None if connected else "Ollama not available - mock mode enabled",
+            "monitor": self.health.stats(),
+            "scheduler": self.scheduler.stats(),
+            "token_budget": self.budget.stats()
         }
     
     def get_supported_models(self):
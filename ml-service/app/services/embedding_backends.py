@@ -0,0 +1,166 @@
+"""
+Embedding Backends Service
+Interchangeable CPU backends for the MiniLM skill embedder: the
+sentence-transformers/PyTorch model, or an exported (optionally
+int8-quantized) ONNX version of the same model run with ONNX Runtime.
+
+Export the ONNX model with:
+  python export_onnx_embedder.py
+"""
+
+import os
+import logging
+from typing import List
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# "torch" (sentence-transformers) or "onnx" (ONNX Runtime)
+SKILL_EMBEDDING_BACKEND = os.getenv("SKILL_EMBEDDING_BACKEND", "torch").lower()
+
+DEFAULT_ONNX_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "data",
+    "onnx_embedder"
+)
+
+# Directory with model.onnx / model_int8.onnx and tokenizer.json
+SKILL_EMBEDDING_ONNX_DIR = os.getenv("SKILL_EMBEDDING_ONNX_DIR") or DEFAULT_ONNX_DIR
+SKILL_EMBEDDING_ONNX_QUANTIZED = os.getenv("SKILL_EMBEDDING_ONNX_QUANTIZED", "true").lower() in ("1", "true", "yes")
+
+# ONNX tokenizer truncation; skills are a few tokens long, so the model
+# default (256) only pads. The torch backend keeps the model's own settings.
+SKILL_EMBEDDING_MAX_SEQ_LENGTH = int(os.getenv("SKILL_EMBEDDING_MAX_SEQ_LENGTH", "32"))
+
+# ONNX Runtime intra-op threads (0 = runtime default)
+SKILL_EMBEDDING_ONNX_THREADS = int(os.getenv("SKILL_EMBEDDING_ONNX_THREADS", "0"))
+
+ONNX_FP32_FILE = "model.onnx"
+ONNX_INT8_FILE = "model_int8.onnx"
+TOKENIZER_FILE = "tokenizer.json"
+
+
+class TorchBackend:
+    """
+    sentence-transformers model on PyTorch (the reference implementation).
+
+    Encodes exactly as before the backends existed (model defaults, no
+    normalization), so vectors in existing caches and indexes stay valid.
+    """
+
+    def __init__(self, model_name: str):
+        # Imported here: sentence-transformers pulls in torch, which is slow to import
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model_name)
+        self.id = backend_id(model_name, "torch")
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        return self.model.encode(texts, convert_to_numpy=True)
+
+
+class OnnxBackend:
+    """
+    ONNX export of the same transformer, with the sentence-transformers
+    pooling (attention-masked mean) and normalization done in numpy.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        directory: str = SKILL_EMBEDDING_ONNX_DIR,
+        quantized: bool = SKILL_EMBEDDING_ONNX_QUANTIZED,
+        max_seq_length: int = SKILL_EMBEDDING_MAX_SEQ_LENGTH
+    ):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        model_file = ONNX_INT8_FILE if quantized else ONNX_FP32_FILE
+        model_path = os.path.join(directory, model_file)
+        tokenizer_path = os.path.join(directory, TOKENIZER_FILE)
+
+        for path in (model_path, tokenizer_path):
+            if not os.path.exists(path):
+                raise RuntimeError(
+                    f"ONNX embedder file {path} is missing. "
+                    f"Create it with: python export_onnx_embedder.py --output-dir {directory}"
+                )
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if SKILL_EMBEDDING_ONNX_THREADS > 0:
+            options.intra_op_num_threads = SKILL_EMBEDDING_ONNX_THREADS
+
+        self.session = ort.InferenceSession(
+            model_path,
+            sess_options=options,
+            providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+        self.tokenizer = Tokenizer.from_file(tokenizer_path)
+        self.tokenizer.enable_truncation(max_length=max_seq_length)
+        self.tokenizer.enable_padding()
+
+        self.id = f"{model_name}:onnx-{'int8' if quantized else 'fp32'}-seq{max_seq_length}"
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.zeros_like(input_ids)
+
+        token_embeddings = self.session.run(None, feeds)[0]
+
+        # Mean pooling over real tokens, then L2 normalization (as in all-MiniLM-L6-v2)
+        mask = attention_mask[:, :, None].astype(np.float32)
+        pooled = (token_embeddings * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+
+        return (pooled / np.maximum(norms, 1e-12)).astype(np.float32)
+
+
+def backend_id(model_name: str, backend: str = SKILL_EMBEDDING_BACKEND) -> str:
+    """
+    Identifier of the embeddings a backend produces, known without loading it.
+
+    Caches and indexes store vectors under this id, so switching backends
+    (or the ONNX quantization or truncation) never mixes vectors from
+    different settings.
+
+    Args:
+        model_name: Sentence-transformers model name
+        backend: Backend name
+
+    Returns:
+        Id such as "all-MiniLM-L6-v2:torch" or "all-MiniLM-L6-v2:onnx-int8-seq32"
+    """
+    if backend == "onnx":
+        precision = "int8" if SKILL_EMBEDDING_ONNX_QUANTIZED else "fp32"
+        return f"{model_name}:onnx-{precision}-seq{SKILL_EMBEDDING_MAX_SEQ_LENGTH}"
+    return f"{model_name}:torch"
+
+
+def create_backend(model_name: str, backend: str = SKILL_EMBEDDING_BACKEND):
+    """
+    Load an embedding backend.
+
+    Args:
+        model_name: Sentence-transformers model name
+        backend: "torch" or "onnx"
+
+    Returns:
+        Backend instance with an encode(texts) -> float32 array method
+    """
+    if backend == "onnx":
+        return OnnxBackend(model_name)
+    if backend == "torch":
+        return TorchBackend(model_name)
+    raise ValueError(f"Unknown SKILL_EMBEDDING_BACKEND '{backend}' (expected 'torch' or 'onnx')")
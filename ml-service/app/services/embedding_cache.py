@@ -0,0 +1,134 @@
+"""
+Embedding Cache Service
+Bounded LRU cache of normalized skill -> embedding in front of the
+sentence embedding model, optionally persisted to disk for warm restarts.
+"""
+
+import os
+import logging
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from app.services.lru_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_skill_key(skill: str) -> str:
+    """
+    Normalize a skill string into its cache key.
+
+    Args:
+        skill: Raw skill text
+
+    Returns:
+        Lowercased skill with collapsed whitespace
+    """
+    return " ".join(skill.lower().split())
+
+
+class EmbeddingCache:
+    """
+    LRU cache of skill embeddings.
+
+    Only cache misses are sent to the encoder, in a single batch. Cached
+    vectors are read-only so callers cannot corrupt shared entries.
+    """
+
+    def __init__(self, maxsize: int, model_name: str, path: Optional[str] = None):
+        self.model_name = model_name
+        self.path = path or None
+        self._cache = LRUCache(maxsize)
+
+    def encode(
+        self,
+        skills: List[str],
+        encoder: Callable[[List[str]], np.ndarray]
+    ) -> np.ndarray:
+        """
+        Embed skills, encoding only the ones not already cached.
+
+        Args:
+            skills: Skill strings
+            encoder: Batch encoder called with the normalized cache misses
+
+        Returns:
+            Numpy array of embeddings, one row per input skill
+        """
+        keys = [normalize_skill_key(s) for s in skills]
+        found, missing = self._cache.get_many(keys)
+
+        if missing:
+            vectors = np.asarray(encoder(missing), dtype=np.float32)
+            for key, vector in zip(missing, vectors):
+                vector.setflags(write=False)
+                found[key] = vector
+            self._cache.put_many(zip(missing, (found[k] for k in missing)))
+
+        return np.stack([found[k] for k in keys])
+
+    def stats(self) -> dict:
+        return {
+            **self._cache.stats(),
+            "model": self.model_name,
+            "persistent": self.path is not None,
+        }
+
+    # -----------------------------------------------------
+
+    def load(self) -> int:
+        """
+        Load persisted entries from self.path, if it exists and was written
+        for the same model.
+
+        Returns:
+            Number of entries loaded
+        """
+        if not self.path or not os.path.exists(self.path):
+            return 0
+
+        try:
+            with np.load(self.path, allow_pickle=False) as data:
+                if str(data["model"]) != self.model_name:
+                    logger.info("Ignoring embedding cache %s: built for another model", self.path)
+                    return 0
+                keys = data["keys"].tolist()
+                vectors = data["vectors"].astype(np.float32)
+        except Exception as e:
+            logger.error("Could not load embedding cache %s: %s", self.path, e)
+            return 0
+
+        for vector in vectors:
+            vector.setflags(write=False)
+        self._cache.put_many(zip(keys, vectors))
+
+        logger.info("Loaded %d skill embeddings from %s", len(keys), self.path)
+        return len(keys)
+
+    def save(self) -> int:
+        """
+        Write the cache to self.path atomically.
+
+        Returns:
+            Number of entries written
+        """
+        if not self.path:
+            return 0
+
+        items = self._cache.items()
+        if not items:
+            return 0
+
+        keys = np.array([k for k, _ in items])
+        vectors = np.stack([v for _, v in items])
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{self.path}.tmp.npz"
+        np.savez(tmp_path, model=np.array(self.model_name), keys=keys, vectors=vectors)
+        os.replace(tmp_path, self.path)
+
+        logger.info("Saved %d skill embeddings to %s", len(keys), self.path)
+        return len(keys)
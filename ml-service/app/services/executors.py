@@ -0,0 +1,216 @@
+"""
+Executor Service
+Runs blocking service calls off the asyncio event loop on bounded,
+per-workload thread and process pools.
+"""
+
+import os
+import asyncio
+import functools
+import logging
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor, BrokenExecutor
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+
+_CPUS = os.cpu_count() or 1
+
+# Workload classes: (pool kind, worker count, max queued tasks beyond the workers)
+#   parse    - PDF/DOCX text extraction (pymupdf, python-docx)
+#   nlp      - spaCy and SentenceTransformer inference (native code releases the GIL)
+#   analysis - pure-Python resume analysis and TF-IDF scoring for single requests
+#   batch    - resume analysis for /analyze-batch, isolated from interactive traffic
+# Ollama calls are async (app/services/llm_client.py) and need no pool.
+WORKLOADS = {
+    "parse": (
+        "thread",
+        _env_int("EXECUTOR_PARSE_WORKERS", 4),
+        _env_int("EXECUTOR_PARSE_QUEUE", 32),
+    ),
+    "nlp": (
+        "thread",
+        _env_int("EXECUTOR_NLP_WORKERS", 2),
+        _env_int("EXECUTOR_NLP_QUEUE", 32),
+    ),
+    "analysis": (
+        "process",
+        _env_int("EXECUTOR_ANALYSIS_WORKERS", max(_CPUS // 2, 1)),
+        _env_int("EXECUTOR_ANALYSIS_QUEUE", 64),
+    ),
+    "batch": (
+        "process",
+        _env_int("BATCH_ANALYSIS_WORKERS", _CPUS),
+        _env_int("EXECUTOR_BATCH_QUEUE", 2000),
+    ),
+}
+
+
+class ExecutorSaturatedError(RuntimeError):
+    """Raised when a workload's queue is full and the call is rejected."""
+
+
+class BoundedExecutor:
+    """
+    Wraps a thread or process pool with a cap on outstanding tasks and
+    counters for in-flight work.
+    """
+
+    def __init__(self, name: str, kind: str, workers: int, max_queue: int):
+        self.name = name
+        self.kind = kind
+        self.workers = max(workers, 1)
+        self.max_queue = max(max_queue, 0)
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._restarts = 0
+
+    def _get_executor(self) -> Executor:
+        # Pools are started on first use so idle workloads cost nothing
+        with self._lock:
+            if self._executor is None:
+                if self.kind == "process":
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers,
+                        thread_name_prefix=f"{self.name}-worker"
+                    )
+            return self._executor
+
+    def _discard(self, executor: Executor) -> None:
+        """
+        Drop a broken pool so the next call starts a new one.
+
+        A process pool is broken for good once one of its workers dies
+        (OOM kill, crash in native code).
+        """
+        with self._lock:
+            if self._executor is not executor:
+                # Another call already replaced it
+                return
+            self._executor = None
+            self._restarts += 1
+        logger.error("'%s' executor pool broke; starting a new one on the next call", self.name)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _acquire(self) -> None:
+        with self._lock:
+            if self._in_flight >= self.workers + self.max_queue:
+                self._rejected += 1
+                raise ExecutorSaturatedError(
+                    f"'{self.name}' executor is saturated, try again later"
+                )
+            self._in_flight += 1
+
+    def _release(self, _future: Any = None) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._completed += 1
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Run a blocking callable on this executor without blocking the event loop.
+
+        Raises:
+            ExecutorSaturatedError: If the workload queue is full
+        """
+        call = functools.partial(fn, *args, **kwargs)
+
+        self._acquire()
+        try:
+            executor = self._get_executor()
+            try:
+                future = executor.submit(call)
+            except BrokenExecutor:
+                # Broken before this call: it never ran, so it goes to a fresh pool
+                self._discard(executor)
+                executor = self._get_executor()
+                future = executor.submit(call)
+        except Exception:
+            self._release()
+            raise
+        # Release on the pool's future so abandoned awaits still count until the work ends
+        future.add_done_callback(self._release)
+
+        try:
+            return await asyncio.wrap_future(future)
+        except BrokenExecutor:
+            # A worker died while this call ran; the call fails, later ones get a new pool
+            self._discard(executor)
+            raise
+
+    def stats(self) -> Dict:
+        with self._lock:
+            in_flight = self._in_flight
+            return {
+                "kind": self.kind,
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "in_flight": in_flight,
+                "running": min(in_flight, self.workers),
+                "queued": max(in_flight - self.workers, 0),
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "restarts": self._restarts,
+                "started": self._executor is not None,
+            }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_executors: Dict[str, BoundedExecutor] = {
+    name: BoundedExecutor(name, kind, workers, max_queue)
+    for name, (kind, workers, max_queue) in WORKLOADS.items()
+}
+
+
+def get_executor(workload: str) -> BoundedExecutor:
+    """
+    Get the executor for a workload class.
+
+    Args:
+        workload: One of the keys of WORKLOADS
+
+    Returns:
+        BoundedExecutor instance
+    """
+    try:
+        return _executors[workload]
+    except KeyError:
+        raise ValueError(f"Unknown workload: {workload}")
+
+
+async def run_blocking(workload: str, fn: Callable, *args, **kwargs) -> Any:
+    """
+    Run a blocking callable on the executor for the given workload class.
+
+    Args:
+        workload: Workload class (parse, nlp, analysis, batch)
+        fn: Blocking callable; must be picklable for process workloads
+
+    Returns:
+        The callable's return value
+    """
+    return await get_executor(workload).run(fn, *args, **kwargs)
+
+
+def executor_stats() -> Dict[str, Dict]:
+    """Return queue depth and counters for every workload executor."""
+    return {name: ex.stats() for name, ex in _executors.items()}
+
+
+def shutdown_executors() -> None:
+    """Shut down every started pool."""
+    for ex in _executors.values():
+        ex.shutdown()
@@ -0,0 +1,248 @@
+"""
+Fact Selector Service
+Ranks resume facts against a job description and keeps the most relevant
+ones that fit the cover letter prompt budget.
+
+Skills are scored by their best semantic match to the skills of the job
+description (the same extractor and similarity matrix as /job-match),
+projects by the job skills their tech stack and description cover,
+experience by the job skills and title words its entries mention, and job
+description lines by the job skills they contain. Projects and experience
+with no relevance are dropped unless nothing is relevant. Facts are then added
+best-first, a round at a time per category, until PROMPT_FACTS_MAX_TOKENS
+is reached. Ties keep resume order, so without any signal the selection
+falls back to the first facts of the resume.
+"""
+
+import os
+import re
+import math
+import logging
+from typing import Dict, List, Optional, TypedDict
+
+from app.services.job_skill_extractor import extract_job_skills, extract_taxonomy_skills
+from app.services.semantic_skill_matcher import compute_similarity_matrix, PARTIAL_THRESHOLD
+from app.services.token_budget import CHARS_PER_TOKEN
+
+logger = logging.getLogger(__name__)
+
+# Estimated tokens for skills, experience, projects and job requirements together
+PROMPT_FACTS_MAX_TOKENS = int(os.getenv("PROMPT_FACTS_MAX_TOKENS", "160"))
+
+# Upper bounds per category, as in the prompt before selection
+MAX_SKILLS = 8
+MAX_PROJECTS = 2
+MAX_EXPERIENCE = 2
+MAX_REQUIREMENTS = 3
+
+# Skills kept even when fewer are relevant, so paragraph 2 has 2-3 to use
+MIN_SKILLS = 3
+
+# Project descriptions are cut at a word boundary after this many characters
+PROJECT_DESCRIPTION_CHARS = 120
+
+# Job title words that say nothing about the role
+TITLE_STOPWORDS = {"and", "for", "the", "with", "senior", "junior", "intern", "lead"}
+
+
+class SelectedFacts(TypedDict):
+    skills: List[str]
+    projects: List[Dict]
+    experience: List[Dict]
+    requirements: List[str]
+    tokens: int
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def project_line(project: Dict) -> str:
+    # Older clients send name/technologies instead of the extractor's title/tech_stack
+    title = project.get("title") or project.get("name") or ""
+    tech = ", ".join(project.get("tech_stack") or project.get("technologies") or [])
+    desc = project.get("description", "")
+    return f"- {title}: Built using {tech}. {desc}".strip()
+
+
+def experience_line(entry: Dict) -> Optional[str]:
+    role = entry.get("role") or entry.get("title") or ""
+    organization = entry.get("organization") or entry.get("company") or ""
+    if role and organization:
+        return f"- {role} at {organization}"
+    return None
+
+
+def _shorten(text: str, limit: int) -> str:
+    text = " ".join(text.split())
+    if len(text) <= limit:
+        return text
+    return text[:limit].rsplit(" ", 1)[0].rstrip(",;:") + "..."
+
+
+def _mentions(text: str, skill: str) -> bool:
+    """Whether lowercased text names the skill as a whole token ("java" is not in "javascript")."""
+    return re.search(rf"(?<![\w+#]){re.escape(skill.lower())}(?![\w+#])", text) is not None
+
+
+def _job_skills(job_description: str) -> List[str]:
+    try:
+        return extract_job_skills(job_description)
+    except Exception as e:
+        # spaCy unavailable: the taxonomy needs no model
+        logger.warning(f"Job skill extraction failed, using the skill taxonomy: {e}")
+        return extract_taxonomy_skills(job_description)
+
+
+def score_skills(skills: List[str], jd_skills: List[str], jd_text: str) -> Dict[str, float]:
+    """
+    Relevance of each skill to the job: its best similarity to a job skill,
+    or 1.0 when the job description names it.
+
+    Args:
+        skills: Resume skills (and project technologies)
+        jd_skills: Skills extracted from the job description
+        jd_text: Lowercased job description
+
+    Returns:
+        Dictionary of skill -> score
+    """
+    scores = {skill: 0.0 for skill in skills}
+    if not skills:
+        return scores
+
+    if jd_skills:
+        try:
+            best = compute_similarity_matrix(skills, jd_skills).max(axis=1)
+            scores.update({skill: float(score) for skill, score in zip(skills, best)})
+        except Exception as e:
+            logger.warning(f"Skill similarity failed, ranking by literal mentions: {e}")
+
+    for skill in skills:
+        if _mentions(jd_text, skill):
+            scores[skill] = 1.0
+    return scores
+
+
+def _ranked(items: List, scores: List[float]) -> List:
+    # Stable: equal scores keep resume order
+    order = sorted(range(len(items)), key=lambda i: -scores[i])
+    return [items[i] for i in order]
+
+
+def _relevant_or_first(items: List, scores: List[float]) -> List:
+    """Items with any relevance, best first; the first item when none has any."""
+    relevant = [item for item, score in zip(_ranked(items, scores), sorted(scores, reverse=True)) if score > 0]
+    return relevant or items[:1]
+
+
+def select_facts(
+    resume_analysis: Dict,
+    job_info: Dict,
+    max_tokens: int = PROMPT_FACTS_MAX_TOKENS
+) -> SelectedFacts:
+    """
+    Select the resume facts and job requirements for the cover letter prompt.
+
+    Args:
+        resume_analysis: Resume analysis output from /analyze endpoint
+        job_info: company_name, job_title and job_description
+        max_tokens: Estimated token budget for all selected facts
+
+    Returns:
+        SelectedFacts, each category best first (requirements in job description order)
+    """
+    jd = job_info.get("job_description", "")
+    jd_text = jd.lower()
+    jd_skills = _job_skills(jd) if jd.strip() else []
+
+    skills = list(dict.fromkeys(resume_analysis.get("skills", [])))
+    projects = [p for p in resume_analysis.get("projects", []) if p.get("title") or p.get("name")]
+    experience = [e for e in resume_analysis.get("experience", []) if experience_line(e)]
+    jd_lines = [l.strip() for l in jd.split("\n") if l.strip()]
+
+    tech = [t for p in projects for t in (p.get("tech_stack") or p.get("technologies") or [])]
+    skill_scores = score_skills(list(dict.fromkeys(skills + tech)), jd_skills, jd_text)
+
+    # Skills: relevant ones best first, padded in resume order up to MIN_SKILLS
+    ranked_skills = _ranked(skills, [skill_scores[s] for s in skills])
+    relevant = [s for s in ranked_skills if skill_scores[s] >= PARTIAL_THRESHOLD]
+    if len(relevant) < MIN_SKILLS:
+        relevant += [s for s in skills if s not in relevant][:MIN_SKILLS - len(relevant)]
+
+    def project_score(project: Dict) -> float:
+        stack = project.get("tech_stack") or project.get("technologies") or []
+        text = f"{project.get('title') or project.get('name') or ''} {project.get('description', '')}".lower()
+        return (
+            sum(skill_scores[t] for t in stack if skill_scores[t] >= PARTIAL_THRESHOLD)
+            + sum(1.0 for s in jd_skills if _mentions(text, s))
+        )
+
+    title_words = {w for w in re.findall(r"[a-z]+", job_info.get("job_title", "").lower())
+                   if len(w) > 2 and w not in TITLE_STOPWORDS}
+
+    def experience_score(entry: Dict) -> float:
+        role = (entry.get("role") or entry.get("title") or "").lower()
+        text = f"{role} {entry.get('description', '')}".lower()
+        return (
+            sum(1.0 for s in jd_skills if _mentions(text, s))
+            + len(title_words & set(re.findall(r"[a-z]+", role)))
+        )
+
+    candidates = {
+        "requirements": _ranked(jd_lines, [sum(1 for s in jd_skills if _mentions(l.lower(), s)) for l in jd_lines]),
+        "skills": relevant,
+        "projects": _relevant_or_first(projects, [project_score(p) for p in projects]),
+        "experience": _relevant_or_first(experience, [experience_score(e) for e in experience]),
+    }
+    limits = {
+        "requirements": MAX_REQUIREMENTS,
+        "skills": MAX_SKILLS,
+        "projects": MAX_PROJECTS,
+        "experience": MAX_EXPERIENCE,
+    }
+
+    def cost(kind: str, item) -> int:
+        if kind == "skills":
+            return estimate_tokens(item + ", ")
+        if kind == "projects":
+            return estimate_tokens(project_line(item))
+        if kind == "experience":
+            return estimate_tokens(experience_line(item))
+        return estimate_tokens(item)
+
+    candidates["projects"] = [
+        {**p, "description": _shorten(p.get("description", ""), PROJECT_DESCRIPTION_CHARS)}
+        for p in candidates["projects"]
+    ]
+
+    # Round robin, best first: every category gets its top fact before any gets a second
+    selected: Dict[str, List] = {kind: [] for kind in candidates}
+    used = 0
+    open_kinds = [kind for kind in candidates if candidates[kind]]
+    while open_kinds:
+        for kind in list(open_kinds):
+            # Skills are short, so they advance two per round
+            for _ in range(2 if kind == "skills" else 1):
+                pending = candidates[kind][len(selected[kind]):]
+                if not pending or len(selected[kind]) >= limits[kind]:
+                    open_kinds.remove(kind)
+                    break
+                needed = cost(kind, pending[0])
+                if used + needed > max_tokens and selected[kind]:
+                    open_kinds.remove(kind)
+                    break
+                # The top fact of each category is always kept
+                selected[kind].append(pending[0])
+                used += needed
+
+    # Requirements read best in the order the job description lists them
+    selected["requirements"].sort(key=jd_lines.index)
+
+    return {
+        "skills": selected["skills"],
+        "projects": selected["projects"],
+        "experience": selected["experience"],
+        "requirements": selected["requirements"],
+        "tokens": used,
+    }
@@ -3,10 +3,14 @@ Job Matcher Service
 Computes job-fit score and generates improvement feedback based on skill matching.
 """
 
+import os
 from typing import List, Dict
-from app.services.job_skill_extractor import extract_job_skills
+from app.services.job_skill_extractor import extract_job_skills, extract_job_skills_many
 from app.services.semantic_skill_matcher import (
     semantic_skill_matching,
+    semantic_skill_matching_many,
+    compute_similarity_matrix,
+    match_from_similarity,
     compute_skill_match_percentage
 )
 
@@ -15,6 +19,21 @@ from app.services.semantic_skill_matcher import (
 SKILL_MATCH_WEIGHT = 0.85
 ATS_SCORE_WEIGHT = 0.15
 
+# Upper bound on job descriptions accepted by match_job_with_resume_many
+MAX_JOBS_PER_MATCH = int(os.getenv("JOB_MATCH_MAX_JOBS", "500"))
+
+# Keyword-based categorization used to group missing skills in feedback
+CATEGORY_KEYWORDS = {
+    "cloud": ["aws", "azure", "gcp", "cloud", "s3", "ec2", "lambda"],
+    "devops": ["docker", "kubernetes", "jenkins", "ci/cd", "terraform", "ansible"],
+    "database": ["sql", "mongodb", "postgresql", "mysql", "redis", "database"],
+    "frontend": ["react", "angular", "vue", "html", "css", "javascript", "typescript"],
+    "backend": ["node", "express", "django", "flask", "fastapi", "spring", "api"],
+    "mobile": ["android", "ios", "flutter", "react native", "swift", "kotlin"],
+    "data science": ["python", "machine learning", "tensorflow", "pytorch", "pandas", "numpy"],
+    "testing": ["selenium", "jest", "pytest", "testing", "junit"],
+}
+
 
 def compute_job_fit_score(
     skill_match_percentage: float,
@@ -165,23 +184,11 @@ def group_skills_by_category(skills: List[str]) -> Dict[str, List[str]]:
         "testing": [],
     }
     
-    # Keyword-based categorization
-    category_keywords = {
-        "cloud": ["aws", "azure", "gcp", "cloud", "s3", "ec2", "lambda"],
-        "devops": ["docker", "kubernetes", "jenkins", "ci/cd", "terraform", "ansible"],
-        "database": ["sql", "mongodb", "postgresql", "mysql", "redis", "database"],
-        "frontend": ["react", "angular", "vue", "html", "css", "javascript", "typescript"],
-        "backend": ["node", "express", "django", "flask", "fastapi", "spring", "api"],
-        "mobile": ["android", "ios", "flutter", "react native", "swift", "kotlin"],
-        "data science": ["python", "machine learning", "tensorflow", "pytorch", "pandas", "numpy"],
-        "testing": ["selenium", "jest", "pytest", "testing", "junit"],
-    }
-    
     for skill in skills:
         skill_lower = skill.lower()
         categorized = False
         
-        for category, keywords in category_keywords.items():
+        for category, keywords in CATEGORY_KEYWORDS.items():
             if any(keyword in skill_lower for keyword in keywords):
                 categories[category].append(skill)
                 categorized = True
@@ -221,6 +228,25 @@ def match_job_with_resume(
     # Perform semantic matching
     match_results = semantic_skill_matching(resume_skills, jd_skills)
     
+    return build_match_result(match_results, jd_skills, ats_score)
+
+
+def build_match_result(
+    match_results: Dict,
+    jd_skills: List[str],
+    ats_score: float
+) -> Dict:
+    """
+    Turn semantic matching output into the job-match response.
+    
+    Args:
+        match_results: Output of semantic skill matching for one job
+        jd_skills: Skills extracted from the job description
+        ats_score: ATS score from resume analysis
+        
+    Returns:
+        Job matching results with score and feedback
+    """
     matched_skills = match_results["matched_skills"]
     partial_matches = match_results["partial_matches"]
     missing_skills = match_results["missing_skills"]
@@ -252,3 +278,81 @@ def match_job_with_resume(
         "missing_skills": missing_skills,
         "job_feedback": job_feedback
     }
+
+
+def match_job_with_resume_many(
+    resume_analysis: Dict,
+    job_descriptions: List[str]
+) -> List[Dict]:
+    """
+    Match one resume against many job descriptions.
+    
+    Job skills are extracted with batched spaCy processing and every
+    unique skill is embedded once for the whole call.
+    
+    Args:
+        resume_analysis: Resume analysis output from /analyze endpoint
+        job_descriptions: Raw job description texts
+        
+    Returns:
+        One job matching result per job description, each with its input
+        'index', ranked by job_fit_score (highest first)
+    """
+    resume_skills = resume_analysis.get("skills", [])
+    ats_score = resume_analysis.get("ats_score", 0)
+    
+    jd_skill_lists = extract_job_skills_many(job_descriptions)
+    match_results = semantic_skill_matching_many(resume_skills, jd_skill_lists)
+    
+    results = [
+        {"index": i, **build_match_result(match, jd_skills, ats_score)}
+        for i, (match, jd_skills) in enumerate(zip(match_results, jd_skill_lists))
+    ]
+    
+    # Stable sort: equal scores keep input order
+    results.sort(key=lambda r: r["job_fit_score"], reverse=True)
+    
+    return results
+
+
+def match_resumes_with_job(
+    resume_analyses: List[Dict],
+    jd_skills: List[str]
+) -> List[Dict]:
+    """
+    Match many resumes against one job's skills.
+    
+    The union of all resume skills is scored against the job skills once;
+    each resume then classifies its own rows of that matrix.
+    
+    Args:
+        resume_analyses: Resume analyses (with 'skills' and 'ats_score')
+        jd_skills: Skills extracted from the job description
+        
+    Returns:
+        One job matching result per resume, in input order
+    """
+    union = list(dict.fromkeys(
+        skill for analysis in resume_analyses for skill in analysis.get("skills", [])
+    ))
+    
+    similarities = None
+    if union and jd_skills:
+        similarities = compute_similarity_matrix(union, jd_skills)
+        row = {skill: i for i, skill in enumerate(union)}
+    
+    results = []
+    for analysis in resume_analyses:
+        resume_skills = list(dict.fromkeys(analysis.get("skills", [])))
+        
+        if similarities is not None and resume_skills:
+            rows = [row[skill] for skill in resume_skills]
+            match_results = match_from_similarity(resume_skills, jd_skills, similarities[rows])
+        else:
+            match_results = semantic_skill_matching(resume_skills, jd_skills)
+        
+        results.append(
+            build_match_result(match_results, jd_skills, analysis.get("ats_score", 0))
+        )
+    
+    return results
@@ -3,25 +3,87 @@ Job Skill Extractor Service
 Extracts required skills from job descriptions using spaCy and regex.
 """
 
+import os
 import re
-import spacy
-from typing import List, Set
+import hashlib
+import threading
+from importlib import metadata
+from typing import Iterable, List, Optional, Set
 
-# Load spaCy model with automatic download
-def load_spacy_model():
-    """Load spaCy model, downloading if necessary."""
+from app.services.lru_cache import LRUCache, register_cache
+from app.services.skill_automaton import SkillAutomaton, get_skill_automaton
+from app.services.model_registry import register_model, load_model
+
+# spaCy pipeline used for noun chunks and named entities
+SPACY_MODEL = os.getenv("JD_SPACY_MODEL", "en_core_web_sm")
+
+# Components that do not affect noun_chunks or doc.ents. noun_chunks need
+# the parser plus POS tags (tok2vec, tagger, attribute_ruler); entities
+# come from ner.
+SPACY_EXCLUDE = ["lemmatizer", "senter"]
+
+_nlp = None
+_nlp_lock = threading.Lock()
+
+
+def _load_nlp():
+    # Imported here: spaCy is slow to import and taxonomy mode never needs it
+    import spacy
+    
     try:
-        return spacy.load("en_core_web_sm")
-    except OSError:
-        print("Downloading spaCy model 'en_core_web_sm'...")
-        import subprocess
-        import sys
-        subprocess.check_call([
-            sys.executable, "-m", "spacy", "download", "en_core_web_sm"
-        ])
-        return spacy.load("en_core_web_sm")
+        return spacy.load(SPACY_MODEL, exclude=SPACY_EXCLUDE)
+    except OSError as e:
+        raise RuntimeError(
+            f"spaCy model '{SPACY_MODEL}' is not installed. "
+            f"Install it with: python -m spacy download {SPACY_MODEL}"
+        ) from e
+
+
+def get_nlp():
+    """
+    Get or load the spaCy pipeline (cached, loaded once under a lock).
+    
+    The model is never downloaded at runtime; install it with
+    `python -m spacy download en_core_web_sm` (the Dockerfile does).
+    
+    Returns:
+        spaCy Language pipeline
+    """
+    global _nlp
+    if _nlp is None:
+        with _nlp_lock:
+            if _nlp is None:
+                _nlp = load_model("spacy", _load_nlp)
+    return _nlp
+
+
+def _warmup() -> None:
+    get_nlp()("Experience with Python and Docker is required.")
+
+
+# "noun_chunks": spaCy noun chunks + entities + tech patterns (default)
+# "taxonomy": curated skill taxonomy + tech patterns, no spaCy
+JD_SKILL_EXTRACTION_MODE = os.getenv("JD_SKILL_EXTRACTION_MODE", "noun_chunks")
 
-nlp = load_spacy_model()
+# spaCy is only required for readiness when the noun_chunks mode uses it
+register_model("spacy", _warmup, required=JD_SKILL_EXTRACTION_MODE != "taxonomy")
+
+# Job descriptions per nlp.pipe batch in extract_job_skills_many
+JD_PIPE_BATCH_SIZE = int(os.getenv("JD_PIPE_BATCH_SIZE", "32"))
+
+# Bump when extraction logic or JD_SKILL_TAXONOMY changes so cached results are not reused
+EXTRACTOR_VERSION = "2"
+
+# Extracted skills per job description, keyed by a hash of the normalized text
+JD_SKILL_CACHE_SIZE = int(os.getenv("JD_SKILL_CACHE_SIZE", "2048"))
+JD_SKILL_CACHE_TTL = float(os.getenv("JD_SKILL_CACHE_TTL", "3600"))
+
+_jd_skill_cache = LRUCache(JD_SKILL_CACHE_SIZE, ttl=JD_SKILL_CACHE_TTL)
+register_cache("jd_skills", _jd_skill_cache)
+
+# Taxonomy automaton, rebuilt when the skill vocabulary version changes
+_taxonomy: Optional[SkillAutomaton] = None
+_taxonomy_lock = threading.Lock()
 
 
 # Skill-heavy section keywords
@@ -44,6 +106,65 @@ SOFT_SKILLS = {
     "self motivated", "collaborative", "flexible", "motivated"
 }
 
+# Regex patterns for tech terms, used as fallback in both modes
+TECH_PATTERNS = [
+    r'\b[A-Z][a-z]+(?:\.[a-z]+)+\b',  # e.g., Node.js, React.js
+    r'\b[A-Z]{2,}\b',  # e.g., AWS, SQL, API
+    r'\b\w+\+\+\b',  # e.g., C++
+    r'\b[Cc]#\b',  # C#
+]
+
+# Uppercase words the patterns pick up that are not skills
+PATTERN_STOPWORDS = {
+    "a", "an", "and", "or", "the", "we", "us", "you", "our", "to", "of",
+    "in", "on", "for", "is", "be", "as", "at", "by", "job", "new", "etc",
+}
+
+# Curated technical skill taxonomy for JD_SKILL_EXTRACTION_MODE=taxonomy,
+# merged with the resume skill vocabulary (SKILL_VOCAB / SKILL_VOCAB_PATH).
+# Terms that are also common English words ("rest", "spring", "r") are
+# left out or only listed in unambiguous forms ("rest api", "spring boot").
+JD_SKILL_TAXONOMY = frozenset({
+    # languages
+    "python", "java", "javascript", "typescript", "c", "c++", "c#", "golang",
+    "rust", "ruby", "php", "kotlin", "swift", "scala", "matlab", "perl",
+    "bash", "shell scripting", "sql", "html", "css", "sass", "dart", "objective-c",
+
+    # frontend
+    "react", "react.js", "react native", "next.js", "angular", "vue", "vue.js",
+    "svelte", "redux", "jquery", "tailwind", "bootstrap", "webpack", "vite",
+
+    # backend
+    "node.js", "express", "django", "flask", "fastapi", "spring boot",
+    "ruby on rails", "laravel", "asp.net", "graphql", "rest api", "restful",
+    "grpc", "microservices",
+
+    # data / ml
+    "machine learning", "deep learning", "nlp", "computer vision", "pandas",
+    "numpy", "scikit-learn", "tensorflow", "pytorch", "keras", "spark",
+    "pyspark", "hadoop", "airflow", "kafka", "tableau", "power bi", "spacy",
+    "hugging face", "transformers", "llm", "opencv", "data analysis",
+
+    # databases
+    "postgresql", "mysql", "sqlite", "mongodb", "redis", "cassandra",
+    "dynamodb", "elasticsearch", "firebase", "oracle", "sql server", "nosql",
+
+    # cloud / devops
+    "aws", "azure", "gcp", "google cloud", "ec2", "s3", "aws lambda", "docker",
+    "kubernetes", "terraform", "ansible", "jenkins", "github actions",
+    "gitlab ci", "ci/cd", "linux", "nginx", "helm", "prometheus", "grafana",
+
+    # mobile
+    "android", "ios", "flutter", "xamarin",
+
+    # testing
+    "selenium", "jest", "pytest", "junit", "cypress", "playwright", "unit testing",
+
+    # tools / practices
+    "git", "github", "gitlab", "jira", "postman", "figma", "agile", "scrum",
+    "oauth", "websockets", "rabbitmq",
+})
+
 
 def extract_skill_sections(job_description: str) -> str:
     """
@@ -131,8 +252,20 @@ def extract_technical_skills(text: str) -> List[str]:
         List of normalized technical skills
     """
     # Process with spaCy
-    doc = nlp(text)
+    return skills_from_doc(get_nlp()(text), text)
+
+
+def skills_from_doc(doc, text: str) -> List[str]:
+    """
+    Extract technical skills from an already processed spaCy doc.
     
+    Args:
+        doc: spaCy Doc for text
+        text: Text the doc was built from
+        
+    Returns:
+        List of normalized technical skills
+    """
     skills = set()
     
     # Extract noun phrases as potential skills
@@ -154,21 +287,82 @@ def extract_technical_skills(text: str) -> List[str]:
                 skills.add(skill)
     
     # Pattern-based extraction for common tech terms
-    # Technologies often appear in specific patterns
-    tech_patterns = [
-        r'\b[A-Z][a-z]+(?:\.[a-z]+)+\b',  # e.g., Node.js, React.js
-        r'\b[A-Z]{2,}\b',  # e.g., AWS, SQL, API
-        r'\b\w+\+\+\b',  # e.g., C++
-        r'\b[Cc]#\b',  # C#
-    ]
-    
-    for pattern in tech_patterns:
-        matches = re.findall(pattern, text)
-        for match in matches:
-            skill = clean_and_normalize_skill(match)
-            if skill:
+    skills.update(extract_pattern_skills(text))
+    
+    return list(skills)
+
+
+def extract_pattern_skills(text: str, covered: Optional[bytearray] = None) -> Set[str]:
+    """
+    Extract tech-looking tokens (Node.js, AWS, C++, C#) with regex patterns.
+    
+    Args:
+        text: Text to extract skills from
+        covered: Optional per-character mask; matches touching a covered
+            character are skipped
+        
+    Returns:
+        Set of normalized skills
+    """
+    skills = set()
+    
+    for pattern in TECH_PATTERNS:
+        for match in re.finditer(pattern, text):
+            if covered is not None and any(covered[match.start():match.end()]):
+                continue
+            skill = clean_and_normalize_skill(match.group())
+            if skill and skill not in PATTERN_STOPWORDS:
                 skills.add(skill)
     
+    return skills
+
+
+def get_taxonomy_automaton() -> SkillAutomaton:
+    """
+    Get the automaton over the JD skill taxonomy (cached).
+    
+    The taxonomy is JD_SKILL_TAXONOMY plus the resume skill vocabulary;
+    it is rebuilt whenever the skill vocabulary is reloaded.
+    
+    Returns:
+        SkillAutomaton instance
+    """
+    global _taxonomy
+    vocab = get_skill_automaton()
+    
+    taxonomy = _taxonomy
+    if taxonomy is None or taxonomy.version != vocab.version:
+        with _taxonomy_lock:
+            taxonomy = _taxonomy
+            if taxonomy is None or taxonomy.version != vocab.version:
+                taxonomy = SkillAutomaton(vocab.skills | JD_SKILL_TAXONOMY, version=vocab.version)
+                _taxonomy = taxonomy
+    
+    return taxonomy
+
+
+def extract_taxonomy_skills(text: str) -> List[str]:
+    """
+    Extract technical skills by matching the curated skill taxonomy, with
+    the regex tech patterns as fallback for tokens outside it.
+    
+    Runs no spaCy components, so the dependency parser is skipped entirely.
+    
+    Args:
+        text: Text to extract skills from
+        
+    Returns:
+        List of normalized technical skills
+    """
+    matches = get_taxonomy_automaton().find_all(text)
+    skills = {m.skill for m in matches}
+    
+    # Fallback only for text the taxonomy did not match ("CI/CD" is not also "ci", "cd")
+    covered = bytearray(len(text))
+    for m in matches:
+        covered[m.start:m.end] = b"\x01" * (m.end - m.start)
+    skills.update(extract_pattern_skills(text, covered))
+    
     return list(skills)
 
 
@@ -199,26 +393,137 @@ def deduplicate_skills(skills: List[str]) -> List[str]:
     return unique_skills
 
 
+def normalize_job_description(job_description: str) -> str:
+    """
+    Normalize line endings and surrounding whitespace so copies of the same
+    job description share one cache entry.
+    
+    Args:
+        job_description: Raw job description text
+        
+    Returns:
+        Normalized text (line structure is kept, section detection needs it)
+    """
+    lines = job_description.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    return "\n".join(line.rstrip() for line in lines).strip()
+
+
+_fingerprint = None
+
+
+def _extractor_fingerprint() -> str:
+    """
+    Identifies everything the extraction result depends on besides the text.
+    
+    In noun_chunks mode this is read from the installed model package, so
+    cache lookups do not need the pipeline to be loaded. In taxonomy mode
+    it is the skill vocabulary version.
+    """
+    global _fingerprint
+    if JD_SKILL_EXTRACTION_MODE == "taxonomy":
+        return f"taxonomy:{get_taxonomy_automaton().version}:{EXTRACTOR_VERSION}"
+    
+    if _fingerprint is None:
+        try:
+            model_version = metadata.version(SPACY_MODEL)
+        except metadata.PackageNotFoundError:
+            model_version = ""
+        excluded = ",".join(sorted(SPACY_EXCLUDE))
+        _fingerprint = f"{SPACY_MODEL}:{model_version}:-{excluded}:{EXTRACTOR_VERSION}"
+    return _fingerprint
+
+
+def job_description_key(job_description: str) -> str:
+    """
+    Content-addressed cache key of a normalized job description.
+    
+    The key covers the spaCy model name/version and EXTRACTOR_VERSION, so
+    changing either invalidates cached results automatically.
+    
+    Args:
+        job_description: Normalized job description text
+        
+    Returns:
+        Hex sha256 digest
+    """
+    digest = hashlib.sha256(_extractor_fingerprint().encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(job_description.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _finalize_skills(skills: List[str]) -> List[str]:
+    # Deduplicate, then sort alphabetically for consistency
+    skills = deduplicate_skills(skills)
+    skills.sort()
+    return skills
+
+
 def extract_job_skills(job_description: str) -> List[str]:
     """
     Main function to extract technical skills from job description.
     
+    Results are cached by a hash of the normalized text, so repeated
+    matches against the same job description skip spaCy.
+    
     Args:
         job_description: Raw job description text
         
     Returns:
         List of normalized, deduplicated technical skills
     """
+    job_description = normalize_job_description(job_description)
+    key = job_description_key(job_description)
+    
+    cached = _jd_skill_cache.get(key)
+    if cached is not None:
+        return list(cached)
+    
     # Extract skill-relevant sections
     skill_text = extract_skill_sections(job_description)
     
     # Extract technical skills
-    skills = extract_technical_skills(skill_text)
+    if JD_SKILL_EXTRACTION_MODE == "taxonomy":
+        skills = _finalize_skills(extract_taxonomy_skills(skill_text))
+    else:
+        skills = _finalize_skills(extract_technical_skills(skill_text))
     
-    # Deduplicate
-    skills = deduplicate_skills(skills)
+    _jd_skill_cache.put(key, tuple(skills))
+    return skills
+
+
+def extract_job_skills_many(job_descriptions: Iterable[str]) -> List[List[str]]:
+    """
+    Extract technical skills from many job descriptions.
     
-    # Sort alphabetically for consistency
-    skills.sort()
+    Cached descriptions are served from the cache. In noun_chunks mode the
+    skill sections of the rest go through spaCy together with nlp.pipe,
+    which batches them instead of running one doc at a time.
     
-    return skills
+    Args:
+        job_descriptions: Raw job description texts
+        
+    Returns:
+        One list of normalized, deduplicated skills per job description,
+        in input order
+    """
+    texts = [normalize_job_description(jd) for jd in job_descriptions]
+    keys = [job_description_key(text) for text in texts]
+    
+    found, missing = _jd_skill_cache.get_many(keys)
+    
+    if missing:
+        text_by_key = dict(zip(keys, texts))
+        skill_texts = [extract_skill_sections(text_by_key[key]) for key in missing]
+        
+        if JD_SKILL_EXTRACTION_MODE == "taxonomy":
+            for key, text in zip(missing, skill_texts):
+                found[key] = tuple(_finalize_skills(extract_taxonomy_skills(text)))
+        else:
+            docs = get_nlp().pipe(skill_texts, batch_size=JD_PIPE_BATCH_SIZE)
+            for key, text, doc in zip(missing, skill_texts, docs):
+                found[key] = tuple(_finalize_skills(skills_from_doc(doc, text)))
+        
+        _jd_skill_cache.put_many((key, found[key]) for key in missing)
+    
+    return [list(found[key]) for key in keys]
@@ -0,0 +1,263 @@
+"""
+Line Tokenizer Service
+Classifies resume section lines once (date range, single date, tech line,
+institution / degree / role keywords) in time linear in the line length.
+
+Replaces the DURATION_PATTERN regex that was copied into every extractor;
+its nested optional groups and whitespace alternation backtrack
+catastrophically on long whitespace-heavy lines from PDFs.
+"""
+
+import re
+from typing import FrozenSet, List, NamedTuple, Optional, Tuple
+
+from app.services.section_segmenter import Span, split_lines
+
+
+# Line kinds
+DATE_RANGE = "date_range"
+SINGLE_DATE = "single_date"
+TECH = "tech"
+TEXT = "text"
+
+MONTHS = {
+    "jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "sept",
+    "oct", "nov", "dec", "january", "february", "march", "april", "june",
+    "july", "august", "september", "october", "november", "december",
+}
+
+# Dashes accepted between the two dates of a range
+DASHES = {"-", "–", "—"}
+
+# Keyword tags; the lookahead lets matches of different tags overlap
+# (e.g. "high school" is both a degree and an institution)
+KEYWORD_PATTERN = re.compile(
+    r"""
+    (?=
+        (?P<institution>university|institute|college|school)
+      | (?P<degree>bachelor|b\.tech|btech|master|m\.tech|mtech|phd|secondary|senior\ secondary|high\ school)
+      | (?P<role>intern|engineer|developer|analyst|software|backend|frontend|full[-\ ]?stack)
+      | (?P<score>cgpa|percentage|%)
+    )
+    """,
+    re.IGNORECASE | re.VERBOSE
+)
+
+# Token types
+_WORD, _NUM, _SPACE, _DASH, _OTHER = range(5)
+
+
+class Token(NamedTuple):
+    type: int
+    start: int
+    end: int
+    value: str   # lowercased for words
+
+
+class Line(NamedTuple):
+    text: str
+    kind: str                      # DATE_RANGE, SINGLE_DATE, TECH or TEXT
+    date_start: Optional[str]      # e.g. "Jan 2023" (ranges and single dates)
+    date_end: Optional[str]        # e.g. "Present" (ranges only)
+    tags: FrozenSet[str]           # subset of {"institution", "degree", "role", "score"}
+
+    @property
+    def duration(self) -> Optional[str]:
+        if self.kind != DATE_RANGE:
+            return None
+        return f"{self.date_start} - {self.date_end}"
+
+    @property
+    def word_count(self) -> int:
+        return len(self.text.split())
+
+
+def _tokenize(line: str) -> List[Token]:
+    """Split a line into word, number, space, dash and other tokens in one pass."""
+    tokens: List[Token] = []
+    n = len(line)
+    i = 0
+
+    while i < n:
+        c = line[i]
+        j = i + 1
+
+        if c.isalpha():
+            while j < n and line[j].isalpha():
+                j += 1
+            tokens.append(Token(_WORD, i, j, line[i:j].lower()))
+        elif c.isdigit():
+            while j < n and line[j].isdigit():
+                j += 1
+            tokens.append(Token(_NUM, i, j, line[i:j]))
+        elif c.isspace():
+            while j < n and line[j].isspace():
+                j += 1
+            tokens.append(Token(_SPACE, i, j, ""))
+        elif c in DASHES:
+            tokens.append(Token(_DASH, i, j, c))
+        else:
+            tokens.append(Token(_OTHER, i, j, c))
+
+        i = j
+
+    return tokens
+
+
+def _is_year(token: Token) -> bool:
+    return token.type == _NUM and len(token.value) == 4
+
+
+def _is_month(token: Token) -> bool:
+    return token.type == _WORD and token.value in MONTHS
+
+
+def _date_start(tokens: List[Token], year_idx: int) -> int:
+    """Index of the first token of a date ending at tokens[year_idx] (month included)."""
+    k = year_idx - 1
+    if k >= 0 and tokens[k].type == _SPACE:
+        k -= 1
+    if k >= 0 and _is_month(tokens[k]):
+        return k
+    return year_idx
+
+
+def _date_end(tokens: List[Token], idx: int) -> Optional[int]:
+    """
+    Parse '[month [space]] (year | present)' starting at tokens[idx].
+
+    Returns:
+        Index of the last token of the date, or None
+    """
+    n = len(tokens)
+    k = idx
+
+    if k < n and _is_month(tokens[k]):
+        k += 1
+        if k < n and tokens[k].type == _SPACE:
+            k += 1
+
+    if k < n and (_is_year(tokens[k]) or (tokens[k].type == _WORD and tokens[k].value == "present")):
+        return k
+
+    # a bare month cannot end a range
+    return None
+
+
+def _separator_end(tokens: List[Token], idx: int) -> Optional[int]:
+    """
+    Parse a range separator starting at tokens[idx]:
+    '[space] (dash | "to") [space]' or a run of two or more whitespace characters.
+
+    Returns:
+        Index of the first token after the separator, or None
+    """
+    n = len(tokens)
+    k = idx
+
+    if k < n and tokens[k].type == _SPACE:
+        space = tokens[k]
+        k += 1
+        if k < n and (tokens[k].type == _DASH or (tokens[k].type == _WORD and tokens[k].value == "to")):
+            k += 1
+            if k < n and tokens[k].type == _SPACE:
+                k += 1
+            return k
+        return k if space.end - space.start >= 2 else None
+
+    if k < n and (tokens[k].type == _DASH or (tokens[k].type == _WORD and tokens[k].value == "to")):
+        k += 1
+        if k < n and tokens[k].type == _SPACE:
+            k += 1
+        return k
+
+    return None
+
+
+def find_date_range(line: str, tokens: Optional[List[Token]] = None) -> Optional[Tuple[str, str]]:
+    """
+    Find the leftmost date range such as "Jan 2023 - Present" or "2019  2021".
+
+    Each year token is tried once and every attempt looks at a bounded
+    number of following tokens, so the scan is linear in the line length.
+
+    Args:
+        line: Line text
+        tokens: Tokens of the line, if already computed
+
+    Returns:
+        Tuple of (start date, end date), or None
+    """
+    if tokens is None:
+        tokens = _tokenize(line)
+
+    for i, token in enumerate(tokens):
+        if not _is_year(token):
+            continue
+
+        sep_end = _separator_end(tokens, i + 1)
+        if sep_end is None:
+            continue
+
+        end_idx = _date_end(tokens, sep_end)
+        if end_idx is None:
+            continue
+
+        start_idx = _date_start(tokens, i)
+        end_start = sep_end
+
+        start = line[tokens[start_idx].start:token.end]
+        end = line[tokens[end_start].start:tokens[end_idx].end]
+        return start, end
+
+    return None
+
+
+def _single_date(line: str, tokens: List[Token]) -> Optional[str]:
+    """Return the line if it is exactly '[month [space]] year'."""
+    if not tokens or not _is_year(tokens[-1]):
+        return None
+    if len(tokens) == 1 or _date_start(tokens, len(tokens) - 1) == 0:
+        return line
+    return None
+
+
+def classify_line(line: str) -> Line:
+    """
+    Classify one stripped line.
+
+    Args:
+        line: Stripped, non-empty line
+
+    Returns:
+        Line with its kind, parsed dates and keyword tags
+    """
+    tokens = _tokenize(line)
+    tags = frozenset(m.lastgroup for m in KEYWORD_PATTERN.finditer(line))
+
+    date_range = find_date_range(line, tokens)
+    if date_range:
+        return Line(line, DATE_RANGE, date_range[0], date_range[1], tags)
+
+    single = _single_date(line, tokens)
+    if single:
+        return Line(line, SINGLE_DATE, single, None, tags)
+
+    if line.lower().startswith("tech"):
+        return Line(line, TECH, None, None, tags)
+
+    return Line(line, TEXT, None, None, tags)
+
+
+def tokenize_lines(text: str, span: Optional[Span] = None) -> List[Line]:
+    """
+    Split a section (or a span of the full text) into classified lines.
+
+    Args:
+        text: Section text, or the full resume when span is given
+        span: Optional (start, end) offsets of the section
+
+    Returns:
+        List of classified lines
+    """
+    return [classify_line(line) for line in split_lines(text, span)]
@@ -1,14 +1,83 @@
-import requests
+import asyncio
+import httpx
 import logging
+import json
 import os
+from typing import AsyncIterator, Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
+# Seconds to establish a connection to Ollama
+OLLAMA_CONNECT_TIMEOUT = float(os.getenv("OLLAMA_CONNECT_TIMEOUT", "5"))
+
+# Seconds to wait for the next bytes of a response (a whole non-streamed letter)
+OLLAMA_READ_TIMEOUT = float(os.getenv("OLLAMA_READ_TIMEOUT", "120"))
+
+# Open connections to Ollama; further calls wait up to OLLAMA_POOL_TIMEOUT for one
+OLLAMA_MAX_CONNECTIONS = int(os.getenv("OLLAMA_MAX_CONNECTIONS", "8"))
+OLLAMA_POOL_TIMEOUT = float(os.getenv("OLLAMA_POOL_TIMEOUT", "30"))
+
+# Seconds an idle connection is kept open for reuse
+OLLAMA_KEEPALIVE_EXPIRY = float(os.getenv("OLLAMA_KEEPALIVE_EXPIRY", "60"))
+
+# How long Ollama keeps the model (and its prompt cache) loaded after a request
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+
+
+_http_client: Optional[httpx.AsyncClient] = None
+_http_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared HTTP client (created on first use).
+
+    One keep-alive connection pool is shared by every LLMClient, so
+    connections to Ollama are reused across requests.
+
+    Returns:
+        httpx.AsyncClient bound to the running event loop
+    """
+    global _http_client, _http_client_loop
+
+    loop = asyncio.get_running_loop()
+    # Connections belong to the loop that opened them
+    if _http_client is None or _http_client_loop is not loop:
+        _http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(
+                connect=OLLAMA_CONNECT_TIMEOUT,
+                read=OLLAMA_READ_TIMEOUT,
+                write=OLLAMA_CONNECT_TIMEOUT,
+                pool=OLLAMA_POOL_TIMEOUT,
+            ),
+            limits=httpx.Limits(
+                max_connections=OLLAMA_MAX_CONNECTIONS,
+                max_keepalive_connections=OLLAMA_MAX_CONNECTIONS,
+                keepalive_expiry=OLLAMA_KEEPALIVE_EXPIRY,
+            ),
+        )
+        _http_client_loop = loop
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client and its connections."""
+    global _http_client, _http_client_loop
+
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+        _http_client_loop = None
+
 
 class LLMClient:
     """
     Ollama-based LLM client optimized for low-RAM systems.
     Designed for TEXT generation only (NO JSON).
+
+    All calls are async. Cancelling a call (e.g. when the HTTP client of
+    the route disconnects) closes its Ollama connection, which stops the
+    generation.
     """
 
     def __init__(
@@ -22,9 +91,12 @@ class LLMClient:
 
     # -----------------------------------------------------
 
-    def test_connection(self) -> bool:
+    async def test_connection(self) -> bool:
         try:
-            resp = requests.get(f"{self.base_url}/api/tags", timeout=5)
+            resp = await get_http_client().get(
+                f"{self.base_url}/api/tags",
+                timeout=httpx.Timeout(5, pool=OLLAMA_POOL_TIMEOUT),
+            )
             if resp.status_code != 200:
                 return False
             models = resp.json().get("models", [])
@@ -35,7 +107,68 @@ class LLMClient:
 
     # -----------------------------------------------------
 
-    def generate_text(
+    def _payload(
+        self,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        stream: bool,
+        stop: Optional[List[str]] = None,
+        num_ctx: Optional[int] = None,
+    ) -> dict:
+        options = {
+            "temperature": temperature,
+            "num_predict": max_tokens,
+            "stop": stop or [],
+        }
+        if num_ctx:
+            options["num_ctx"] = num_ctx
+
+        return {
+            "model": self.model_name,
+            "prompt": prompt,
+            "stream": stream,
+            # Unloading the model would also drop the cached prompt prefix
+            "keep_alive": OLLAMA_KEEP_ALIVE,
+            "options": options,
+        }
+
+    async def generate(
+        self,
+        prompt: str,
+        temperature: float = 0.4,
+        max_tokens: int = 600,
+        stop: Optional[List[str]] = None,
+        num_ctx: Optional[int] = None,
+    ) -> Dict:
+        """
+        Generate text and return Ollama's full response, including
+        prompt_eval_count / prompt_eval_duration (prompt tokens actually
+        evaluated, i.e. not served from the cache) and eval_count.
+        """
+
+        payload = self._payload(prompt, temperature, max_tokens, False, stop, num_ctx)
+
+        try:
+            resp = await get_http_client().post(self.generate_url, json=payload)
+            resp.raise_for_status()
+
+            data = resp.json()
+            logger.debug(
+                "Ollama evaluated %s prompt tokens in %.0f ms, generated %s tokens",
+                data.get("prompt_eval_count"),
+                data.get("prompt_eval_duration", 0) / 1e6,
+                data.get("eval_count")
+            )
+            return data
+
+        except httpx.PoolTimeout:
+            raise ConnectionError("All Ollama connections are busy, try again later")
+        except Exception as e:
+            logger.error(f"Ollama generation failed: {e}")
+            raise RuntimeError("LLM generation failed")
+
+    async def generate_text(
         self,
         prompt: str,
         temperature: float = 0.4,
@@ -45,30 +178,51 @@ class LLMClient:
         Generate plain English text from the LLM.
         NEVER expects JSON.
         """
+        data = await self.generate(prompt, temperature, max_tokens)
+        return data.get("response", "").strip()
 
-        payload = {
-            "model": self.model_name,
-            "prompt": prompt,
-            "stream": False,
-            "options": {
-                "temperature": temperature,
-                "num_predict": max_tokens,
-                # Remove stop tokens to let LLM complete thoughts
-                "stop": [],
-            },
-        }
+    # -----------------------------------------------------
+
+    async def stream_text(
+        self,
+        prompt: str,
+        temperature: float = 0.4,
+        max_tokens: int = 600,
+        stop: Optional[List[str]] = None,
+        num_ctx: Optional[int] = None,
+        stats: Optional[Dict] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Generate plain English text, yielding chunks as Ollama decodes them.
+        Closing the iterator closes the HTTP response, which stops the generation.
+
+        If a stats dict is given, Ollama's final counters (eval_count,
+        done_reason, ...) are written to it when the generation completes.
+        """
+
+        payload = self._payload(prompt, temperature, max_tokens, True, stop, num_ctx)
 
         try:
-            resp = requests.post(
-                self.generate_url,
-                json=payload,
-                timeout=120,  # Increased from 60 to 120 seconds
-            )
-            resp.raise_for_status()
+            # read timeout applies to each wait for the next chunk
+            async with get_http_client().stream("POST", self.generate_url, json=payload) as resp:
+                resp.raise_for_status()
 
-            text = resp.json().get("response", "").strip()
-            return text
+                # Ollama streams one JSON object per line
+                async for line in resp.aiter_lines():
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    if chunk.get("error"):
+                        raise RuntimeError(chunk["error"])
+                    if chunk.get("response"):
+                        yield chunk["response"]
+                    if chunk.get("done"):
+                        if stats is not None:
+                            stats.update({k: v for k, v in chunk.items() if k not in ("response", "context")})
+                        break
 
+        except httpx.PoolTimeout:
+            raise ConnectionError("All Ollama connections are busy, try again later")
         except Exception as e:
-            logger.error(f"Ollama generation failed: {e}")
+            logger.error(f"Ollama streaming failed: {e}")
             raise RuntimeError("LLM generation failed")
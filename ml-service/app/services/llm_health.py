@@ -0,0 +1,207 @@
+"""
+LLM Health Service
+Circuit breaker and background health monitor for Ollama, so generation
+and health endpoints decide from memory instead of probing per request.
+
+Breaker states:
+  closed    - Ollama is used
+  open      - Ollama is skipped (mock fallback) until the reset timeout
+  half_open - after the reset timeout, one trial request is let through;
+              its outcome closes or re-opens the breaker
+
+A background probe of /api/tags every OLLAMA_HEALTH_INTERVAL seconds
+opens the breaker as soon as Ollama or the model is gone, and closes it
+when they are back.
+"""
+
+import os
+import time
+import asyncio
+import logging
+import threading
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Seconds between background probes
+OLLAMA_HEALTH_INTERVAL = float(os.getenv("OLLAMA_HEALTH_INTERVAL", "10"))
+
+# Consecutive failed generations that open the breaker
+OLLAMA_FAILURE_THRESHOLD = int(os.getenv("OLLAMA_FAILURE_THRESHOLD", "3"))
+
+# Seconds the breaker stays open before a trial request is allowed
+OLLAMA_CIRCUIT_RESET = float(os.getenv("OLLAMA_CIRCUIT_RESET", "30"))
+
+# Breaker states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Thread-safe closed / open / half-open circuit breaker."""
+
+    def __init__(
+        self,
+        failure_threshold: int = OLLAMA_FAILURE_THRESHOLD,
+        reset_timeout: float = OLLAMA_CIRCUIT_RESET
+    ):
+        self.failure_threshold = max(failure_threshold, 1)
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_started: Optional[float] = None
+        self._rejected = 0
+
+    def allow_request(self) -> bool:
+        """
+        Decide whether a call may go to the backend.
+
+        Returns:
+            False while open, and in half-open while a trial is in flight
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+
+            now = time.monotonic()
+            if self.state == OPEN:
+                if now - self._opened_at < self.reset_timeout:
+                    self._rejected += 1
+                    return False
+                self.state = HALF_OPEN
+                self._trial_started = None
+
+            # A trial that never reported back (e.g. cancelled) expires
+            if self._trial_started is not None and now - self._trial_started < self.reset_timeout:
+                self._rejected += 1
+                return False
+
+            self._trial_started = now
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != CLOSED:
+                logger.info("Ollama circuit closed")
+            self.state = CLOSED
+            self._failures = 0
+            self._trial_started = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self.state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._open()
+
+    def trip(self) -> None:
+        """Open the breaker immediately."""
+        with self._lock:
+            self._open()
+
+    def _open(self) -> None:
+        if self.state != OPEN:
+            logger.warning("Ollama circuit opened, using mock cover letters")
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self._trial_started = None
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self._failures,
+                "rejected": self._rejected,
+            }
+
+
+class LLMHealthMonitor:
+    """
+    Keeps the last known health of an LLMClient in memory, refreshed by a
+    background asyncio task and by the outcome of real generations.
+    """
+
+    def __init__(self, llm_client, interval: float = OLLAMA_HEALTH_INTERVAL):
+        self.llm_client = llm_client
+        self.interval = interval
+        self.breaker = CircuitBreaker()
+        self.connected: Optional[bool] = None
+        self.last_checked: Optional[float] = None
+        self.last_latency_ms: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        _monitors.append(self)
+
+    def available(self) -> bool:
+        """Whether a generation should go to Ollama (in-memory, no I/O)."""
+        return self.breaker.allow_request()
+
+    async def check(self) -> bool:
+        """
+        Probe Ollama once and update the breaker.
+
+        Returns:
+            True if Ollama is reachable and the model is pulled
+        """
+        start = time.perf_counter()
+        connected = await self.llm_client.test_connection()
+
+        self.last_latency_ms = round((time.perf_counter() - start) * 1000, 1)
+        self.last_checked = time.time()
+        self.connected = connected
+
+        if connected:
+            self.breaker.record_success()
+        else:
+            # The probe is cheap and unambiguous: no need to wait for the threshold
+            self.breaker.trip()
+        return connected
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.check()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Ollama health probe failed: %s", e)
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Start background probing on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict:
+        return {
+            "connected": self.connected,
+            "last_checked": self.last_checked,
+            "last_latency_ms": self.last_latency_ms,
+            "monitoring": self._task is not None and not self._task.done(),
+            "circuit": self.breaker.stats(),
+        }
+
+
+_monitors: List[LLMHealthMonitor] = []
+
+
+def start_health_monitors() -> None:
+    """Start background probing for every monitor."""
+    for monitor in _monitors:
+        monitor.start()
+
+
+async def stop_health_monitors() -> None:
+    """Stop background probing."""
+    for monitor in _monitors:
+        await monitor.stop()
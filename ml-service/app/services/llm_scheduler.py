@@ -0,0 +1,321 @@
+"""
+LLM Scheduler Service
+Bounded, prioritized admission in front of Ollama: at most
+LLM_MAX_CONCURRENCY generations run at once, the rest wait in a priority
+queue (interactive before batch, FIFO within a priority) with a deadline.
+
+A waiting or running request is cancelled when its deadline passes or its
+HTTP client disconnects; cancelling a generation closes its Ollama
+connection, which stops the decode.
+"""
+
+import os
+import time
+import heapq
+import asyncio
+import itertools
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Generations sent to Ollama at once (match OLLAMA_NUM_PARALLEL)
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "2"))
+
+# Requests allowed to wait; beyond this new requests are rejected (503)
+LLM_MAX_QUEUE = int(os.getenv("LLM_MAX_QUEUE", "32"))
+
+# Default seconds a request may take from arrival to its last token
+LLM_DEFAULT_DEADLINE = float(os.getenv("LLM_DEFAULT_DEADLINE", "180"))
+
+# Seconds between disconnect checks and queue position updates
+LLM_POLL_INTERVAL = float(os.getenv("LLM_POLL_INTERVAL", "0.5"))
+
+# Priorities (lower runs first)
+INTERACTIVE = 0
+BATCH = 1
+
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BATCH: "batch"}
+
+
+class SchedulerSaturatedError(RuntimeError):
+    """Raised when the LLM queue is full and the request is rejected."""
+
+
+class DeadlineExceededError(TimeoutError):
+    """Raised when a request's deadline passes while queued or generating."""
+
+
+class ClientDisconnectedError(ConnectionError):
+    """Raised when the HTTP client went away while queued or generating."""
+
+
+DisconnectCheck = Callable[[], Awaitable[bool]]
+
+
+def _consume_outcome(task: asyncio.Future) -> None:
+    if not task.cancelled():
+        task.exception()
+
+
+class Ticket:
+    """A request's place in the scheduler, from enqueue to release."""
+
+    def __init__(self, priority: int, seq: int, deadline: float):
+        self.priority = priority
+        self.seq = seq
+        self.deadline = deadline
+        self.enqueued_at = time.monotonic()
+        self.granted: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.released = False
+
+    def __lt__(self, other: "Ticket") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+    def remaining(self) -> float:
+        return self.deadline - time.monotonic()
+
+
+class LLMScheduler:
+    """
+    Admission control for LLM generations.
+
+    Usage:
+        result = await scheduler.run(lambda: client.generate_text(...))
+
+    or, to report queue positions while waiting:
+        ticket = scheduler.enqueue()
+        try:
+            async for position in scheduler.wait(ticket):
+                ...
+            ...generate...
+        finally:
+            scheduler.release(ticket)
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        max_queue: int = LLM_MAX_QUEUE,
+        default_deadline: float = LLM_DEFAULT_DEADLINE
+    ):
+        self.max_concurrency = max(max_concurrency, 1)
+        self.max_queue = max(max_queue, 0)
+        self.default_deadline = default_deadline
+        self._waiting: List[Ticket] = []
+        self._running = 0
+        self._seq = itertools.count()
+        self._counters = {
+            "completed": 0,
+            "rejected": 0,
+            "expired": 0,
+            "disconnected": 0,
+        }
+        self._wait_seconds = 0.0
+
+    # -----------------------------------------------------
+
+    def enqueue(self, priority: int = INTERACTIVE, deadline_seconds: Optional[float] = None) -> Ticket:
+        """
+        Take a slot, or a place in the queue.
+
+        Args:
+            priority: INTERACTIVE or BATCH
+            deadline_seconds: Seconds until the request is abandoned
+                (default LLM_DEFAULT_DEADLINE)
+
+        Returns:
+            Ticket; already granted when a slot was free
+
+        Raises:
+            SchedulerSaturatedError: If the queue is full
+        """
+        deadline = time.monotonic() + (deadline_seconds or self.default_deadline)
+        ticket = Ticket(priority, next(self._seq), deadline)
+
+        if self._running < self.max_concurrency and not self._waiting:
+            self._grant(ticket)
+            return ticket
+
+        if len(self._waiting) >= self.max_queue:
+            self._counters["rejected"] += 1
+            raise SchedulerSaturatedError("LLM queue is full, try again later")
+
+        heapq.heappush(self._waiting, ticket)
+        return ticket
+
+    async def wait(
+        self,
+        ticket: Ticket,
+        is_disconnected: Optional[DisconnectCheck] = None
+    ) -> AsyncIterator[int]:
+        """
+        Wait until the ticket is granted, yielding its 1-based queue
+        position whenever it changes.
+
+        Raises:
+            DeadlineExceededError: If the deadline passes first
+            ClientDisconnectedError: If the client disconnects first
+        """
+        last_position = None
+
+        while not ticket.granted.done():
+            position = self.position(ticket)
+            if position != last_position:
+                last_position = position
+                yield position
+
+            timeout = min(LLM_POLL_INTERVAL, ticket.remaining())
+            if timeout <= 0:
+                self._counters["expired"] += 1
+                raise DeadlineExceededError("Deadline passed while waiting for the LLM")
+
+            try:
+                await asyncio.wait_for(asyncio.shield(ticket.granted), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+            if not ticket.granted.done() and is_disconnected is not None and await is_disconnected():
+                self._counters["disconnected"] += 1
+                raise ClientDisconnectedError("Client disconnected while queued")
+
+    async def guard(
+        self,
+        ticket: Ticket,
+        awaitable: Awaitable,
+        is_disconnected: Optional[DisconnectCheck] = None
+    ) -> Any:
+        """
+        Await a generation, cancelling it at the ticket's deadline or when
+        the client disconnects.
+        """
+        task = asyncio.ensure_future(awaitable)
+        try:
+            while True:
+                remaining = ticket.remaining()
+                if remaining <= 0:
+                    self._counters["expired"] += 1
+                    raise DeadlineExceededError("Deadline passed during generation")
+
+                done, _ = await asyncio.wait({task}, timeout=min(LLM_POLL_INTERVAL, remaining))
+                if done:
+                    return task.result()
+
+                if is_disconnected is not None and await is_disconnected():
+                    self._counters["disconnected"] += 1
+                    raise ClientDisconnectedError("Client disconnected during generation")
+        finally:
+            if not task.done():
+                task.cancel()
+            # Nothing awaits the task after this; retrieve its outcome so a failure
+            # that races the cancellation is not logged as never retrieved
+            task.add_done_callback(_consume_outcome)
+
+    async def guard_iter(self, ticket: Ticket, iterator: AsyncIterator) -> AsyncIterator:
+        """
+        Iterate a streamed generation, cancelling it at the ticket's deadline.
+        (Streaming responses are already cancelled when the client disconnects.)
+        """
+        try:
+            while True:
+                remaining = ticket.remaining()
+                if remaining <= 0:
+                    self._counters["expired"] += 1
+                    raise DeadlineExceededError("Deadline passed during generation")
+                try:
+                    item = await asyncio.wait_for(iterator.__anext__(), remaining)
+                except StopAsyncIteration:
+                    return
+                except asyncio.TimeoutError:
+                    self._counters["expired"] += 1
+                    raise DeadlineExceededError("Deadline passed during generation")
+                yield item
+        finally:
+            await iterator.aclose()
+
+    def release(self, ticket: Ticket) -> None:
+        """Give back the ticket's slot, or leave the queue. Safe to call twice."""
+        if ticket.released:
+            return
+        ticket.released = True
+
+        if ticket.granted.done():
+            self._running -= 1
+            self._counters["completed"] += 1
+        else:
+            self._waiting.remove(ticket)
+            heapq.heapify(self._waiting)
+
+        while self._waiting and self._running < self.max_concurrency:
+            self._grant(heapq.heappop(self._waiting))
+
+    async def run(
+        self,
+        fn: Callable[[], Awaitable],
+        priority: int = INTERACTIVE,
+        deadline_seconds: Optional[float] = None,
+        is_disconnected: Optional[DisconnectCheck] = None
+    ) -> Any:
+        """
+        Run a generation once a slot is free.
+
+        Args:
+            fn: Returns the awaitable that talks to the LLM
+            priority: INTERACTIVE or BATCH
+            deadline_seconds: Seconds for queueing plus generation
+            is_disconnected: Returns True once the HTTP client is gone
+
+        Returns:
+            The awaitable's result
+        """
+        ticket = self.enqueue(priority, deadline_seconds)
+        try:
+            async for _ in self.wait(ticket, is_disconnected):
+                pass
+            return await self.guard(ticket, fn(), is_disconnected)
+        finally:
+            self.release(ticket)
+
+    # -----------------------------------------------------
+
+    def _grant(self, ticket: Ticket) -> None:
+        self._running += 1
+        self._wait_seconds += time.monotonic() - ticket.enqueued_at
+        ticket.granted.set_result(True)
+
+    def position(self, ticket: Ticket) -> int:
+        """1-based position of a waiting ticket (0 once granted)."""
+        if ticket.granted.done():
+            return 0
+        return 1 + sum(1 for other in self._waiting if other < ticket)
+
+    def stats(self) -> Dict:
+        granted = self._counters["completed"] + self._running
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "running": self._running,
+            "queued": {
+                name: sum(1 for t in self._waiting if t.priority == priority)
+                for priority, name in PRIORITY_NAMES.items()
+            },
+            **self._counters,
+            "avg_wait_ms": round(self._wait_seconds / granted * 1000, 1) if granted else None,
+        }
+
+
+_scheduler: Optional[LLMScheduler] = None
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    """
+    Get the process-wide LLM scheduler (created on first use).
+
+    Returns:
+        LLMScheduler instance
+    """
+    global _scheduler
+
+    if _scheduler is None:
+        _scheduler = LLMScheduler()
+    return _scheduler
@@ -0,0 +1,147 @@
+"""
+LRU Cache Service
+Small thread-safe LRU cache with optional TTL and hit/miss counters, plus
+a registry so every cache's statistics can be reported from one health
+endpoint.
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+
+class LRUCache:
+    """
+    Bounded least-recently-used mapping.
+
+    With a ttl (seconds), entries older than ttl are treated as missing and
+    dropped on lookup. All operations take an internal lock, so one
+    instance can be shared between request threads.
+    """
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        self.maxsize = max(maxsize, 0)
+        self.ttl = ttl if ttl and ttl > 0 else None
+        # key -> (expires_at or None, value)
+        self._data: "OrderedDict[Hashable, Tuple[Optional[float], Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _lookup(self, key: Hashable, now: float) -> Tuple[bool, Any]:
+        """Find a live entry and mark it recently used; caller holds the lock."""
+        entry = self._data.get(key)
+        if entry is None:
+            return False, None
+
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= now:
+            del self._data[key]
+            self.expirations += 1
+            return False, None
+
+        self._data.move_to_end(key)
+        return True, value
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            found, value = self._lookup(key, time.monotonic())
+            if found:
+                self.hits += 1
+                return value
+            self.misses += 1
+            return default
+
+    def get_many(self, keys: Iterable[Hashable]) -> Tuple[Dict[Hashable, Any], List[Hashable]]:
+        """
+        Look up several keys under one lock.
+
+        Returns:
+            Tuple of (found key -> value, missing keys in first-seen order)
+        """
+        found: Dict[Hashable, Any] = {}
+        missing: List[Hashable] = []
+        seen = set()
+
+        with self._lock:
+            now = time.monotonic()
+            for key in keys:
+                if key in seen:
+                    continue
+                seen.add(key)
+
+                hit, value = self._lookup(key, now)
+                if hit:
+                    found[key] = value
+                    self.hits += 1
+                else:
+                    missing.append(key)
+                    self.misses += 1
+
+        return found, missing
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._put(key, value)
+
+    def put_many(self, items: Iterable[Tuple[Hashable, Any]]) -> None:
+        with self._lock:
+            for key, value in items:
+                self._put(key, value)
+
+    def _put(self, key: Hashable, value: Any) -> None:
+        if self.maxsize == 0:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def items(self) -> List[Tuple[Hashable, Any]]:
+        """Snapshot of the live entries, least recently used first."""
+        with self._lock:
+            now = time.monotonic()
+            return [
+                (key, value) for key, (expires_at, value) in self._data.items()
+                if expires_at is None or expires_at > now
+            ]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "ttl": self.ttl,
+                "expirations": self.expirations,
+            }
+
+
+# name -> cache, for /health/caches
+_registry: Dict[str, Any] = {}
+
+
+def register_cache(name: str, cache: Any) -> None:
+    """Expose a cache (anything with a stats() method) under a name."""
+    _registry[name] = cache
+
+
+def cache_stats() -> Dict[str, Dict]:
+    """Return statistics for every registered cache."""
+    return {name: cache.stats() for name, cache in _registry.items()}
@@ -0,0 +1,151 @@
+"""
+Model Registry Service
+Tracks the load state of the heavy models (spaCy, SentenceTransformer) for
+the readiness probe, and optionally pre-warms them in the background.
+
+Models load lazily on first use. With ML_PREWARM enabled, a background
+thread loads every required model at startup and runs a dummy inference,
+so the first real request does not pay the load.
+"""
+
+import os
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Load every required model in the background at startup
+ML_PREWARM = os.getenv("ML_PREWARM", "false").lower() in ("1", "true", "yes")
+
+# Model states
+NOT_LOADED = "not_loaded"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+
+class ModelEntry:
+    def __init__(self, name: str, warmup: Callable[[], Any], required: bool):
+        self.name = name
+        self.warmup = warmup
+        self.required = required
+        self.state = NOT_LOADED
+        self.error: Optional[str] = None
+        self.load_seconds: Optional[float] = None
+
+    def to_dict(self) -> Dict:
+        return {
+            "state": self.state,
+            "required": self.required,
+            "load_seconds": round(self.load_seconds, 3) if self.load_seconds is not None else None,
+            "error": self.error,
+        }
+
+
+_models: Dict[str, ModelEntry] = {}
+_lock = threading.Lock()
+_prewarm_thread: Optional[threading.Thread] = None
+
+
+def register_model(name: str, warmup: Callable[[], Any], required: bool = True) -> None:
+    """
+    Register a lazily loaded model.
+
+    Args:
+        name: Model name reported by the readiness probe
+        warmup: Loads the model and runs a dummy inference
+        required: Whether readiness waits for this model when pre-warming
+    """
+    with _lock:
+        if name not in _models:
+            _models[name] = ModelEntry(name, warmup, required)
+
+
+def load_model(name: str, loader: Callable[[], Any]) -> Any:
+    """
+    Run a model loader and record its state and load time.
+
+    Args:
+        name: Registered model name
+        loader: Function returning the loaded model
+
+    Returns:
+        The loaded model
+    """
+    entry = _models.get(name)
+    if entry is not None:
+        entry.state = LOADING
+
+    start = time.perf_counter()
+    try:
+        model = loader()
+    except Exception as e:
+        if entry is not None:
+            entry.state = FAILED
+            entry.error = str(e)
+        raise
+
+    elapsed = time.perf_counter() - start
+    if entry is not None:
+        entry.state = READY
+        entry.error = None
+        entry.load_seconds = elapsed
+
+    logger.info("Loaded %s in %.2fs", name, elapsed)
+    return model
+
+
+def _prewarm() -> None:
+    for entry in list(_models.values()):
+        if not entry.required or entry.state == READY:
+            continue
+        try:
+            entry.warmup()
+        except Exception as e:
+            # state is already FAILED when the loader raised; warm-up inference errors land here
+            entry.state = FAILED
+            entry.error = str(e)
+            logger.error("Pre-warming %s failed: %s", entry.name, e)
+
+
+def start_prewarm() -> bool:
+    """
+    Start loading all required models in a background thread, if ML_PREWARM is set.
+
+    Returns:
+        True if a pre-warm thread was started
+    """
+    global _prewarm_thread
+
+    if not ML_PREWARM or _prewarm_thread is not None:
+        return False
+
+    _prewarm_thread = threading.Thread(target=_prewarm, name="model-prewarm", daemon=True)
+    _prewarm_thread.start()
+    return True
+
+
+def readiness() -> Dict:
+    """
+    Report whether the service can serve model-backed requests.
+
+    Any failed model makes the service not ready. With pre-warming on, the
+    service is ready once every required model is loaded; without it,
+    models load on first use and unloaded models do not block readiness.
+
+    Returns:
+        Dictionary with 'ready', 'prewarm' and per-model state
+    """
+    models = list(_models.values())
+
+    ready = not any(m.state == FAILED for m in models)
+    if ML_PREWARM:
+        ready = ready and all(m.state == READY for m in models if m.required)
+
+    return {
+        "ready": ready,
+        "prewarm": ML_PREWARM,
+        "models": {m.name: m.to_dict() for m in models},
+    }
@@ -1,5 +1,8 @@
 from typing import TypedDict, Optional
-import re
+
+from app.services.section_segmenter import Span
+from app.services.line_tokenizer import DATE_RANGE, SINGLE_DATE, TECH, Line, tokenize_lines
+from app.services.skill_automaton import get_skill_automaton
 
 
 class ProjectEntry(TypedDict):
@@ -10,122 +13,33 @@ class ProjectEntry(TypedDict):
     description: str
 
 
-SKILL_VOCAB = {
-    # languages
-    "c", "c++", "c#", "python", "javascript", "sql", "kotlin",
-
-    # frameworks / libraries
-    "fastapi", "react", "flutter", "express", "node.js",
-
-    # databases / infra
-    "mongodb", "firebase", "aws",
-
-    # tools
-    "git", "github", "postman", "vs code", "docker", "faiss"
-}
-
-
-SINGLE_DATE_PATTERN = re.compile(
-    r"""
-    ^
-    (?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec|
-       January|February|March|April|June|July|August|September|
-       October|November|December)?
-    \s*\d{4}
-    $
-    """,
-    re.IGNORECASE | re.VERBOSE
-)
-
-DURATION_PATTERN = re.compile(
-    r"""
-    (                           # start date
-        (?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec|
-           January|February|March|April|June|July|August|September|
-           October|November|December)?
-        \s*
-        \d{4}
-    )
-    \s*
-    (?:[-]|to|\u2013|\u2014|\s{2,})
-    \s*
-    (                           # end date
-        (?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec|
-           January|February|March|April|June|July|August|September|
-           October|November|December)?
-        \s*
-        (?:\d{4}|Present|present)
-    )
-    """,
-    re.IGNORECASE | re.VERBOSE
-)
-
-
-def normalize(text: str) -> str:
-    return (
-        text.lower()
-        .replace("&", "and")
-        .replace(".", "")
-        .replace("-", " ")
-    )
-
 def extract_tech_stack(line: str) -> list[str]:
     if not line.lower().startswith("tech"):
         return []
 
-    normalized = normalize(line)
-    found = []
-
-    for skill in SKILL_VOCAB:
-        # avoid single-letter skills unless standalone
-        if len(skill) == 1:
-            if f" {skill} " not in f" {normalized} ":
-                continue
-
-        if normalize(skill) in normalized:
-            found.append(skill)
-
-    return sorted(set(found))
-
-def preprocess_lines(text: str) -> list[str]:
-    return [
-        l.strip()
-        for l in text.splitlines()
-        if l.strip()
-    ]
-
-def is_title_candidate(line: str) -> bool:
-    words = line.split()
+    return get_skill_automaton().extract(line)
 
+def is_title_candidate(line: Line) -> bool:
     # length constraint
-    if len(words) > 10:
-        return False
-
-    lower = line.lower().strip()
-
-    # never treat tech lines as title
-    if lower.startswith("tech"):
-        return False
-
-    # never treat dates as titles
-    if DURATION_PATTERN.search(line):
+    if line.word_count > 10:
         return False
 
-    if SINGLE_DATE_PATTERN.match(line):
+    # never treat tech lines or dates as titles
+    if line.kind in (TECH, DATE_RANGE, SINGLE_DATE):
         return False
 
     # sentence-like
-    if line.endswith("."):
+    if line.text.endswith("."):
         return False
 
     return True
 
 
-def extract_projects(projects_text: str) -> list[ProjectEntry]:
+def extract_projects(projects_text: str, span: Optional[Span] = None) -> list[ProjectEntry]:
     if not projects_text:
         return []
 
-    lines = preprocess_lines(projects_text)
+    lines = tokenize_lines(projects_text, span)
 
     projects: list[ProjectEntry] = []
     current: Optional[ProjectEntry] = None
@@ -143,7 +57,7 @@ def extract_projects(projects_text: str) -> list[ProjectEntry]:
             if current is None or current["description"]:
                 flush()
                 current = {
-                    "title": line.replace("Github", "").strip(),
+                    "title": line.text.replace("Github", "").strip(),
                     "date": None,
                     "duration": None,
                     "tech_stack": [],
@@ -155,23 +69,22 @@ def extract_projects(projects_text: str) -> list[ProjectEntry]:
             continue
 
         # -------- DURATION (range only) --------
-        dur = DURATION_PATTERN.search(line)
-        if dur:
-            current["duration"] = f"{dur.group(1)} - {dur.group(2)}"
+        if line.kind == DATE_RANGE:
+            current["duration"] = line.duration
             continue
 
         # -------- SINGLE DATE --------
-        if SINGLE_DATE_PATTERN.match(line):
-            current["date"] = line.strip()
+        if line.kind == SINGLE_DATE:
+            current["date"] = line.date_start
             continue
 
         # -------- TECH STACK --------
-        if line.lower().startswith("tech"):
-            current["tech_stack"] = extract_tech_stack(line)
+        if line.kind == TECH:
+            current["tech_stack"] = extract_tech_stack(line.text)
             continue
 
         # -------- DESCRIPTION --------
-        current["description"] += line + " "
+        current["description"] += line.text + " "
 
     flush()
-    return projects
\ No newline at end of file
+    return projects
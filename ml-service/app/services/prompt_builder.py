@@ -1,34 +1,17 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
 
+from app.services.fact_selector import SelectedFacts, select_facts, project_line, experience_line
 
-class CoverLetterPromptBuilder:
-    """
-    Prompt builder tuned specifically for Gemma 2B.
-    Uses tight constraints, examples, and explicit bans.
-    """
 
-    def build_prompt(
-        self,
-        resume_analysis: Dict,
-        job_info: Dict,
-        candidate_name: str = ""
-    ) -> str:
-        company = job_info["company_name"]
-        title = job_info["job_title"]
-        tone = job_info.get("tone", "formal")
-
-        skills = ", ".join(resume_analysis.get("skills", [])[:8])
-        projects = self._format_projects(resume_analysis.get("projects", []))
-        experience = self._format_experience(resume_analysis.get("experience", []))
-
-        # 🔑 Extract only key requirements (first 3 lines max)
-        jd = job_info.get("job_description", "")
-        jd_lines = [l.strip() for l in jd.split("\n") if l.strip()]
-        key_requirements = "\n".join(jd_lines[:3])
-
-        return f"""
-You are writing a REAL professional cover letter, not a template.
+# What each body paragraph covers, in letter order
+PARAGRAPH_TASKS = [
+    "Introduce the application. Mention the role and company. Keep it direct.",
+    "Explain how the candidate’s skills match the role. Use 2–3 skills from the list.",
+    "Describe 1–2 projects. Mention tools used and what was built.",
+    "Explain why the candidate wants to work at the company. Use ONLY job info.",
+]
 
+RULES = """
 STRICT RULES (DO NOT BREAK):
 - DO NOT write placeholders like "Paragraph 1", "Generated content", or labels
 - DO NOT invent skills, experience, or education
@@ -36,40 +19,26 @@ STRICT RULES (DO NOT BREAK):
 - DO NOT mention years of experience unless explicitly provided
 - Write natural English, like a real applicant
 
-JOB:
-- Company: {company}
-- Role: {title}
-- Tone: {tone}
-
-CANDIDATE FACTS (ONLY SOURCE OF TRUTH):
-Skills: {skills}
-
-Experience:
-{experience}
+The CANDIDATE FACTS below are the ONLY source of truth about the candidate.
+The JOB section names the company, the role and its key requirements.
+""".strip()
 
-Projects:
-{projects}
+# Identical for every request, so Ollama can reuse its evaluated KV cache
+# for this prefix. Never put per-request values in here.
+INSTRUCTIONS = f"""
+You are writing a REAL professional cover letter, not a template.
 
-KEY JOB REQUIREMENTS:
-{key_requirements}
+{RULES}
 
 WRITE EXACTLY 4 PARAGRAPHS:
 
-Paragraph 1:
-Introduce the application. Mention the role and company. Keep it direct.
-
-Paragraph 2:
-Explain how the candidate’s skills match the role. Use 2–3 skills from the list.
-
-Paragraph 3:
-Describe 1–2 projects. Mention tools used and what was built.
-
-Paragraph 4:
-Explain why the candidate wants to work at {company}. Use ONLY job info.
+""".lstrip() + "\n\n".join(
+    f"Paragraph {i}:\n{task}" for i, task in enumerate(PARAGRAPH_TASKS, 1)
+) + """
 
 FORMAT EXACTLY LIKE THIS (NO EXTRA TEXT):
 
-Dear Hiring Manager at {company},
+<Greeting line from the JOB section>
 
 [Paragraph 1]
 
@@ -82,7 +51,150 @@ Dear Hiring Manager at {company},
 I look forward to discussing this opportunity further.
 
 Sincerely,
-{candidate_name}
+<Name from CANDIDATE FACTS>
+""".rstrip()
+
+# Prefix of the paragraph-parallel prompts; the task comes last, so the
+# four prompts of one letter share everything before it
+PARAGRAPH_INSTRUCTIONS = f"""
+You are writing ONE paragraph of a REAL professional cover letter, not a template.
+
+{RULES}
+
+Write ONLY the paragraph asked for at the end: 3-4 sentences of plain text.
+No greeting, no sign-off, no title, no blank lines.
+""".strip()
+
+
+class CoverLetterPromptBuilder:
+    """
+    Prompt builder tuned specifically for Gemma 2B.
+    Uses tight constraints, examples, and explicit bans.
+
+    The prompt is ordered from least to most variable: fixed instructions,
+    then candidate facts (selected for the job, see fact_selector), then the
+    job, then the tone. Ollama only re-evaluates the part after the longest
+    prefix it has already seen.
+    """
+
+    def build_prompt(
+        self,
+        resume_analysis: Dict,
+        job_info: Dict,
+        candidate_name: str = "",
+        facts: Optional[SelectedFacts] = None
+    ) -> str:
+        # Only the facts relevant to this job, within the prompt token budget
+        facts = facts or select_facts(resume_analysis, job_info)
+
+        return "\n\n".join([
+            INSTRUCTIONS,
+            self.build_facts_section(facts, candidate_name),
+            self.build_job_section(job_info, facts["requirements"]),
+        ])
+
+    def build_paragraph_prompts(
+        self,
+        resume_analysis: Dict,
+        job_info: Dict,
+        candidate_name: str = "",
+        facts: Optional[SelectedFacts] = None
+    ) -> List[str]:
+        """One prompt per body paragraph, for generating them concurrently."""
+        context = self._paragraph_context(resume_analysis, job_info, candidate_name, facts)
+        return [
+            f"{context}\n\nWRITE PARAGRAPH {i} OF {len(PARAGRAPH_TASKS)}:\n{task}"
+            for i, task in enumerate(PARAGRAPH_TASKS, 1)
+        ]
+
+    def build_regenerate_prompt(
+        self,
+        resume_analysis: Dict,
+        job_info: Dict,
+        body: List[str],
+        index: int,
+        candidate_name: str = "",
+        facts: Optional[SelectedFacts] = None
+    ) -> str:
+        """
+        Prompt for rewriting body[index] of an existing letter, with the
+        paragraphs around it so the new one connects to them. The letter
+        comes after the shared context, so that stays cached.
+        """
+        context = self._paragraph_context(resume_analysis, job_info, candidate_name, facts)
+
+        neighbours, links = [], []
+        if index > 0:
+            neighbours.append(f"PARAGRAPH BEFORE:\n{body[index - 1]}")
+            links.append("follow on from the paragraph before")
+        if index < len(body) - 1:
+            neighbours.append(f"PARAGRAPH AFTER:\n{body[index + 1]}")
+            links.append("lead into the paragraph after")
+
+        # The task is known when the letter has the usual four paragraphs
+        task = PARAGRAPH_TASKS[index] if len(body) == len(PARAGRAPH_TASKS) else "Cover the same topic as the old paragraph."
+
+        return "\n\n".join([
+            context,
+            *neighbours,
+            f"OLD PARAGRAPH (the reader did not like it):\n{body[index]}",
+            f"REWRITE PARAGRAPH {index + 1} OF {len(body)}:\n{task}\n"
+            "Say it differently from the old paragraph."
+            + (f" It must {' and '.join(links)}, without repeating its neighbours." if links else ""),
+        ])
+
+    def _paragraph_context(
+        self,
+        resume_analysis: Dict,
+        job_info: Dict,
+        candidate_name: str,
+        facts: Optional[SelectedFacts]
+    ) -> str:
+        facts = facts or select_facts(resume_analysis, job_info)
+
+        return "\n\n".join([
+            PARAGRAPH_INSTRUCTIONS,
+            self.build_facts_section(facts, candidate_name),
+            self.build_job_section(job_info, facts["requirements"]),
+        ])
+
+    # --------------------------------------------------
+
+    def build_facts_section(self, facts: SelectedFacts, candidate_name: str = "") -> str:
+        skills = ", ".join(facts["skills"])
+        projects = self._format_projects(facts["projects"])
+        experience = self._format_experience(facts["experience"])
+
+        return f"""
+CANDIDATE FACTS:
+Name: {candidate_name or "(not given)"}
+
+Skills: {skills}
+
+Experience:
+{experience}
+
+Projects:
+{projects}
+""".strip()
+
+    def build_job_section(self, job_info: Dict, requirements: List[str]) -> str:
+        company = job_info["company_name"]
+        title = job_info["job_title"]
+        tone = job_info.get("tone", "formal")
+
+        key_requirements = "\n".join(requirements)
+
+        return f"""
+JOB:
+- Company: {company}
+- Role: {title}
+
+KEY JOB REQUIREMENTS:
+{key_requirements}
+
+Tone: {tone}
+Greeting line: Dear Hiring Manager at {company},
 """.strip()
 
     # --------------------------------------------------
@@ -90,23 +202,8 @@ Sincerely,
     def _format_projects(self, projects: List[Dict]) -> str:
         if not projects:
             return "None"
-
-        lines = []
-        for p in projects[:2]:
-            name = p.get("name", "")
-            tech = ", ".join(p.get("technologies", []))
-            desc = p.get("description", "")
-            lines.append(f"- {name}: Built using {tech}. {desc}")
-        return "\n".join(lines)
+        return "\n".join(project_line(p) for p in projects)
 
     def _format_experience(self, experience: List[Dict]) -> str:
-        if not experience:
-            return "None"
-
-        lines = []
-        for e in experience[:2]:
-            role = e.get("title", "")
-            company = e.get("company", "")
-            if role and company:
-                lines.append(f"- {role} at {company}")
-        return "\n".join(lines)
+        lines = [line for line in map(experience_line, experience) if line]
+        return "\n".join(lines) or "None"
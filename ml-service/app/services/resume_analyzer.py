@@ -1,74 +1,48 @@
-from app.services.skill_extractor import extract_skills_from_section
+from app.services.skill_automaton import find_skills, skills_in_range
+from app.services.section_segmenter import scan_sections, span_text
 from app.services.education_extractor import extract_education
 from app.services.experience_extractor import extract_experience
 from app.services.project_extractor import extract_projects
-import re
-
-SECTION_HEADERS = {
-    "skills": "SKILLS",
-    "education": "EDUCATION",
-    "projects": "PROJECTS",
-    "experience": "EXPERIENCE",
-    "achievements": "ACHIEVEMENTS",
-    "positions": "POSITIONS OF RESPONSIBILITY"
-}
 
 
 def detect_sections(text: str) -> dict:
-    upper = text.upper()
-    return {
-        key: header in upper
-        for key, header in SECTION_HEADERS.items()
-    }
+    return scan_sections(text).present
 
 def extract_raw_sections(text: str) -> dict:
-    lines = text.splitlines()
-    section_indices = {}
-
-    # find line indices of each section header
-    for i, line in enumerate(lines):
-        normalized = line.strip().upper()
-        for key, header in SECTION_HEADERS.items():
-            if normalized == header:
-                section_indices[key] = i
-
-    # sort sections by appearance
-    ordered = sorted(section_indices.items(), key=lambda x: x[1])
-
-    raw_sections = {}
-
-    for idx, (section, start) in enumerate(ordered):
-        end = (
-            ordered[idx + 1][1]
-            if idx + 1 < len(ordered)
-            else len(lines)
-        )
-
-        raw_text = "\n".join(lines[start + 1 : end]).strip()
-        raw_sections[section] = raw_text
-
-    return raw_sections
+    spans = scan_sections(text).spans
+    return {
+        key: span_text(text, span)
+        for key, span in spans.items()
+    }
 
 
 def get_analysis(content: str):
 
-    sections_present = detect_sections(content)
-    raw_sections = extract_raw_sections(content)
+    scan = scan_sections(content)
+    spans = scan.spans
+
+    # one automaton pass over the whole resume, shared by every section
+    skill_mentions = find_skills(content)
 
-    skills = extract_skills_from_section(raw_sections.get("skills", ""))
-    # Fallback: if no skills found in dedicated section, scan full content
+    skills = (
+        skills_in_range(skill_mentions, *spans["skills"])
+        if "skills" in spans
+        else []
+    )
+    # Fallback: if no skills found in dedicated section, use the full content
     if not skills:
-        skills = extract_skills_from_section(content)
+        skills = sorted({m.skill for m in skill_mentions})
 
-    education = extract_education(raw_sections.get("education", ""))
-    experience = extract_experience(raw_sections.get("experience", ""))
-    projects = extract_projects(raw_sections.get("projects", ""))
+    education = extract_education(content, spans["education"]) if "education" in spans else []
+    experience = extract_experience(content, spans["experience"]) if "experience" in spans else []
+    projects = extract_projects(content, spans["projects"]) if "projects" in spans else []
 
     return {
-        "sections": sections_present,
-        "raw_sections": raw_sections,
+        "sections": scan.present,
+        "section_spans": spans,
+        "skill_mentions": skill_mentions,
         "skills": skills,
         "education": education,
         "experience": experience,
         "projects": projects,
-    }
\ No newline at end of file
+    }
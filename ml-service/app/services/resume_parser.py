@@ -1,9 +1,11 @@
-import pymupdf
-from docx import Document
 import io
 import re
 
+# pymupdf and python-docx are imported on first use to keep startup fast
+
 def extract_textpdf(file_bytes):
+    import pymupdf
+
     doc = pymupdf.open(stream=file_bytes, filetype="pdf")
     blocks = []
 
@@ -16,5 +18,7 @@ def extract_textpdf(file_bytes):
     return "\n".join(blocks)
 
 def extract_textdocs(file_bytes):
+    from docx import Document
+
     doc = Document(io.BytesIO(file_bytes))
     return "\n".join(paragraph.text for paragraph in doc.paragraphs)
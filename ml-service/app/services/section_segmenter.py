@@ -0,0 +1,182 @@
+"""
+Section Segmenter Service
+Finds resume section headers (and their synonyms) in one pass and returns
+(start, end) offsets into the original text instead of copied sections.
+"""
+
+import re
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# Canonical header per section; any mention of it marks the section as present
+SECTION_HEADERS = {
+    "skills": "SKILLS",
+    "education": "EDUCATION",
+    "projects": "PROJECTS",
+    "experience": "EXPERIENCE",
+    "achievements": "ACHIEVEMENTS",
+    "positions": "POSITIONS OF RESPONSIBILITY"
+}
+
+# Header lines recognised for each section (case-insensitive, optional trailing colon)
+SECTION_SYNONYMS = {
+    "skills": [
+        "skills", "technical skills", "key skills", "core skills",
+        "skills and tools", "skills & tools", "technical proficiencies",
+        "core competencies", "technologies",
+    ],
+    "education": [
+        "education", "academic background", "academic qualifications",
+        "educational qualifications", "academics",
+    ],
+    "projects": [
+        "projects", "academic projects", "personal projects", "key projects",
+        "technical projects", "selected projects",
+    ],
+    "experience": [
+        "experience", "work experience", "professional experience",
+        "employment history", "work history", "internships",
+        "internship experience",
+    ],
+    "achievements": [
+        "achievements", "accomplishments", "awards", "honors and awards",
+        "honours and awards", "awards and achievements", "awards & achievements",
+    ],
+    "positions": [
+        "positions of responsibility", "leadership", "leadership experience",
+        "extracurricular activities",
+    ],
+}
+
+Span = Tuple[int, int]
+
+
+def _phrase(synonym: str) -> str:
+    return r"[ \t]+".join(re.escape(word) for word in synonym.split())
+
+
+def _build_pattern() -> re.Pattern:
+    groups = []
+    for key, synonyms in SECTION_SYNONYMS.items():
+        # longest first so "work experience" wins over "experience"
+        ordered = sorted(set(synonyms), key=len, reverse=True)
+        groups.append(f"(?P<{key}>{'|'.join(_phrase(s) for s in ordered)})")
+    return re.compile("|".join(groups), re.IGNORECASE)
+
+
+SECTION_PATTERN = _build_pattern()
+
+_LINE_PATTERN = re.compile(r"[^\n]+")
+
+_HORIZONTAL_SPACE = " \t\r"
+
+
+class SectionScan(NamedTuple):
+    present: Dict[str, bool]   # section key -> mentioned anywhere in the text
+    spans: Dict[str, Span]     # section key -> content offsets (header line excluded)
+
+
+def _header_line_bounds(text: str, start: int, end: int) -> Optional[Span]:
+    """
+    Check whether a match at [start, end) is the only content of its line.
+
+    Returns:
+        (line_start, content_start) if it is a header line, otherwise None;
+        content_start is the offset just past the header line
+    """
+    i = start
+    while i > 0 and text[i - 1] in _HORIZONTAL_SPACE:
+        i -= 1
+    if i > 0 and text[i - 1] != "\n":
+        return None
+    line_start = i
+
+    n = len(text)
+    j = end
+    while j < n and text[j] in _HORIZONTAL_SPACE:
+        j += 1
+    if j < n and text[j] == ":":
+        j += 1
+        while j < n and text[j] in _HORIZONTAL_SPACE:
+            j += 1
+    if j < n and text[j] != "\n":
+        return None
+
+    return line_start, min(j + 1, n)
+
+
+def _strip_span(text: str, start: int, end: int) -> Span:
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
+
+
+def scan_sections(text: str) -> SectionScan:
+    """
+    Scan a resume once for section mentions and header lines.
+
+    A section is present when its canonical header appears anywhere in the
+    text (case-insensitive) or one of its synonyms forms a header line.
+    Each header line starts a section that runs until the next header line;
+    when a section header repeats, the last occurrence wins.
+
+    Args:
+        text: Raw resume text
+
+    Returns:
+        SectionScan with presence flags and stripped content spans
+    """
+    present = {key: False for key in SECTION_HEADERS}
+    headers: Dict[str, Span] = {}
+
+    for match in SECTION_PATTERN.finditer(text):
+        key = match.lastgroup
+        bounds = _header_line_bounds(text, match.start(), match.end())
+
+        if bounds is not None:
+            present[key] = True
+            headers[key] = bounds
+        elif SECTION_HEADERS[key] in match.group().upper():
+            present[key] = True
+
+    ordered = sorted(headers.items(), key=lambda item: item[1][0])
+
+    spans: Dict[str, Span] = {}
+    for idx, (key, (_, content_start)) in enumerate(ordered):
+        content_end = (
+            ordered[idx + 1][1][0]
+            if idx + 1 < len(ordered)
+            else len(text)
+        )
+        spans[key] = _strip_span(text, content_start, content_end)
+
+    return SectionScan(present, spans)
+
+
+def span_text(text: str, span: Optional[Span]) -> str:
+    """Copy out the text covered by a span ('' if the span is missing)."""
+    if not span:
+        return ""
+    return text[span[0]:span[1]]
+
+
+def split_lines(text: str, span: Optional[Span] = None) -> List[str]:
+    """
+    Return the stripped, non-empty lines of text, or of one span of it,
+    without copying the span first.
+
+    Args:
+        text: Full text
+        span: Optional (start, end) offsets restricting the lines
+
+    Returns:
+        List of stripped lines
+    """
+    start, end = span if span else (0, len(text))
+    lines = []
+    for match in _LINE_PATTERN.finditer(text, start, end):
+        line = match.group().strip()
+        if line:
+            lines.append(line)
+    return lines
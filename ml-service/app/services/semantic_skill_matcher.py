@@ -1,34 +1,101 @@
 """
 Semantic Skill Matcher Service
-Uses Sentence Transformers to semantically match resume skills with job skills.
+Uses Sentence Transformers (PyTorch or ONNX Runtime) to semantically match
+resume skills with job skills.
 """
 
 # Disable TensorFlow to avoid Keras 3 compatibility issues
 import os
 os.environ['TRANSFORMERS_NO_TF'] = '1'
 
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
+import threading
+
 import numpy as np
-from typing import List, Tuple, Dict
+from typing import List, Dict
+
+from app.services.embedding_cache import EmbeddingCache, normalize_skill_key
+from app.services.embedding_backends import SKILL_EMBEDDING_BACKEND, backend_id, create_backend
+from app.services.lru_cache import register_cache
+from app.services.skill_vocab_index import get_vocab_index
+from app.services.model_registry import register_model, load_model
+
+MODEL_NAME = 'all-MiniLM-L6-v2'
+
+# Model + backend id; caches and indexes only reuse vectors with the same id
+EMBEDDING_MODEL_ID = backend_id(MODEL_NAME)
+
+# Skill embedding cache size and optional persistence file (.npz)
+EMBEDDING_CACHE_SIZE = int(os.getenv("SKILL_EMBEDDING_CACHE_SIZE", "50000"))
+EMBEDDING_CACHE_PATH = os.getenv("SKILL_EMBEDDING_CACHE_PATH", "")
 
 # Cache the model in memory (lazy loading)
 _model = None
+_model_lock = threading.Lock()
+_embedding_cache = None
+_embedding_cache_lock = threading.Lock()
 
 
-def get_model() -> SentenceTransformer:
+def get_model():
     """
-    Get or load the Sentence Transformer model (cached).
+    Get or load the skill embedding backend (cached).
+    
+    SKILL_EMBEDDING_BACKEND selects the PyTorch sentence-transformers model
+    ("torch") or its ONNX Runtime export ("onnx").
     
     Returns:
-        SentenceTransformer model instance
+        Embedding backend with an encode(texts) method
     """
     global _model
     if _model is None:
-        _model = SentenceTransformer('all-MiniLM-L6-v2')
+        with _model_lock:
+            if _model is None:
+                _model = load_model(
+                    "skill_embedder",
+                    lambda: create_backend(MODEL_NAME, SKILL_EMBEDDING_BACKEND)
+                )
     return _model
 
 
+def _warmup() -> None:
+    get_model().encode(["python"])
+
+
+register_model("skill_embedder", _warmup)
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """
+    Get or create the skill embedding cache, warming it from disk if configured.
+    
+    Returns:
+        EmbeddingCache instance
+    """
+    global _embedding_cache
+    if _embedding_cache is None:
+        # nlp workers can get here at the same time; only one builds and loads the cache
+        with _embedding_cache_lock:
+            if _embedding_cache is None:
+                cache = EmbeddingCache(
+                    maxsize=EMBEDDING_CACHE_SIZE,
+                    model_name=EMBEDDING_MODEL_ID,
+                    path=EMBEDDING_CACHE_PATH
+                )
+                cache.load()
+                register_cache("skill_embeddings", cache)
+                _embedding_cache = cache
+    return _embedding_cache
+
+
+def save_embedding_cache() -> None:
+    """Persist the skill embedding cache if it was used and persistence is configured."""
+    if _embedding_cache is not None:
+        _embedding_cache.save()
+
+
+def _encode(skills: List[str]) -> np.ndarray:
+    return get_model().encode(skills)
+
+
 # Similarity thresholds
 MATCH_THRESHOLD = 0.70  # Strong match
 PARTIAL_THRESHOLD = 0.50  # Partial/related match
@@ -38,6 +105,9 @@ def compute_skill_embeddings(skills: List[str]) -> np.ndarray:
     """
     Compute embeddings for a list of skills.
     
+    Normalized skills are served from the embedding cache; only cache
+    misses are sent to the model, in one batch.
+    
     Args:
         skills: List of skill strings
         
@@ -47,55 +117,183 @@ def compute_skill_embeddings(skills: List[str]) -> np.ndarray:
     if not skills:
         return np.array([])
     
-    model = get_model()
-    embeddings = model.encode(skills, convert_to_numpy=True)
-    return embeddings
+    return get_embedding_cache().encode(skills, _encode)
 
 
-def match_single_skill(
-    resume_skill: str,
-    resume_embedding: np.ndarray,
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """
+    L2-normalize embedding rows so a matrix product gives cosine similarities.
+    
+    Args:
+        vectors: Array of shape (n, dim)
+        
+    Returns:
+        float32 array of unit rows (all-zero rows stay zero)
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def _normalized_embeddings(skills: List[str], rows: List, index) -> np.ndarray:
+    """
+    L2-normalized embeddings: vocabulary skills are read from the index,
+    the rest go through the embedding cache/model.
+    """
+    vectors = np.zeros((len(skills), index.embeddings.shape[1]), dtype=np.float32)
+    
+    known = [i for i, row in enumerate(rows) if row is not None]
+    unknown = [i for i, row in enumerate(rows) if row is None]
+    
+    if known:
+        vectors[known] = index.embeddings[[rows[i] for i in known]]
+    if unknown:
+        vectors[unknown] = normalize_rows(
+            compute_skill_embeddings([skills[i] for i in unknown])
+        )
+    
+    return vectors
+
+
+def compute_similarity_matrix(
+    resume_skills: List[str],
+    jd_skills: List[str]
+) -> np.ndarray:
+    """
+    Compute the resume x JD cosine similarity matrix.
+    
+    Pairs of known vocabulary skills are read from the precomputed
+    vocabulary table; the model only embeds skills outside the vocabulary.
+    All other pairs come from one product of normalized embeddings.
+    
+    Args:
+        resume_skills: Skills from resume
+        jd_skills: Skills from job description
+        
+    Returns:
+        Numpy array of shape (len(resume_skills), len(jd_skills))
+    """
+    index = get_vocab_index(EMBEDDING_MODEL_ID)
+    
+    if index is None:
+        resume_vectors = normalize_rows(compute_skill_embeddings(resume_skills))
+        jd_vectors = normalize_rows(compute_skill_embeddings(jd_skills))
+        return resume_vectors @ jd_vectors.T
+    
+    resume_rows = [index.row(normalize_skill_key(s)) for s in resume_skills]
+    jd_rows = [index.row(normalize_skill_key(s)) for s in jd_skills]
+    
+    resume_known = [i for i, r in enumerate(resume_rows) if r is not None]
+    jd_known = [j for j, r in enumerate(jd_rows) if r is not None]
+    resume_unknown = [i for i, r in enumerate(resume_rows) if r is None]
+    jd_unknown = [j for j, r in enumerate(jd_rows) if r is None]
+    
+    similarities = np.empty((len(resume_skills), len(jd_skills)), dtype=np.float32)
+    
+    # Known x known: table lookup
+    if resume_known and jd_known:
+        similarities[np.ix_(resume_known, jd_known)] = index.similarity[np.ix_(
+            [resume_rows[i] for i in resume_known],
+            [jd_rows[j] for j in jd_known]
+        )]
+    
+    # Any pair involving an unseen skill: embed and compare
+    if resume_unknown or jd_unknown:
+        resume_vectors = _normalized_embeddings(resume_skills, resume_rows, index)
+        jd_vectors = _normalized_embeddings(jd_skills, jd_rows, index)
+        
+        if resume_unknown:
+            similarities[resume_unknown] = resume_vectors[resume_unknown] @ jd_vectors.T
+        if jd_unknown and resume_known:
+            similarities[np.ix_(resume_known, jd_unknown)] = (
+                resume_vectors[resume_known] @ jd_vectors[jd_unknown].T
+            )
+    
+    return similarities
+
+
+def _top_k_alternatives(
+    resume_skills: List[str],
+    jd_skills: List[str],
+    similarities: np.ndarray,
+    top_k: int
+) -> Dict[str, List[Dict]]:
+    """Best top_k JD skills per resume skill, highest similarity first."""
+    k = min(top_k, len(jd_skills))
+    
+    # argpartition selects the k best per row in linear time; only those k are sorted
+    top = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+    top_scores = np.take_along_axis(similarities, top, axis=1)
+    order = np.argsort(-top_scores, axis=1, kind="stable")
+    top = np.take_along_axis(top, order, axis=1)
+    top_scores = np.take_along_axis(top_scores, order, axis=1)
+    
+    return {
+        resume_skill: [
+            {"skill": jd_skills[j], "score": round(float(score), 4)}
+            for j, score in zip(top[i], top_scores[i])
+        ]
+        for i, resume_skill in enumerate(resume_skills)
+    }
+
+
+def match_from_similarity(
+    resume_skills: List[str],
     jd_skills: List[str],
-    jd_embeddings: np.ndarray
-) -> Tuple[str, float, str]:
+    similarities: np.ndarray,
+    top_k: int = 0
+) -> Dict:
     """
-    Match a single resume skill against all job description skills.
+    Classify every resume skill from a precomputed resume x JD similarity matrix.
+    
+    Each resume skill is matched to its most similar JD skill; the match
+    is strong at MATCH_THRESHOLD and partial at PARTIAL_THRESHOLD.
     
     Args:
-        resume_skill: Resume skill text
-        resume_embedding: Embedding for resume skill
-        jd_skills: List of job description skills
-        jd_embeddings: Embeddings for JD skills
+        resume_skills: Skills from resume (non-empty)
+        jd_skills: Skills from job description (non-empty)
+        similarities: Array of shape (len(resume_skills), len(jd_skills))
+        top_k: If > 0, also return the top_k JD skills per resume skill
         
     Returns:
-        Tuple of (best_match_skill, similarity_score, match_type)
+        Dictionary with matched, partial, and missing skills
     """
-    if len(jd_skills) == 0:
-        return (None, 0.0, "missing")
+    best_idx = similarities.argmax(axis=1)
+    best_scores = similarities[np.arange(len(resume_skills)), best_idx]
     
-    # Compute cosine similarities
-    resume_embedding = resume_embedding.reshape(1, -1)
-    similarities = cosine_similarity(resume_embedding, jd_embeddings)[0]
+    matched_mask = best_scores >= MATCH_THRESHOLD
+    partial_mask = ~matched_mask & (best_scores >= PARTIAL_THRESHOLD)
     
-    # Find best match
-    best_idx = np.argmax(similarities)
-    best_score = similarities[best_idx]
-    best_jd_skill = jd_skills[best_idx]
+    matched_skills = [s for s, m in zip(resume_skills, matched_mask) if m]
+    partial_matches = [s for s, p in zip(resume_skills, partial_mask) if p]
+    unmatched_resume_skills = [
+        s for s, m, p in zip(resume_skills, matched_mask, partial_mask)
+        if not (m or p)
+    ]
+    
+    # JD skills that are the best match of at least one matched/partial resume skill
+    covered = {jd_skills[j] for j in np.unique(best_idx[matched_mask | partial_mask])}
+    missing_skills = [skill for skill in jd_skills if skill not in covered]
     
-    # Classify match type
-    if best_score >= MATCH_THRESHOLD:
-        match_type = "matched"
-    elif best_score >= PARTIAL_THRESHOLD:
-        match_type = "partial"
-    else:
-        match_type = "no_match"
+    result = {
+        "matched_skills": matched_skills,
+        "partial_matches": partial_matches,
+        "missing_skills": missing_skills,
+        "unmatched_resume_skills": unmatched_resume_skills
+    }
+    
+    if top_k > 0:
+        result["alternatives"] = _top_k_alternatives(
+            resume_skills, jd_skills, similarities, top_k
+        )
     
-    return (best_jd_skill, float(best_score), match_type)
+    return result
 
 
 def semantic_skill_matching(
     resume_skills: List[str],
-    jd_skills: List[str]
+    jd_skills: List[str],
+    top_k: int = 0
 ) -> Dict:
     """
     Perform semantic matching between resume skills and job description skills.
@@ -103,6 +301,8 @@ def semantic_skill_matching(
     Args:
         resume_skills: Skills from resume
         jd_skills: Skills from job description
+        top_k: If > 0, also return the top_k most similar JD skills for
+            each resume skill under "alternatives"
         
     Returns:
         Dictionary with matched, partial, and missing skills
@@ -124,48 +324,52 @@ def semantic_skill_matching(
             "unmatched_resume_skills": resume_skills
         }
     
-    # Compute embeddings
-    resume_embeddings = compute_skill_embeddings(resume_skills)
-    jd_embeddings = compute_skill_embeddings(jd_skills)
-    
-    # Track which JD skills have been matched
-    jd_matched = set()
-    jd_partial = set()
-    
-    matched_skills = []
-    partial_matches = []
-    unmatched_resume_skills = []
-    
-    # Match each resume skill
-    for i, resume_skill in enumerate(resume_skills):
-        best_jd_skill, score, match_type = match_single_skill(
-            resume_skill,
-            resume_embeddings[i],
-            jd_skills,
-            jd_embeddings
-        )
+    # Compute similarities (vocabulary table lookup where possible)
+    similarities = compute_similarity_matrix(resume_skills, jd_skills)
+    
+    return match_from_similarity(resume_skills, jd_skills, similarities, top_k)
+
+
+def semantic_skill_matching_many(
+    resume_skills: List[str],
+    jd_skill_lists: List[List[str]],
+    top_k: int = 0
+) -> List[Dict]:
+    """
+    Match one set of resume skills against many job descriptions.
+    
+    The union of all JD skills is scored against the resume once; each job
+    then reads its columns from that shared matrix.
+    
+    Args:
+        resume_skills: Skills from resume
+        jd_skill_lists: Skills of each job description
+        top_k: If > 0, also return the top_k most similar JD skills per
+            resume skill for each job
         
-        if match_type == "matched":
-            matched_skills.append(resume_skill)
-            jd_matched.add(best_jd_skill)
-        elif match_type == "partial":
-            partial_matches.append(resume_skill)
-            jd_partial.add(best_jd_skill)
-        else:
-            unmatched_resume_skills.append(resume_skill)
-    
-    # Identify missing skills (JD skills with no good resume match)
-    missing_skills = [
-        skill for skill in jd_skills
-        if skill not in jd_matched and skill not in jd_partial
-    ]
+    Returns:
+        One semantic_skill_matching result per job description, in input order
+    """
+    union = list(dict.fromkeys(skill for skills in jd_skill_lists for skill in skills))
     
-    return {
-        "matched_skills": matched_skills,
-        "partial_matches": partial_matches,
-        "missing_skills": missing_skills,
-        "unmatched_resume_skills": unmatched_resume_skills
-    }
+    if not resume_skills or not union:
+        return [semantic_skill_matching(resume_skills, skills) for skills in jd_skill_lists]
+    
+    similarities = compute_similarity_matrix(resume_skills, union)
+    column = {skill: j for j, skill in enumerate(union)}
+    
+    results = []
+    for jd_skills in jd_skill_lists:
+        if not jd_skills:
+            results.append(semantic_skill_matching(resume_skills, jd_skills))
+            continue
+        
+        columns = [column[skill] for skill in jd_skills]
+        results.append(
+            match_from_similarity(resume_skills, jd_skills, similarities[:, columns], top_k)
+        )
+    
+    return results
 
 
 def compute_skill_match_percentage(
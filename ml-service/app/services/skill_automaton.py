@@ -0,0 +1,372 @@
+"""
+Skill Automaton Service
+Finds every vocabulary skill in a document with a single Aho-Corasick pass.
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import deque
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Built-in vocabulary, always part of the automaton
+SKILL_VOCAB = {
+    # languages
+    "c", "c++", "c#", "python", "javascript", "sql", "kotlin",
+
+    # frameworks / libraries
+    "fastapi", "react", "flutter", "express", "node.js",
+
+    # databases / infra
+    "mongodb", "firebase", "aws",
+
+    # tools
+    "git", "github", "postman", "vs code", "docker", "faiss"
+}
+
+# Optional vocabulary file (one skill per line, '#' for comments), merged with SKILL_VOCAB
+SKILL_VOCAB_PATH = os.getenv("SKILL_VOCAB_PATH", "")
+
+# Seconds between checks of the vocabulary file for changes
+SKILL_VOCAB_CHECK_INTERVAL = float(os.getenv("SKILL_VOCAB_CHECK_INTERVAL", "30"))
+
+
+class SkillMatch(NamedTuple):
+    start: int   # offset of the first matched character in the original text
+    end: int     # offset just past the last matched character
+    skill: str   # canonical vocabulary entry
+
+
+def normalize_chars(
+    text: str,
+    start: int = 0,
+    end: Optional[int] = None
+) -> Tuple[List[str], List[int]]:
+    """
+    Normalize text the same way as skill_extractor.normalize, keeping a map
+    from each normalized character back to its offset in the original text.
+
+    Lowercases, maps '&' to 'and', drops '.', treats '-' as a space and
+    collapses whitespace runs to a single space.
+
+    Args:
+        text: Original text
+        start: Offset to start from
+        end: Offset to stop at (defaults to the end of the text)
+
+    Returns:
+        Tuple of (normalized characters, original offsets)
+    """
+    if end is None:
+        end = len(text)
+
+    chars: List[str] = []
+    offsets: List[int] = []
+    prev_space = True
+
+    for i in range(start, end):
+        c = text[i]
+
+        if c == ".":
+            continue
+
+        if c == "&":
+            chars.extend("and")
+            offsets.extend((i, i, i))
+            prev_space = False
+            continue
+
+        if c == "-" or c.isspace():
+            if not prev_space:
+                chars.append(" ")
+                offsets.append(i)
+                prev_space = True
+            continue
+
+        lower = c.lower()
+        chars.append(lower if len(lower) == 1 else c)
+        offsets.append(i)
+        prev_space = False
+
+    return chars, offsets
+
+
+def _is_word_char(c: str) -> bool:
+    # '+' and '#' belong to skills like "c++" and "c#", so "c" must not match inside them
+    return c.isalnum() or c == "+" or c == "#"
+
+
+def _dot_between(text: str, offsets: List[int], j: int) -> bool:
+    # Whether a '.' dropped by normalize_chars sat between normalized characters j and j + 1
+    return "." in text[offsets[j] + 1:offsets[j + 1]]
+
+
+def _normalize_pattern(skill: str) -> str:
+    chars, _ = normalize_chars(skill)
+    return "".join(chars).strip()
+
+
+class SkillAutomaton:
+    """
+    Compiled multi-pattern matcher over a skill vocabulary.
+
+    Matches are case-insensitive, use the same normalization as the rest of
+    the extractors and only count when the skill is not embedded inside a
+    longer word (so "c" does not match inside "react" or "c++"). A dropped
+    '.' still separates words, so "react" matches in "React.js" while
+    "node.js" matches both "Node.js" and "NodeJS".
+    """
+
+    def __init__(self, skills: Iterable[str], version: int = 0):
+        self.version = version
+        self.skills: frozenset = frozenset(s for s in skills if s)
+
+        # normalized pattern -> canonical skills sharing it
+        patterns: Dict[str, List[str]] = {}
+        for skill in self.skills:
+            pattern = _normalize_pattern(skill)
+            if pattern:
+                patterns.setdefault(pattern, []).append(skill)
+
+        self._pattern_lengths: List[int] = []
+        self._pattern_skills: List[Tuple[str, ...]] = []
+
+        goto: List[Dict[str, int]] = [{}]
+        out: List[Tuple[int, ...]] = [()]
+
+        for pattern, canonical in patterns.items():
+            pid = len(self._pattern_lengths)
+            self._pattern_lengths.append(len(pattern))
+            self._pattern_skills.append(tuple(sorted(canonical)))
+
+            node = 0
+            for ch in pattern:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][ch] = nxt
+                    goto.append({})
+                    out.append(())
+                node = nxt
+            out[node] = out[node] + (pid,)
+
+        # failure links (breadth-first)
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+
+        while queue:
+            node = queue.popleft()
+            for ch, child in goto[node].items():
+                queue.append(child)
+
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                target = goto[f].get(ch, 0) if node else 0
+                fail[child] = target if target != child else 0
+
+                out[child] = out[child] + out[fail[child]]
+
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+
+    def find_all(
+        self,
+        text: str,
+        start: int = 0,
+        end: Optional[int] = None
+    ) -> List[SkillMatch]:
+        """
+        Find every skill occurrence in text[start:end] in one linear pass.
+
+        Args:
+            text: Text to scan
+            start: Offset to start from
+            end: Offset to stop at (defaults to the end of the text)
+
+        Returns:
+            Matches ordered by end offset, with offsets into the original text
+        """
+        if not text or not self._pattern_lengths:
+            return []
+
+        chars, offsets = normalize_chars(text, start, end)
+        n = len(chars)
+
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        lengths = self._pattern_lengths
+
+        matches: List[SkillMatch] = []
+        node = 0
+
+        for j, ch in enumerate(chars):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+
+            if not out[node]:
+                continue
+
+            # right boundary: next normalized character must not continue a word
+            if j + 1 < n and _is_word_char(chars[j + 1]) and not _dot_between(text, offsets, j):
+                continue
+
+            for pid in out[node]:
+                s = j - lengths[pid] + 1
+
+                # left boundary: previous normalized character must not continue a word
+                if s > 0 and _is_word_char(chars[s - 1]) and not _dot_between(text, offsets, s - 1):
+                    continue
+
+                for skill in self._pattern_skills[pid]:
+                    matches.append(SkillMatch(offsets[s], offsets[j] + 1, skill))
+
+        return matches
+
+    def extract(
+        self,
+        text: str,
+        start: int = 0,
+        end: Optional[int] = None
+    ) -> List[str]:
+        """Return the sorted, unique skills found in text[start:end]."""
+        return sorted({m.skill for m in self.find_all(text, start, end)})
+
+
+def load_skill_vocabulary(path: str) -> Set[str]:
+    """
+    Load skills from a vocabulary file.
+
+    Args:
+        path: File with one skill per line; blank lines and '#' comments are ignored
+
+    Returns:
+        Set of lowercase skills
+    """
+    skills = set()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            # whole-line comments only: '#' is part of skills like "c#"
+            if line and not line.startswith("#"):
+                skills.add(line.lower())
+    return skills
+
+
+# Current automaton (swapped atomically on reload)
+_automaton: Optional[SkillAutomaton] = None
+_automaton_lock = threading.Lock()
+_vocab_mtime: Optional[float] = None
+_last_check = 0.0
+
+
+def _vocab_file_mtime(path: str) -> Optional[float]:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def reload_skill_vocabulary(path: Optional[str] = None) -> SkillAutomaton:
+    """
+    Rebuild the automaton from the built-in and file vocabularies and swap it in.
+
+    Readers holding the previous automaton keep using it until they finish;
+    new callers of get_skill_automaton() see the new one.
+
+    Args:
+        path: Vocabulary file (defaults to SKILL_VOCAB_PATH)
+
+    Returns:
+        The newly installed SkillAutomaton
+    """
+    global _automaton, _vocab_mtime
+
+    path = path if path is not None else SKILL_VOCAB_PATH
+
+    with _automaton_lock:
+        skills = set(SKILL_VOCAB)
+        mtime = None
+
+        if path:
+            mtime = _vocab_file_mtime(path)
+            try:
+                skills |= load_skill_vocabulary(path)
+            except OSError as e:
+                logger.error("Could not load skill vocabulary from %s: %s", path, e)
+
+        version = _automaton.version + 1 if _automaton is not None else 1
+        automaton = SkillAutomaton(skills, version=version)
+
+        _automaton = automaton
+        _vocab_mtime = mtime
+
+        logger.info("Skill automaton v%d built with %d skills", version, len(automaton.skills))
+        return automaton
+
+
+def get_skill_automaton() -> SkillAutomaton:
+    """
+    Get the current skill automaton, rebuilding it if the vocabulary file changed.
+
+    Returns:
+        SkillAutomaton instance
+    """
+    global _last_check
+
+    automaton = _automaton
+    if automaton is None:
+        return reload_skill_vocabulary()
+
+    if SKILL_VOCAB_PATH:
+        now = time.monotonic()
+        if now - _last_check >= SKILL_VOCAB_CHECK_INTERVAL:
+            _last_check = now
+            if _vocab_file_mtime(SKILL_VOCAB_PATH) != _vocab_mtime:
+                return reload_skill_vocabulary()
+
+    return automaton
+
+
+def find_skills(
+    text: str,
+    start: int = 0,
+    end: Optional[int] = None
+) -> List[SkillMatch]:
+    """
+    Find every vocabulary skill occurrence in text[start:end].
+
+    Args:
+        text: Text to scan
+        start: Offset to start from
+        end: Offset to stop at (defaults to the end of the text)
+
+    Returns:
+        List of SkillMatch with offsets into the original text
+    """
+    return get_skill_automaton().find_all(text, start, end)
+
+
+def skills_in_range(
+    matches: Iterable[SkillMatch],
+    start: int,
+    end: int
+) -> List[str]:
+    """
+    Select the unique skills whose matches lie within [start, end).
+
+    Args:
+        matches: Matches from a previous scan of the full text
+        start: Range start offset
+        end: Range end offset
+
+    Returns:
+        Sorted list of skills
+    """
+    return sorted({m.skill for m in matches if m.start >= start and m.end <= end})
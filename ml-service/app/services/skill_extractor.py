@@ -1,16 +1,4 @@
-SKILL_VOCAB = {
-    # languages
-    "c", "c++", "c#", "python", "javascript", "sql", "kotlin",
-
-    # frameworks / libraries
-    "fastapi", "react", "flutter", "express", "node.js",
-
-    # databases / infra
-    "mongodb", "firebase", "aws",
-
-    # tools
-    "git", "github", "postman", "vs code", "docker", "faiss"
-}
+from app.services.skill_automaton import get_skill_automaton
 
 def normalize(text: str) -> str:
     return (
@@ -24,11 +12,4 @@ def extract_skills_from_section(skills_text: str) -> list[str]:
     if not skills_text:
         return []
 
-    normalized_text = normalize(skills_text)
-    found = set()
-
-    for skill in SKILL_VOCAB:
-        if normalize(skill) in normalized_text:
-            found.add(skill)
-
-    return sorted(found)
\ No newline at end of file
+    return get_skill_automaton().extract(skills_text)
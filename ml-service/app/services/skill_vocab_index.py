@@ -0,0 +1,192 @@
+"""
+Skill Vocabulary Index Service
+Precomputed embeddings and a vocab x vocab cosine table for every known
+skill, stored as memory-mapped .npy files so known skill pairs can be
+scored by table lookup instead of running the embedding model.
+
+Build the index offline with:
+  python build_skill_vocab_index.py
+"""
+
+import os
+import json
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "data",
+    "skill_vocab_index"
+)
+
+# Directory holding vocab.json, embeddings.npy and similarity.npy
+SKILL_VOCAB_INDEX_DIR = os.getenv("SKILL_VOCAB_INDEX_DIR") or DEFAULT_INDEX_DIR
+
+VOCAB_FILE = "vocab.json"
+EMBEDDINGS_FILE = "embeddings.npy"
+SIMILARITY_FILE = "similarity.npy"
+
+
+class SkillVocabIndex:
+    """
+    Read-only view over a built vocabulary index.
+
+    embeddings: (V, D) float32, L2-normalized rows
+    similarity: (V, V) float16 cosine similarities
+    """
+
+    def __init__(self, directory: str):
+        with open(os.path.join(directory, VOCAB_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+
+        self.directory = directory
+        self.model_name: str = meta["model"]
+        self.skills: List[str] = meta["skills"]
+        self.rows: Dict[str, int] = {skill: i for i, skill in enumerate(self.skills)}
+
+        # memory-mapped: pages are loaded on demand and shared between processes
+        self.embeddings = np.load(os.path.join(directory, EMBEDDINGS_FILE), mmap_mode="r")
+        self.similarity = np.load(os.path.join(directory, SIMILARITY_FILE), mmap_mode="r")
+
+    def row(self, key: str) -> Optional[int]:
+        """Row of a normalized skill key, or None if the skill is not in the vocabulary."""
+        return self.rows.get(key)
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+
+_index: Optional[SkillVocabIndex] = None
+_index_loaded = False
+_index_lock = threading.Lock()
+
+
+def get_vocab_index(model_name: str) -> Optional[SkillVocabIndex]:
+    """
+    Get the vocabulary index (cached), if one was built for this model.
+
+    Args:
+        model_name: Embedding model the caller scores with
+
+    Returns:
+        SkillVocabIndex instance, or None when no usable index exists
+    """
+    global _index, _index_loaded
+
+    if not _index_loaded:
+        with _index_lock:
+            if not _index_loaded:
+                _index = _load_index(SKILL_VOCAB_INDEX_DIR)
+                _index_loaded = True
+
+    if _index is not None and _index.model_name != model_name:
+        return None
+    return _index
+
+
+def _load_index(directory: str) -> Optional[SkillVocabIndex]:
+    if not os.path.exists(os.path.join(directory, VOCAB_FILE)):
+        return None
+    try:
+        index = SkillVocabIndex(directory)
+    except Exception as e:
+        logger.error("Could not load skill vocabulary index from %s: %s", directory, e)
+        return None
+
+    logger.info("Loaded skill vocabulary index with %d skills from %s", len(index), directory)
+    return index
+
+
+# -----------------------------------------------------
+# Offline build
+# -----------------------------------------------------
+
+def collect_vocabulary() -> List[str]:
+    """
+    Gather every known skill: the skill automaton vocabulary, ATS skill
+    categories and job-feedback category keywords.
+
+    Returns:
+        Sorted list of normalized skill keys
+    """
+    # Imported here: job_matcher and ats_scorer import the matcher, which imports this module
+    from app.services.skill_automaton import get_skill_automaton
+    from app.services.ats_scorer import SKILL_CATEGORIES
+    from app.services.job_matcher import CATEGORY_KEYWORDS
+    from app.services.embedding_cache import normalize_skill_key
+
+    skills = set(get_skill_automaton().skills)
+    for group in SKILL_CATEGORIES.values():
+        skills.update(group)
+    for keywords in CATEGORY_KEYWORDS.values():
+        skills.update(keywords)
+
+    return sorted({normalize_skill_key(s) for s in skills if s.strip()})
+
+
+def build_vocab_index(
+    skills: Iterable[str],
+    output_dir: str,
+    model_name: str,
+    encoder,
+    batch_size: int = 1024,
+    block_rows: int = 1024
+) -> int:
+    """
+    Embed a vocabulary once and write the memory-mappable index files.
+
+    The similarity table is computed block_rows rows at a time straight
+    into the memory-mapped output, so peak memory is one block
+    (block_rows x V float32) rather than the whole V x V table.
+
+    Args:
+        skills: Normalized skill keys
+        output_dir: Directory to write the index to
+        model_name: Name of the model behind encoder
+        encoder: Batch encoder returning one embedding row per skill
+        batch_size: Skills per encoder call
+        block_rows: Similarity table rows computed per matrix product
+
+    Returns:
+        Number of skills in the index
+    """
+    skills = list(skills)
+    os.makedirs(output_dir, exist_ok=True)
+
+    # vocab.json is written last: its presence marks a complete index
+    vocab_path = os.path.join(output_dir, VOCAB_FILE)
+    if os.path.exists(vocab_path):
+        os.remove(vocab_path)
+
+    chunks = [
+        np.asarray(encoder(skills[i:i + batch_size]), dtype=np.float32)
+        for i in range(0, len(skills), batch_size)
+    ]
+    embeddings = np.vstack(chunks) if chunks else np.zeros((0, 0), dtype=np.float32)
+
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    embeddings = embeddings / np.maximum(norms, 1e-12)
+
+    np.save(os.path.join(output_dir, EMBEDDINGS_FILE), embeddings)
+
+    # float16 halves the V x V table; similarities only need ~3 decimals
+    similarity = np.lib.format.open_memmap(
+        os.path.join(output_dir, SIMILARITY_FILE),
+        mode="w+",
+        dtype=np.float16,
+        shape=(len(skills), len(skills))
+    )
+    for start in range(0, len(skills), block_rows):
+        similarity[start:start + block_rows] = embeddings[start:start + block_rows] @ embeddings.T
+    similarity.flush()
+    del similarity
+
+    with open(vocab_path, "w", encoding="utf-8") as f:
+        json.dump({"model": model_name, "skills": skills}, f)
+
+    return len(skills)
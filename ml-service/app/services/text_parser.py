@@ -1,6 +1,42 @@
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 import re
 
+# "Paragraph X:" labels the model sometimes copies from the prompt
+PARAGRAPH_LABEL = re.compile(r"^Paragraph\s*\d+:\s*")
+
+# A blank line, possibly holding whitespace
+BLANK_LINE = re.compile(r"\n[ \t]*\n")
+
+# Body paragraphs at or below this length are dropped
+MIN_PARAGRAPH_CHARS = 40
+
+# Maximum number of body paragraphs kept
+MAX_BODY_PARAGRAPHS = 4
+
+
+def clean_paragraph(text: str) -> str:
+    """
+    One body paragraph generated on its own, as a single line: drops
+    labels and any greeting or sign-off the model added around it.
+    """
+    lines = [PARAGRAPH_LABEL.sub("", l).strip() for l in text.strip().split("\n")]
+    lines = [
+        l for l in lines
+        if l and not l.lower().startswith(("dear ", "sincerely"))
+    ]
+    return " ".join(lines)
+
+
+def paragraph_end(text: str) -> Optional[int]:
+    """
+    Offset of the first blank line that follows paragraph text, or None.
+    Leading blank lines and label or greeting lines do not end a paragraph.
+    """
+    for match in BLANK_LINE.finditer(text):
+        if clean_paragraph(text[:match.start()]):
+            return match.start()
+    return None
+
 
 class CoverLetterTextParser:
     """
@@ -51,7 +87,7 @@ class CoverLetterTextParser:
 
         return {
             "greeting": greeting,
-            "body": body[:4],  # hard cap
+            "body": body[:MAX_BODY_PARAGRAPHS],  # hard cap
             "closing": closing,
             "sign_off": sign_off,
             "candidate_name": candidate_name
@@ -64,7 +100,7 @@ class CoverLetterTextParser:
         for line in lines:
             if line.strip():
                 # remove "Paragraph X:" labels safely
-                clean = re.sub(r"^Paragraph\s*\d+:\s*", "", line).strip()
+                clean = PARAGRAPH_LABEL.sub("", line).strip()
                 current.append(clean)
             else:
                 if current:
@@ -78,7 +114,7 @@ class CoverLetterTextParser:
         if len(paragraphs) <= 1:
             paragraphs = self._fallback_sentence_split(" ".join(paragraphs))
 
-        return [p for p in paragraphs if len(p) > 40]
+        return [p for p in paragraphs if len(p) > MIN_PARAGRAPH_CHARS]
 
     def _fallback_sentence_split(self, text: str) -> List[str]:
         sentences = re.split(r"(?<=[.!?])\s+", text)
@@ -95,3 +131,127 @@ class CoverLetterTextParser:
             paras.append(" ".join(buf))
 
         return paras
+
+
+class CoverLetterStreamParser:
+    """
+    Incremental parser for a cover letter streamed chunk by chunk.
+
+    Each block (lines up to a blank line) is classified as soon as it is
+    complete, so greeting and body paragraphs can be shown while the rest
+    is still being generated. The final structure always comes from
+    CoverLetterTextParser on the full text.
+
+    A paragraph after the closing, or beyond MAX_BODY_PARAGRAPHS, means the
+    model ran past the letter: the text is cut before it and `overflowed`
+    is set, so the caller can stop generating.
+    """
+
+    def __init__(self):
+        self.text_parser = CoverLetterTextParser()
+        self.text = ""
+        self.overflowed = False
+        self._pending = ""
+        self._block: List[str] = []
+        self._block_start = 0
+        self._body_count = 0
+        self._seen_body_or_greeting = False
+        self._ended = False
+
+    def feed(self, chunk: str) -> List[Dict]:
+        """
+        Add a chunk of generated text.
+
+        Returns:
+            Sections completed by this chunk, each {"section", "index", "text"}
+        """
+        if self.overflowed:
+            return []
+
+        self.text += chunk
+        self._pending += chunk
+
+        sections = []
+        while "\n" in self._pending and not self.overflowed:
+            line_start = len(self.text) - len(self._pending)
+            line, self._pending = self._pending.split("\n", 1)
+            if line.strip():
+                if not self._block:
+                    self._block_start = line_start
+                self._block.append(line.strip())
+            else:
+                sections.extend(self._flush_block())
+        return sections
+
+    def end_with(self, tail: str) -> List[Dict]:
+        """
+        Append text after the end of the letter, such as the sign-off a stop
+        sequence cut off, even if the letter overflowed.
+
+        Returns:
+            Sections completed by the tail
+        """
+        self.overflowed = False
+        return self.feed(tail)
+
+    def finish(self) -> Tuple[List[Dict], Dict]:
+        """
+        Flush the last block and parse the full text.
+
+        Returns:
+            (remaining sections, structured cover letter)
+        """
+        sections = []
+        if not self.overflowed:
+            if self._pending.strip():
+                if not self._block:
+                    self._block_start = len(self.text) - len(self._pending)
+                self._block.append(self._pending.strip())
+            self._pending = ""
+            sections = self._flush_block()
+
+        return sections, self.text_parser.parse_text_response(self.text)
+
+    def _flush_block(self) -> List[Dict]:
+        lines, self._block = self._block, []
+        if not lines:
+            return []
+
+        sections = []
+
+        if not self._seen_body_or_greeting and lines[0].lower().startswith("dear"):
+            sections.append(self._section("greeting", lines.pop(0)))
+            self._seen_body_or_greeting = True
+            if not lines:
+                return sections
+
+        if lines[0].lower().startswith("sincerely"):
+            sections.append(self._section("sign_off", lines[0]))
+            self._ended = True
+            return sections
+
+        if len(lines) == 1 and "look forward" in lines[0].lower() and not self._ended:
+            sections.append(self._section("closing", lines[0]))
+            self._ended = True
+            return sections
+
+        paragraph = " ".join(PARAGRAPH_LABEL.sub("", l).strip() for l in lines)
+        if len(paragraph) <= MIN_PARAGRAPH_CHARS:
+            return sections
+
+        if self._ended or self._body_count >= MAX_BODY_PARAGRAPHS:
+            # Past the end of the letter: drop this block and everything after it
+            self.text = self.text[:self._block_start]
+            self._pending = ""
+            self.overflowed = True
+            return sections
+
+        sections.append(self._section("body", paragraph, self._body_count))
+        self._body_count += 1
+        self._seen_body_or_greeting = True
+
+        return sections
+
+    @staticmethod
+    def _section(name: str, text: str, index: int = 0) -> Dict:
+        return {"section": name, "index": index, "text": text}
@@ -0,0 +1,142 @@
+"""
+Token Budget Service
+Output token limits and stop sequences for cover letter generation.
+
+num_predict is derived from the measured length of recent accepted
+letters (95th percentile plus headroom) instead of a fixed 1000, and
+num_ctx from the prompt plus that budget. Stop sequences end decoding at
+the sign-off; the sign-off and name are filled in deterministically.
+"""
+
+import os
+import math
+import threading
+from collections import deque
+from typing import Dict, List, Optional
+
+# Upper bound, and the budget used until enough letters were measured
+COVER_LETTER_MAX_PREDICT = int(os.getenv("COVER_LETTER_MAX_PREDICT", "1000"))
+
+# Lower bound for the derived budget
+COVER_LETTER_MIN_PREDICT = int(os.getenv("COVER_LETTER_MIN_PREDICT", "256"))
+
+# Accepted letters measured before the budget is derived, and how many are kept
+TOKEN_BUDGET_MIN_SAMPLES = int(os.getenv("TOKEN_BUDGET_MIN_SAMPLES", "20"))
+TOKEN_BUDGET_WINDOW = int(os.getenv("TOKEN_BUDGET_WINDOW", "200"))
+
+# Multiplier on the 95th percentile letter length
+TOKEN_BUDGET_HEADROOM = float(os.getenv("TOKEN_BUDGET_HEADROOM", "1.25"))
+
+# Context window bounds; num_ctx only ever grows, since every change reloads the model
+COVER_LETTER_MIN_CTX = int(os.getenv("COVER_LETTER_MIN_CTX", "2048"))
+COVER_LETTER_MAX_CTX = int(os.getenv("COVER_LETTER_MAX_CTX", "8192"))
+
+# Conservative characters per token for sizing the prompt (English is ~4)
+CHARS_PER_TOKEN = 3.0
+
+# Decoding stops here: everything after the closing sentence is boilerplate
+STOP_SEQUENCES: List[str] = [
+    "\nSincerely",
+    "\nYours sincerely",
+    "\nBest regards",
+    "\nKind regards",
+    "\nWarm regards",
+    "\nRegards,",
+]
+
+# Floor for the per-paragraph budget
+PARAGRAPH_MIN_PREDICT = 96
+
+
+class TokenBudget:
+    """Rolling measurement of accepted letter lengths (in generated tokens)."""
+
+    def __init__(
+        self,
+        max_predict: int = COVER_LETTER_MAX_PREDICT,
+        min_predict: int = COVER_LETTER_MIN_PREDICT,
+        min_samples: int = TOKEN_BUDGET_MIN_SAMPLES,
+        window: int = TOKEN_BUDGET_WINDOW,
+        headroom: float = TOKEN_BUDGET_HEADROOM
+    ):
+        self.max_predict = max_predict
+        self.min_predict = min(min_predict, max_predict)
+        self.min_samples = max(min_samples, 1)
+        self.headroom = headroom
+        self._samples: deque = deque(maxlen=max(window, 1))
+        self._lock = threading.Lock()
+        self._num_ctx = 0
+        self._truncated = 0
+
+    def num_predict(self) -> int:
+        """Maximum tokens to generate for one letter."""
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return self.max_predict
+            ordered = sorted(self._samples)
+
+        p95 = ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)]
+        return max(self.min_predict, min(self.max_predict, math.ceil(p95 * self.headroom)))
+
+    def paragraph_predict(self, paragraphs: int) -> int:
+        """Maximum tokens for one of `paragraphs` body paragraphs generated separately."""
+        return max(PARAGRAPH_MIN_PREDICT, math.ceil(self.num_predict() / max(paragraphs, 1)))
+
+    def num_ctx(self, prompt: str, num_predict: int) -> int:
+        """
+        Context window for a prompt plus its output budget, rounded up to a
+        multiple of 1024 and never smaller than for earlier prompts.
+        """
+        needed = len(prompt) / CHARS_PER_TOKEN + num_predict
+        size = max(COVER_LETTER_MIN_CTX, math.ceil(needed / 1024) * 1024)
+        with self._lock:
+            self._num_ctx = min(max(self._num_ctx, size), COVER_LETTER_MAX_CTX)
+            return self._num_ctx
+
+    def record(self, eval_count: Optional[int], truncated: bool = False) -> None:
+        """
+        Record the generated length of an accepted letter.
+
+        Args:
+            eval_count: Tokens generated
+            truncated: Whether generation hit num_predict; the letter needed
+                more, so it is recorded with headroom to grow the budget
+        """
+        if not eval_count:
+            return
+        with self._lock:
+            if truncated:
+                self._truncated += 1
+                eval_count = math.ceil(eval_count * self.headroom)
+            self._samples.append(eval_count)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            samples = len(self._samples)
+            mean = round(sum(self._samples) / samples, 1) if samples else None
+            truncated = self._truncated
+            num_ctx = self._num_ctx or None
+        return {
+            "num_predict": self.num_predict(),
+            "num_ctx": num_ctx,
+            "samples": samples,
+            "mean_tokens": mean,
+            "truncated": truncated,
+        }
+
+
+_budget: Optional[TokenBudget] = None
+
+
+def get_token_budget() -> TokenBudget:
+    """
+    Get the process-wide cover letter token budget (created on first use).
+
+    Returns:
+        TokenBudget instance
+    """
+    global _budget
+
+    if _budget is None:
+        _budget = TokenBudget()
+    return _budget
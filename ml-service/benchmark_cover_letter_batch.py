@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Batch cover letter benchmark: one resume, several jobs x all three tones.
+
+Compares
+  - independent: one generate_cover_letter call per letter, one after
+    another (what a client did before the batch endpoint)
+  - batch: generate_cover_letter_batch, facts selected once per job and
+    letters scheduled LLM_MAX_CONCURRENCY at a time
+and reports the time to the first finished letter and to the last.
+
+Needs a running Ollama with the model pulled (OLLAMA_BASE_URL). Set
+OLLAMA_NUM_PARALLEL to LLM_MAX_CONCURRENCY on the Ollama side.
+
+Run from the ml-service directory:
+  python benchmark_cover_letter_batch.py
+"""
+
+import asyncio
+import time
+
+from app.services.cover_letter_generator import CoverLetterGenerator
+from app.services.llm_client import close_http_client
+from benchmark_cover_letter_stream import RESUME_ANALYSIS
+from benchmark_prompt_prefix import JOBS
+
+TONES = ["formal", "confident", "friendly"]
+
+
+async def run_independent(generator: CoverLetterGenerator, variants):
+    start = time.perf_counter()
+    first = None
+    for job_info in variants:
+        await generator.generate_cover_letter(RESUME_ANALYSIS, job_info, "Jane Doe")
+        first = first or time.perf_counter() - start
+    return first, time.perf_counter() - start
+
+
+async def run_batch(generator: CoverLetterGenerator, variants):
+    start = time.perf_counter()
+    first = None
+    async for result in generator.generate_cover_letter_batch(RESUME_ANALYSIS, variants, "Jane Doe"):
+        if result["status"] != "ok":
+            print(f"letter {result['index']} failed: {result['error']}")
+        first = first or time.perf_counter() - start
+    return first, time.perf_counter() - start
+
+
+async def run():
+    generator = CoverLetterGenerator()
+    if not await generator.llm_client.test_connection():
+        raise SystemExit(f"Ollama model {generator.llm_client.model_name} is not available")
+
+    variants = [{**job, "tone": tone} for job in JOBS for tone in TONES]
+
+    # Load the model into Ollama so the first run does not include it
+    await generator.llm_client.generate_text("Say OK.", max_tokens=2)
+
+    print("=" * 72)
+    print(
+        f"Cover letters - independent vs batch ({generator.llm_client.model_name}, "
+        f"{len(variants)} letters, {generator.scheduler.max_concurrency} concurrent generations)"
+    )
+    print("=" * 72)
+    print(f"{'path':14}{'first letter (s)':>18}{'all letters (s)':>18}")
+
+    for name, runner in (("independent", run_independent), ("batch", run_batch)):
+        first, total = await runner(generator, variants)
+        print(f"{name:14}{first:18.2f}{total:18.2f}")
+
+    await close_http_client()
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
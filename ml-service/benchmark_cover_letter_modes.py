@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Wall-clock benchmark for cover letter generation modes.
+
+Generates the same cover letter in sequential mode (one decode for the
+whole letter) and parallel mode (one concurrent decode per body
+paragraph), alternating per run, and reports the wall-clock time of each
+plus the body words produced.
+
+Parallel mode only helps when Ollama decodes the paragraphs at the same
+time: start Ollama with OLLAMA_NUM_PARALLEL=4 and run this with
+LLM_MAX_CONCURRENCY=4. With fewer slots the paragraphs queue.
+
+Needs a running Ollama with the model pulled (OLLAMA_BASE_URL).
+
+Run from the ml-service directory:
+  LLM_MAX_CONCURRENCY=4 python benchmark_cover_letter_modes.py [--runs 3]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from app.services.cover_letter_generator import CoverLetterGenerator, SEQUENTIAL, PARALLEL
+from app.services.llm_client import close_http_client
+from benchmark_cover_letter_stream import RESUME_ANALYSIS, JOB_INFO
+
+
+async def generate(generator: CoverLetterGenerator, mode: str):
+    start = time.perf_counter()
+    letter = await generator.generate_cover_letter(RESUME_ANALYSIS, JOB_INFO, "Jane Doe", mode=mode)
+    words = sum(len(p.split()) for p in letter["body"])
+    return time.perf_counter() - start, words
+
+
+async def run(runs: int):
+    generator = CoverLetterGenerator()
+    if not await generator.llm_client.test_connection():
+        raise SystemExit(f"Ollama model {generator.llm_client.model_name} is not available")
+
+    print("=" * 72)
+    print(
+        f"Cover letter wall clock - sequential vs parallel ({generator.llm_client.model_name}, "
+        f"{generator.scheduler.max_concurrency} concurrent generations)"
+    )
+    print("=" * 72)
+
+    # Load the model into Ollama so the first run does not include it
+    await generator.llm_client.generate_text("Say OK.", max_tokens=2)
+
+    results = {SEQUENTIAL: [], PARALLEL: []}
+    print(f"{'run':>4}{'sequential (s)':>17}{'words':>7}{'parallel (s)':>15}{'words':>7}")
+    for i in range(1, runs + 1):
+        row = []
+        for mode in (SEQUENTIAL, PARALLEL):
+            seconds, words = await generate(generator, mode)
+            results[mode].append(seconds)
+            row.append(f"{seconds:{17 if mode == SEQUENTIAL else 15}.2f}{words:7}")
+        print(f"{i:4}" + "".join(row))
+
+    sequential = statistics.mean(results[SEQUENTIAL])
+    parallel = statistics.mean(results[PARALLEL])
+    print(f"\nmean: sequential {sequential:.2f}s, parallel {parallel:.2f}s ({sequential / parallel:.2f}x)")
+
+    await close_http_client()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.runs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Time-to-first-token benchmark for cover letter generation.
+
+Generates the same cover letter with the blocking path
+(CoverLetterGenerator.generate_cover_letter) and the streaming path
+(stream_cover_letter), and reports for each run:
+  - blocking: time until the whole letter is returned
+  - streaming: time to the first token, to the first body paragraph
+    and to the final structured letter
+
+Needs a running Ollama with the model pulled (OLLAMA_BASE_URL).
+
+Run from the ml-service directory:
+  python benchmark_cover_letter_stream.py [--runs 3]
+"""
+
+import argparse
+import asyncio
+import time
+
+from app.services.cover_letter_generator import CoverLetterGenerator
+from app.services.llm_client import close_http_client
+
+RESUME_ANALYSIS = {
+    "skills": ["python", "fastapi", "postgresql", "docker", "react", "spacy"],
+    "projects": [
+        {
+            "title": "CareerCraft",
+            "tech_stack": ["fastapi", "spacy", "sentence-transformers"],
+            "description": "Resume analysis and job matching service.",
+        }
+    ],
+    "experience": [{"role": "Backend Intern", "organization": "Acme Labs"}],
+}
+
+JOB_INFO = {
+    "company_name": "Acme",
+    "job_title": "Backend Engineer",
+    "job_description": (
+        "Build Python APIs with FastAPI and PostgreSQL.\n"
+        "Containerize services with Docker.\n"
+        "Work with the ML team on NLP features."
+    ),
+    "tone": "formal",
+}
+
+
+async def run_blocking_generation(generator: CoverLetterGenerator) -> float:
+    start = time.perf_counter()
+    await generator.generate_cover_letter(RESUME_ANALYSIS, JOB_INFO, "Jane Doe")
+    return time.perf_counter() - start
+
+
+async def run_streaming_generation(generator: CoverLetterGenerator):
+    start = time.perf_counter()
+    first_token = first_body = None
+
+    async for event, data in generator.stream_cover_letter(RESUME_ANALYSIS, JOB_INFO, "Jane Doe"):
+        now = time.perf_counter() - start
+        if event == "token" and first_token is None:
+            first_token = now
+        elif event == "section" and data["section"] == "body" and first_body is None:
+            first_body = now
+
+    return first_token, first_body, time.perf_counter() - start
+
+
+async def run(runs: int):
+    generator = CoverLetterGenerator()
+    if not await generator.llm_client.test_connection():
+        raise SystemExit(f"Ollama model {generator.llm_client.model_name} is not available")
+
+    print("=" * 72)
+    print(f"Cover letter latency - blocking vs streaming ({generator.llm_client.model_name})")
+    print("=" * 72)
+
+    # Load the model into Ollama so the first run does not include it
+    await generator.llm_client.generate_text("Say OK.", max_tokens=2)
+
+    print(f"{'run':>4}{'blocking (s)':>16}{'first token (s)':>18}{'first para (s)':>17}{'stream total (s)':>19}")
+    for i in range(1, runs + 1):
+        blocking = await run_blocking_generation(generator)
+        first_token, first_body, total = await run_streaming_generation(generator)
+        print(
+            f"{i:4}{blocking:16.2f}"
+            f"{first_token if first_token is not None else float('nan'):18.2f}"
+            f"{first_body if first_body is not None else float('nan'):17.2f}"
+            f"{total:19.2f}"
+        )
+
+    await close_http_client()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.runs))
+
+
+if __name__ == "__main__":
+    main()
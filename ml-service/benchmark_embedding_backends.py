@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Parity and latency benchmark for the skill embedding backends.
+
+Embeds a fixed skill set with the PyTorch reference backend and with the
+ONNX fp32 and int8 exports, then reports:
+  - cosine drift: 1 - cos(reference vector, backend vector) per skill
+  - similarity drift: absolute change of every skill-pair similarity
+  - classification changes: resume skills whose matched / partial /
+    no-match class changes on fixed resume x JD skill sets
+  - encode latency for a /job-match sized batch and for the full set
+
+Export the ONNX models first (python export_onnx_embedder.py).
+
+Run from the ml-service directory:
+  python benchmark_embedding_backends.py
+"""
+
+import time
+
+import numpy as np
+
+from app.services.embedding_backends import OnnxBackend, TorchBackend
+from app.services.semantic_skill_matcher import (
+    MATCH_THRESHOLD,
+    MODEL_NAME,
+    PARTIAL_THRESHOLD,
+    normalize_rows,
+)
+
+# Fixed skill set: resume-style and JD-style spellings of common skills
+SKILLS = [
+    "python", "java", "javascript", "typescript", "c", "c++", "c#", "golang",
+    "rust", "kotlin", "swift", "sql", "html", "css", "bash",
+    "react", "react.js", "reactjs", "react native", "angular", "vue.js", "next.js",
+    "node.js", "nodejs", "express", "django", "flask", "fastapi", "spring boot",
+    "graphql", "rest api", "restful services", "microservices",
+    "machine learning", "deep learning", "ml", "nlp", "natural language processing",
+    "computer vision", "pandas", "numpy", "scikit-learn", "sklearn", "tensorflow",
+    "pytorch", "keras", "spark", "airflow", "kafka", "tableau", "power bi",
+    "postgresql", "postgres", "mysql", "mongodb", "redis", "elasticsearch",
+    "firebase", "dynamodb", "nosql",
+    "aws", "amazon web services", "azure", "gcp", "google cloud platform",
+    "docker", "kubernetes", "k8s", "terraform", "ansible", "jenkins",
+    "github actions", "ci/cd", "continuous integration", "linux", "nginx",
+    "git", "github", "jira", "postman", "figma", "agile", "scrum",
+    "unit testing", "pytest", "jest", "selenium", "cypress",
+    "data analysis", "data visualization", "statistics", "excel",
+    "object oriented programming", "oop", "data structures", "algorithms",
+]
+
+# Fixed resume x JD pairs for classification parity
+MATCH_CASES = [
+    (SKILLS[i::7], SKILLS[(i + 3)::5]) for i in range(7)
+]
+
+BATCH_REPEAT = 20
+
+
+def classify(similarities: np.ndarray) -> np.ndarray:
+    best = similarities.max(axis=1)
+    return np.where(best >= MATCH_THRESHOLD, 2, np.where(best >= PARTIAL_THRESHOLD, 1, 0))
+
+
+def time_encode(backend, texts, repeat: int) -> float:
+    backend.encode(texts)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        backend.encode(texts)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    print("=" * 72)
+    print(f"Skill embedding backends - parity vs torch ({MODEL_NAME})")
+    print("=" * 72)
+
+    backends = {"torch": TorchBackend(MODEL_NAME)}
+    for name, quantized in (("onnx-fp32", False), ("onnx-int8", True)):
+        try:
+            backends[name] = OnnxBackend(MODEL_NAME, quantized=quantized)
+        except Exception as e:
+            print(f"{name}: skipped ({e})")
+
+    # torch returns unnormalized vectors; compare cosines
+    vectors = {name: normalize_rows(backend.encode(SKILLS)) for name, backend in backends.items()}
+    reference = vectors["torch"]
+    reference_sims = reference @ reference.T
+
+    print()
+    print(f"{'backend':12}{'drift mean':>12}{'drift max':>12}{'sim Δ mean':>12}{'sim Δ max':>12}{'class chg':>12}")
+
+    for name, vecs in vectors.items():
+        drift = 1.0 - np.sum(vecs * reference, axis=1)
+        sim_delta = np.abs(vecs @ vecs.T - reference_sims)
+
+        changed = 0
+        total = 0
+        for resume_skills, jd_skills in MATCH_CASES:
+            r = [SKILLS.index(s) for s in resume_skills]
+            j = [SKILLS.index(s) for s in jd_skills]
+            expected = classify(reference[r] @ reference[j].T)
+            actual = classify(vecs[r] @ vecs[j].T)
+            changed += int(np.sum(expected != actual))
+            total += len(r)
+
+        print(
+            f"{name:12}{drift.mean():12.6f}{drift.max():12.6f}"
+            f"{sim_delta.mean():12.6f}{sim_delta.max():12.6f}{f'{changed}/{total}':>12}"
+        )
+
+    print()
+    print(f"{'backend':12}{'20 skills (ms)':>18}{f'{len(SKILLS)} skills (ms)':>18}")
+    for name, backend in backends.items():
+        small = time_encode(backend, SKILLS[:20], BATCH_REPEAT)
+        full = time_encode(backend, SKILLS, BATCH_REPEAT)
+        print(f"{name:12}{small * 1000:18.2f}{full * 1000:18.2f}")
+
+
+if __name__ == "__main__":
+    main()
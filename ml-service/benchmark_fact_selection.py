@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Cover letter prompt facts: the previous first-N picks (first 8 skills, first
+2 projects and experiences, first 3 job description lines) vs the
+relevance-selected facts of app/services/fact_selector.py.
+
+For every resume x job pair, reports per template:
+  - estimated prompt tokens (CHARS_PER_TOKEN) of the whole prompt
+  - skill precision: share of prompt skills relevant to the job
+    (similarity >= PARTIAL_THRESHOLD, or named by the job description)
+  - job coverage: share of job skills the candidate facts name
+  - requirement hits: share of prompt job lines that name a job skill
+
+With --ollama, also sends every prompt to Ollama (one decoded token, after
+a neutral prompt so nothing is cached) and reports prompt_eval_count and
+prompt_eval_duration.
+
+Run from the ml-service directory:
+  python benchmark_fact_selection.py [--ollama]
+"""
+
+import argparse
+import asyncio
+import statistics
+
+from app.services.fact_selector import (
+    select_facts,
+    score_skills,
+    estimate_tokens,
+    _job_skills,
+    _mentions,
+)
+from app.services.llm_client import LLMClient, close_http_client
+from app.services.prompt_builder import CoverLetterPromptBuilder
+from app.services.semantic_skill_matcher import PARTIAL_THRESHOLD
+
+# Skills come out of /analyze sorted, so first-N is alphabetical, not relevant
+RESUMES = [
+    (
+        "Jane Doe",
+        {
+            "skills": sorted([
+                "adobe xd", "agile", "aws", "bootstrap", "c", "css", "django", "docker", "excel",
+                "fastapi", "figma", "git", "html", "java", "jira", "linux", "postgresql",
+                "python", "react", "redis", "rest api", "sql", "typescript",
+            ]),
+            "projects": [
+                {"title": "Portfolio Website", "tech_stack": ["html", "css", "bootstrap"],
+                 "description": "Personal portfolio with a blog and contact form, deployed on GitHub Pages."},
+                {"title": "Campus Event App", "tech_stack": ["figma", "adobe xd"],
+                 "description": "Designed the mobile screens and user flows for a student event app."},
+                {"title": "Invoice Service", "tech_stack": ["python", "fastapi", "postgresql", "docker", "redis"],
+                 "description": "REST API that generates and tracks invoices, with background jobs for "
+                                "reminders, PDF export, role-based access and a PostgreSQL schema with "
+                                "migrations. Containerised with Docker and cached with Redis."},
+            ],
+            "experience": [
+                {"organization": "City Library", "role": "Student Assistant",
+                 "description": "Helped visitors and catalogued books."},
+                {"organization": "Acme Labs", "role": "Backend Engineering Intern",
+                 "description": "Built Python services on PostgreSQL and Docker."},
+                {"organization": "Pixel Studio", "role": "Design Intern",
+                 "description": "Created Figma prototypes."},
+            ],
+        },
+    ),
+    (
+        "Ravi Kumar",
+        {
+            "skills": sorted([
+                "android", "ansible", "aws", "c++", "ci/cd", "go", "grafana", "java", "jenkins",
+                "kafka", "kotlin", "kubernetes", "linux", "mysql", "prometheus", "spring boot",
+                "terraform",
+            ]),
+            "projects": [
+                {"title": "Expense Tracker", "tech_stack": ["kotlin", "android"],
+                 "description": "Android app for shared expenses."},
+                {"title": "OrderFlow", "tech_stack": ["java", "spring boot", "kafka", "mysql"],
+                 "description": "Event-driven order pipeline."},
+                {"title": "Cluster Autopilot", "tech_stack": ["go", "kubernetes", "terraform", "prometheus"],
+                 "description": "Kubernetes operator that scales node pools on AWS from Prometheus metrics."},
+            ],
+            "experience": [
+                {"organization": "Globex", "role": "Software Engineer",
+                 "description": "Maintained Java order services on MySQL."},
+                {"organization": "Initrode", "role": "DevOps Engineer",
+                 "description": "Ran Kubernetes clusters with Terraform, Jenkins and Grafana on AWS."},
+            ],
+        },
+    ),
+]
+
+JOBS = [
+    {
+        "company_name": "Initech",
+        "job_title": "Backend Engineer",
+        "tone": "formal",
+        "job_description": "About us\nInitech is a fast-growing fintech company.\nWe value ownership and curiosity.\n"
+                           "Requirements\nBuild REST APIs in Python with FastAPI or Django.\n"
+                           "Design PostgreSQL schemas and Redis caches.\nShip services with Docker on AWS.",
+    },
+    {
+        "company_name": "Umbrella",
+        "job_title": "Platform Engineer",
+        "tone": "confident",
+        "job_description": "Our team\nWe build the platform every Umbrella product runs on.\n"
+                           "What you will do\nOperate Kubernetes clusters on AWS.\n"
+                           "Automate infrastructure with Terraform and Ansible.\n"
+                           "Own CI/CD pipelines and monitoring with Prometheus and Grafana.",
+    },
+]
+
+
+def first_n_facts(resume_analysis, job_info):
+    """The facts the prompt used before relevance selection."""
+    jd_lines = [l.strip() for l in job_info["job_description"].split("\n") if l.strip()]
+    return {
+        "skills": resume_analysis.get("skills", [])[:8],
+        "projects": resume_analysis.get("projects", [])[:2],
+        "experience": resume_analysis.get("experience", [])[:2],
+        "requirements": jd_lines[:3],
+        "tokens": 0,
+    }
+
+
+def relevance(facts, job_info, jd_skills):
+    jd_text = job_info["job_description"].lower()
+    scores = score_skills(facts["skills"], jd_skills, jd_text)
+    precision = sum(s >= PARTIAL_THRESHOLD for s in scores.values()) / max(len(scores), 1)
+
+    named = " ".join(
+        facts["skills"]
+        + [" ".join(p.get("tech_stack", [])) + " " + p.get("description", "") for p in facts["projects"]]
+        + [e.get("role", "") + " " + e.get("description", "") for e in facts["experience"]]
+    ).lower()
+    coverage = sum(_mentions(named, s) for s in jd_skills) / max(len(jd_skills), 1)
+
+    hits = sum(any(_mentions(l.lower(), s) for s in jd_skills) for l in facts["requirements"])
+    return precision, coverage, hits / max(len(facts["requirements"]), 1)
+
+
+async def prefill(client: LLMClient, prompts):
+    counts, durations = [], []
+    for prompt in prompts:
+        await client.generate("Say OK.", temperature=0.0, max_tokens=1)
+        data = await client.generate(prompt, temperature=0.0, max_tokens=1)
+        counts.append(data.get("prompt_eval_count", 0))
+        durations.append(data.get("prompt_eval_duration", 0) / 1e6)
+    return statistics.mean(counts), statistics.mean(durations)
+
+
+async def run(use_ollama: bool):
+    builder = CoverLetterPromptBuilder()
+    pairs = [(name, resume, job) for name, resume in RESUMES for job in JOBS]
+
+    rows = {}
+    for template, select in (("first-N", first_n_facts), ("selected", select_facts)):
+        prompts, metrics = [], []
+        for name, resume, job in pairs:
+            facts = select(resume, job)
+            prompts.append(builder.build_prompt(resume, job, name, facts=facts))
+            metrics.append(relevance(facts, job, _job_skills(job["job_description"])))
+        rows[template] = (prompts, [statistics.mean(m) for m in zip(*metrics)])
+
+    print("=" * 80)
+    print(f"Cover letter prompt facts - first-N vs selected ({len(pairs)} prompts)")
+    print("=" * 80)
+    print(f"{'facts':10}{'est. tokens':>13}{'skill precision':>17}{'job coverage':>14}{'req. hits':>11}")
+    for template, (prompts, (precision, coverage, hits)) in rows.items():
+        tokens = statistics.mean(estimate_tokens(p) for p in prompts)
+        print(f"{template:10}{tokens:13.1f}{precision:17.0%}{coverage:14.0%}{hits:11.0%}")
+
+    if use_ollama:
+        client = LLMClient()
+        if not await client.test_connection():
+            raise SystemExit(f"Ollama model {client.model_name} is not available")
+
+        print(f"\n{'facts':10}{'prompt tokens (mean)':>22}{'prefill ms (mean)':>20}   ({client.model_name}, uncached)")
+        for template, (prompts, _) in rows.items():
+            count, duration = await prefill(client, prompts)
+            print(f"{template:10}{count:22.1f}{duration:20.1f}")
+
+        await close_http_client()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ollama", action="store_true", help="also measure prefill on Ollama")
+    args = parser.parse_args()
+    asyncio.run(run(args.ollama))
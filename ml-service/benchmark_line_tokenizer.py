@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Adversarial-input benchmark for the shared line tokenizer.
+
+Compares the DURATION_PATTERN regex that used to be copied into the
+education, experience and project extractors against
+app.services.line_tokenizer.classify_line on lines built to trigger
+regex backtracking (long whitespace runs from PDF extraction).
+
+For each input family the line length doubles at every step. A linear
+algorithm shows a growth factor close to 2x per doubling; the legacy
+regex grows by roughly 8x (cubic).
+
+Run from the ml-service directory:
+  python benchmark_line_tokenizer.py
+"""
+
+import re
+import time
+
+from app.services.line_tokenizer import classify_line
+
+
+# The pattern previously duplicated in education/experience/project extractors
+LEGACY_DURATION_PATTERN = re.compile(
+    r"""
+    (                           # start date
+        (?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec|
+           January|February|March|April|June|July|August|September|
+           October|November|December)?
+        \s*
+        \d{4}
+    )
+    \s*
+    (?:[-]|to|–|—|\s{2,})
+    \s*
+    (                           # end date
+        (?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec|
+           January|February|March|April|June|July|August|September|
+           October|November|December)?
+        \s*
+        (?:\d{4}|Present|present)
+    )
+    """,
+    re.IGNORECASE | re.VERBOSE
+)
+
+# Input families: n -> line
+ADVERSARIAL_INPUTS = {
+    "year + whitespace run": lambda n: "2019" + " " * n + "x",
+    "year, dash, whitespace run": lambda n: "2019 -" + " " * n + "x",
+    "repeated 'Jan 2019 '": lambda n: "Jan 2019 " * (n // 9 + 1) + "x",
+    "whitespace run only": lambda n: " " * n + "x",
+}
+
+# The legacy regex takes seconds beyond ~200 characters, so it gets a smaller range
+LEGACY_SIZES = [20, 40, 80, 160]
+TOKENIZER_SIZES = [1_000, 2_000, 4_000, 8_000, 16_000, 32_000, 64_000]
+
+# Stop timing the legacy regex for a family once a single call exceeds this
+LEGACY_TIME_LIMIT = 5.0
+
+
+def time_call(fn, line: str, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(line)
+        best = min(best, time.perf_counter() - start)
+        # one sample is enough for multi-second calls
+        if best > 0.5:
+            break
+    return best
+
+
+def run_series(name: str, fn, build, sizes, time_limit=None):
+    print(f"  {name}")
+    previous = None
+
+    for n in sizes:
+        line = build(n)
+        elapsed = time_call(fn, line)
+
+        growth = f"{elapsed / previous:6.1f}x" if previous else "      -"
+        print(f"    len={len(line):>7}  {elapsed * 1000:12.3f} ms  growth {growth}")
+        previous = max(elapsed, 1e-9)
+
+        if time_limit and elapsed > time_limit:
+            print("    (stopping: too slow)")
+            break
+
+
+def main():
+    print("=" * 72)
+    print("Line tokenizer - adversarial input benchmark")
+    print("=" * 72)
+
+    for family, build in ADVERSARIAL_INPUTS.items():
+        print()
+        print(f"[{family}]")
+        run_series(
+            "legacy DURATION_PATTERN.search",
+            LEGACY_DURATION_PATTERN.search,
+            build,
+            LEGACY_SIZES,
+            time_limit=LEGACY_TIME_LIMIT
+        )
+        run_series(
+            "line_tokenizer.classify_line",
+            classify_line,
+            build,
+            TOKENIZER_SIZES
+        )
+
+    print()
+    print("Growth ~2x per doubling means linear time.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Prompt prefill benchmark: legacy cover letter prompt vs the prefix-stable
+prompt of CoverLetterPromptBuilder.
+
+The legacy prompt put company, role and tone at the top, so every request
+had a new prefix and Ollama evaluated the whole prompt. The current prompt
+starts with fixed instructions, then candidate facts, then the job, so
+Ollama reuses its cache for everything before the first difference.
+
+For each template, sends a sequence of candidate x job prompts (one
+decoded token each, so only prefill is measured) and reports Ollama's
+prompt_eval_count (prompt tokens actually evaluated) and
+prompt_eval_duration.
+
+Needs a running Ollama with the model pulled (OLLAMA_BASE_URL). Set
+OLLAMA_NUM_PARALLEL=1 on the Ollama side for comparable numbers.
+
+Run from the ml-service directory:
+  python benchmark_prompt_prefix.py
+"""
+
+import asyncio
+import statistics
+
+from app.services.llm_client import LLMClient, close_http_client
+from app.services.prompt_builder import CoverLetterPromptBuilder
+
+CANDIDATES = [
+    (
+        "Jane Doe",
+        {
+            "skills": ["python", "fastapi", "postgresql", "docker", "react", "spacy"],
+            "projects": [{"title": "CareerCraft", "tech_stack": ["fastapi", "spacy"], "description": "Resume analysis service."}],
+            "experience": [{"role": "Backend Intern", "organization": "Acme Labs"}],
+        },
+    ),
+    (
+        "Ravi Kumar",
+        {
+            "skills": ["java", "spring boot", "kafka", "aws", "kubernetes", "sql"],
+            "projects": [{"title": "OrderFlow", "tech_stack": ["spring boot", "kafka"], "description": "Event-driven order pipeline."}],
+            "experience": [{"role": "Software Engineer", "organization": "Globex"}],
+        },
+    ),
+]
+
+JOBS = [
+    {
+        "company_name": "Initech",
+        "job_title": "Backend Engineer",
+        "job_description": "Build Python APIs.\nOwn PostgreSQL schemas.\nShip with Docker.",
+        "tone": "formal",
+    },
+    {
+        "company_name": "Umbrella",
+        "job_title": "Platform Engineer",
+        "job_description": "Run Kubernetes clusters.\nAutomate AWS infrastructure.\nImprove CI/CD.",
+        "tone": "confident",
+    },
+    {
+        "company_name": "Hooli",
+        "job_title": "Full Stack Developer",
+        "job_description": "Develop React frontends.\nDesign REST services.\nWork in small teams.",
+        "tone": "friendly",
+    },
+]
+
+
+def legacy_prompt(builder: CoverLetterPromptBuilder, resume_analysis, job_info, candidate_name) -> str:
+    """The cover letter prompt before it was made prefix-stable."""
+    company = job_info["company_name"]
+    title = job_info["job_title"]
+    tone = job_info.get("tone", "formal")
+
+    skills = ", ".join(resume_analysis.get("skills", [])[:8])
+    projects = builder._format_projects(resume_analysis.get("projects", [])[:2])
+    experience = builder._format_experience(resume_analysis.get("experience", [])[:2])
+
+    jd = job_info.get("job_description", "")
+    jd_lines = [l.strip() for l in jd.split("\n") if l.strip()]
+    key_requirements = "\n".join(jd_lines[:3])
+
+    return f"""
+You are writing a REAL professional cover letter, not a template.
+
+STRICT RULES (DO NOT BREAK):
+- DO NOT write placeholders like "Paragraph 1", "Generated content", or labels
+- DO NOT invent skills, experience, or education
+- DO NOT repeat generic phrases
+- DO NOT mention years of experience unless explicitly provided
+- Write natural English, like a real applicant
+
+JOB:
+- Company: {company}
+- Role: {title}
+- Tone: {tone}
+
+CANDIDATE FACTS (ONLY SOURCE OF TRUTH):
+Skills: {skills}
+
+Experience:
+{experience}
+
+Projects:
+{projects}
+
+KEY JOB REQUIREMENTS:
+{key_requirements}
+
+WRITE EXACTLY 4 PARAGRAPHS:
+
+Paragraph 1:
+Introduce the application. Mention the role and company. Keep it direct.
+
+Paragraph 2:
+Explain how the candidate’s skills match the role. Use 2–3 skills from the list.
+
+Paragraph 3:
+Describe 1–2 projects. Mention tools used and what was built.
+
+Paragraph 4:
+Explain why the candidate wants to work at {company}. Use ONLY job info.
+
+FORMAT EXACTLY LIKE THIS (NO EXTRA TEXT):
+
+Dear Hiring Manager at {company},
+
+[Paragraph 1]
+
+[Paragraph 2]
+
+[Paragraph 3]
+
+[Paragraph 4]
+
+I look forward to discussing this opportunity further.
+
+Sincerely,
+{candidate_name}
+""".strip()
+
+
+async def measure(client: LLMClient, prompts):
+    counts, durations = [], []
+    for prompt in prompts:
+        data = await client.generate(prompt, temperature=0.0, max_tokens=1)
+        counts.append(data.get("prompt_eval_count", 0))
+        durations.append(data.get("prompt_eval_duration", 0) / 1e6)
+    return counts, durations
+
+
+async def run():
+    client = LLMClient()
+    if not await client.test_connection():
+        raise SystemExit(f"Ollama model {client.model_name} is not available")
+
+    builder = CoverLetterPromptBuilder()
+    pairs = [(name, resume, job) for name, resume in CANDIDATES for job in JOBS]
+
+    templates = {
+        "legacy": [legacy_prompt(builder, resume, job, name) for name, resume, job in pairs],
+        "prefix-stable": [builder.build_prompt(resume, job, name) for name, resume, job in pairs],
+    }
+
+    print("=" * 72)
+    print(f"Prompt prefill - legacy vs prefix-stable ({client.model_name}, {len(pairs)} prompts)")
+    print("=" * 72)
+    print(f"{'template':16}{'tokens eval (mean)':>20}{'prefill ms (mean)':>20}{'prefill ms (p50)':>18}")
+
+    for name, prompts in templates.items():
+        # A neutral prompt first, so neither template starts with its own prefix cached
+        await client.generate("Say OK.", temperature=0.0, max_tokens=1)
+        counts, durations = await measure(client, prompts)
+        # The first prompt of each run always pays the full prefix
+        print(
+            f"{name:16}{statistics.mean(counts[1:]):20.1f}"
+            f"{statistics.mean(durations[1:]):20.1f}{statistics.median(durations[1:]):18.1f}"
+        )
+
+    await close_http_client()
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Paragraph edit benchmark: regenerating the whole cover letter vs
+regenerating one paragraph (CoverLetterGenerator.regenerate_paragraph).
+
+Generates one letter, then for each run and each body paragraph compares
+a full regeneration with a single-paragraph regeneration, and reports the
+wall-clock time and the words decoded (a proxy for generated tokens).
+
+Needs a running Ollama with the model pulled (OLLAMA_BASE_URL).
+
+Run from the ml-service directory:
+  python benchmark_regenerate_paragraph.py [--runs 1]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from app.services.cover_letter_generator import CoverLetterGenerator
+from app.services.llm_client import close_http_client
+from benchmark_cover_letter_stream import RESUME_ANALYSIS, JOB_INFO
+
+
+def letter_words(letter) -> int:
+    return sum(len(p.split()) for p in letter["body"]) + len(letter["closing"].split())
+
+
+async def run(runs: int):
+    generator = CoverLetterGenerator()
+    if not await generator.llm_client.test_connection():
+        raise SystemExit(f"Ollama model {generator.llm_client.model_name} is not available")
+
+    # Load the model into Ollama so the first run does not include it
+    await generator.llm_client.generate_text("Say OK.", max_tokens=2)
+
+    letter = await generator.generate_cover_letter(RESUME_ANALYSIS, JOB_INFO, "Jane Doe")
+
+    full_seconds, full_words, para_seconds, para_words = [], [], [], []
+    for _ in range(runs):
+        for index in range(len(letter["body"])):
+            start = time.perf_counter()
+            regenerated = await generator.generate_cover_letter(RESUME_ANALYSIS, JOB_INFO, "Jane Doe")
+            full_seconds.append(time.perf_counter() - start)
+            full_words.append(letter_words(regenerated))
+
+            start = time.perf_counter()
+            edited = await generator.regenerate_paragraph(RESUME_ANALYSIS, JOB_INFO, letter, index, "Jane Doe")
+            para_seconds.append(time.perf_counter() - start)
+            para_words.append(len(edited["body"][index].split()))
+
+    print("=" * 72)
+    print(f"Paragraph edit - full letter vs one paragraph ({generator.llm_client.model_name}, {len(para_seconds)} edits)")
+    print("=" * 72)
+    print(f"{'regenerate':14}{'seconds (mean)':>16}{'words decoded (mean)':>22}")
+    print(f"{'full letter':14}{statistics.mean(full_seconds):16.2f}{statistics.mean(full_words):22.1f}")
+    print(f"{'paragraph':14}{statistics.mean(para_seconds):16.2f}{statistics.mean(para_words):22.1f}")
+
+    await close_http_client()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=1)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.runs))
+
+
+if __name__ == "__main__":
+    main()
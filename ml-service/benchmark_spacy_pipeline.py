@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Per-JD latency and memory benchmark for the job skill extraction pipeline.
+
+Compares the previous setup (full en_core_web_sm pipeline) against the
+slim pipeline loaded by app.services.job_skill_extractor.get_nlp
+(components that do not affect noun_chunks or entities excluded).
+
+Each setup runs in its own subprocess so load time and peak RSS are
+measured in isolation. The noun chunks and entities of both setups are
+compared to confirm the excluded components do not change the output.
+
+Run from the ml-service directory:
+  python benchmark_spacy_pipeline.py
+  python benchmark_spacy_pipeline.py --repeat 200
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+
+SAMPLE_JOB_DESCRIPTIONS = [
+    """Senior Backend Engineer
+
+Required Skills:
+- 5+ years of experience with Python and Django or FastAPI
+- Strong knowledge of PostgreSQL, Redis and message queues such as RabbitMQ
+- Experience with Docker, Kubernetes and AWS (EC2, S3, Lambda)
+- Familiarity with CI/CD pipelines using Jenkins or GitHub Actions
+
+Nice to have: GraphQL, Terraform, experience mentoring junior developers.""",
+    """Frontend Developer (React)
+
+We are looking for a developer to build accessible user interfaces.
+Requirements:
+Proficiency in JavaScript, TypeScript, React.js and Redux.
+Knowledge of HTML5, CSS3, Tailwind and responsive design.
+Experience with Jest, Cypress and REST APIs. Exposure to Next.js is a plus.""",
+    """Machine Learning Engineer
+
+Qualifications:
+Experience with PyTorch or TensorFlow, scikit-learn, pandas and NumPy.
+Must have experience deploying models with Docker on GCP or Azure.
+Knowledge of NLP (spaCy, Hugging Face Transformers) and SQL.
+Microsoft and Google Cloud certifications are an advantage.""",
+]
+
+
+def run_child(setup: str, repeat: int) -> dict:
+    """Measure one setup inside this process."""
+    start = time.perf_counter()
+
+    if setup == "full":
+        import spacy
+        nlp = spacy.load("en_core_web_sm")
+    else:
+        from app.services.job_skill_extractor import get_nlp
+        nlp = get_nlp()
+
+    load_seconds = time.perf_counter() - start
+
+    # Warm-up, and the outputs the extractor consumes
+    outputs = []
+    for text in SAMPLE_JOB_DESCRIPTIONS:
+        doc = nlp(text)
+        outputs.append({
+            "noun_chunks": [chunk.text for chunk in doc.noun_chunks],
+            "ents": [(ent.text, ent.label_) for ent in doc.ents],
+        })
+
+    timings = []
+    for _ in range(repeat):
+        for text in SAMPLE_JOB_DESCRIPTIONS:
+            t = time.perf_counter()
+            nlp(text)
+            timings.append(time.perf_counter() - t)
+    timings.sort()
+
+    texts = SAMPLE_JOB_DESCRIPTIONS * repeat
+    t = time.perf_counter()
+    list(nlp.pipe(texts, batch_size=32))
+    pipe_per_doc = (time.perf_counter() - t) / len(texts)
+
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss_mb = rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+    return {
+        "components": nlp.pipe_names,
+        "load_seconds": load_seconds,
+        "median_ms": timings[len(timings) // 2] * 1000,
+        "p95_ms": timings[int(len(timings) * 0.95)] * 1000,
+        "pipe_ms": pipe_per_doc * 1000,
+        "peak_rss_mb": rss_mb,
+        "outputs": outputs,
+    }
+
+
+def measure(setup: str, repeat: int) -> dict:
+    result = subprocess.run(
+        [sys.executable, __file__, "--child", setup, "--repeat", str(repeat)],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="spaCy pipeline benchmark")
+    parser.add_argument("--repeat", type=int, default=50, help="Passes over the sample job descriptions")
+    parser.add_argument("--child", choices=["full", "slim"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(args.child, args.repeat)))
+        return
+
+    results = {setup: measure(setup, args.repeat) for setup in ("full", "slim")}
+
+    print("=" * 72)
+    print("JD skill extraction - spaCy pipeline benchmark")
+    print("=" * 72)
+    print(f"{'':18}{'full':>16}{'slim':>16}")
+    for key, label, fmt in [
+        ("load_seconds", "load (s)", "{:16.2f}"),
+        ("median_ms", "per JD p50 (ms)", "{:16.2f}"),
+        ("p95_ms", "per JD p95 (ms)", "{:16.2f}"),
+        ("pipe_ms", "nlp.pipe (ms/JD)", "{:16.2f}"),
+        ("peak_rss_mb", "peak RSS (MB)", "{:16.1f}"),
+    ]:
+        row = "".join(fmt.format(results[s][key]) for s in ("full", "slim"))
+        print(f"{label:18}{row}")
+
+    print()
+    for setup in ("full", "slim"):
+        print(f"{setup} components: {', '.join(results[setup]['components'])}")
+
+    same = results["full"]["outputs"] == results["slim"]["outputs"]
+    print(f"noun_chunks and entities identical: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Decode token benchmark for cover letters: the previous fixed settings
+(num_predict 1000, no stop sequences) vs the token budget, stop sequences
+and structural cutoff of CoverLetterGenerator.
+
+For every candidate x job prompt of benchmark_prompt_prefix.py, reports
+per letter:
+  - decoded tokens (Ollama's eval_count; the chunk count when cut early)
+  - wasted tokens: tokens decoded after the end of the letter structure
+    (estimated from the share of text the parser throws away)
+  - wall-clock generation time
+  - complete letters (4 body paragraphs)
+
+The budget is seeded with the useful lengths of the fixed-settings run,
+as it would be after that many accepted letters in production.
+
+Needs a running Ollama with the model pulled (OLLAMA_BASE_URL).
+
+Run from the ml-service directory:
+  python benchmark_token_budget.py
+"""
+
+import asyncio
+import statistics
+import time
+
+from app.services.cover_letter_generator import CoverLetterGenerator
+from app.services.llm_client import close_http_client
+from app.services.text_parser import CoverLetterStreamParser, MAX_BODY_PARAGRAPHS
+from app.services.token_budget import STOP_SEQUENCES
+from benchmark_prompt_prefix import CANDIDATES, JOBS
+
+
+def useful_length(raw: str) -> int:
+    """Characters of raw output up to the end of the letter structure."""
+    parser = CoverLetterStreamParser()
+    parser.feed(raw)
+    text = parser.text
+    for stop in STOP_SEQUENCES:
+        if stop in text:
+            text = text[:text.index(stop)]
+    return len(text)
+
+
+async def run_fixed(generator: CoverLetterGenerator, prompts):
+    rows = []
+    for prompt, name in prompts:
+        start = time.perf_counter()
+        data = await generator.llm_client.generate(prompt, temperature=0.7, max_tokens=1000)
+        elapsed = time.perf_counter() - start
+
+        raw = data.get("response", "")
+        tokens = data.get("eval_count", 0)
+        kept = useful_length(raw) / max(len(raw), 1)
+        letter = generator.text_parser.parse_text_response(raw)
+        rows.append((tokens, tokens * (1 - kept), elapsed, len(letter["body"]) == MAX_BODY_PARAGRAPHS))
+    return rows
+
+
+async def run_budgeted(generator: CoverLetterGenerator, prompts):
+    rows = []
+    for prompt, name in prompts:
+        start = time.perf_counter()
+        parser, stats = await generator._generate_letter(prompt, name)
+        elapsed = time.perf_counter() - start
+
+        _, letter = generator._finish_letter(parser, stats)
+        rows.append((stats.get("eval_count", 0), 0.0, elapsed, len(letter["body"]) == MAX_BODY_PARAGRAPHS))
+    return rows
+
+
+def report(name: str, rows):
+    tokens, wasted, seconds, complete = zip(*rows)
+    print(
+        f"{name:12}{statistics.mean(tokens):16.1f}{statistics.mean(wasted):16.1f}"
+        f"{statistics.mean(seconds):14.2f}{f'{sum(complete)}/{len(rows)}':>12}"
+    )
+
+
+async def run():
+    generator = CoverLetterGenerator()
+    if not await generator.llm_client.test_connection():
+        raise SystemExit(f"Ollama model {generator.llm_client.model_name} is not available")
+
+    prompts = [
+        (generator.prompt_builder.build_prompt(resume, job, name), name)
+        for name, resume in CANDIDATES
+        for job in JOBS
+    ]
+
+    # Load the model so the first letter does not include it
+    await generator.llm_client.generate("Say OK.", max_tokens=1)
+
+    fixed = await run_fixed(generator, prompts)
+
+    generator.budget.min_samples = len(fixed)
+    for tokens, wasted, _, complete in fixed:
+        if complete:
+            generator.budget.record(round(tokens - wasted))
+
+    budgeted = await run_budgeted(generator, prompts)
+
+    print("=" * 72)
+    print(f"Cover letter decode tokens - fixed vs budgeted ({generator.llm_client.model_name}, {len(prompts)} letters)")
+    print("=" * 72)
+    print(f"{'settings':12}{'decoded (mean)':>16}{'wasted (mean)':>16}{'seconds':>14}{'complete':>12}")
+    report("fixed", fixed)
+    report("budgeted", budgeted)
+    print(f"\nnum_predict {generator.budget.num_predict()} (was 1000), num_ctx {generator.budget.stats()['num_ctx']}")
+
+    await close_http_client()
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
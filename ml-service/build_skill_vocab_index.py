@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Build the precomputed skill vocabulary index.
+
+Embeds every known skill (skill automaton vocabulary, including
+SKILL_VOCAB_PATH, ATS skill categories and job-feedback keywords) once with
+the job-match embedding model and writes the memory-mappable embeddings
+and vocab x vocab similarity table read by app.services.skill_vocab_index.
+
+Run from the ml-service directory after changing the vocabulary:
+  python build_skill_vocab_index.py
+  python build_skill_vocab_index.py --output-dir /srv/careercraft/skill_vocab_index
+"""
+
+import argparse
+import os
+import time
+
+from app.services.skill_vocab_index import (
+    SKILL_VOCAB_INDEX_DIR,
+    build_vocab_index,
+    collect_vocabulary,
+)
+from app.services.semantic_skill_matcher import EMBEDDING_MODEL_ID, _encode
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the skill vocabulary index")
+    parser.add_argument(
+        "--output-dir",
+        default=SKILL_VOCAB_INDEX_DIR,
+        help="Directory to write the index to (default: SKILL_VOCAB_INDEX_DIR)"
+    )
+    args = parser.parse_args()
+
+    skills = collect_vocabulary()
+    print(f"Embedding {len(skills)} skills with {EMBEDDING_MODEL_ID}...")
+
+    start = time.perf_counter()
+    count = build_vocab_index(skills, args.output_dir, EMBEDDING_MODEL_ID, _encode)
+    elapsed = time.perf_counter() - start
+
+    size = sum(
+        os.path.getsize(os.path.join(args.output_dir, name))
+        for name in os.listdir(args.output_dir)
+    )
+    print(f"Wrote {count} skills to {args.output_dir} ({size / 1e6:.1f} MB) in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
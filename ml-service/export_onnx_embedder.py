@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Export the MiniLM skill embedder to ONNX for SKILL_EMBEDDING_BACKEND=onnx.
+
+Writes model.onnx (fp32), model_int8.onnx (dynamic int8 quantization of
+the weights) and tokenizer.json to the output directory. Pooling and
+normalization are not part of the graph; OnnxBackend applies them.
+
+Requires the export-time packages (not needed to serve the model):
+  pip install torch transformers onnx onnxruntime
+
+Run from the ml-service directory:
+  python export_onnx_embedder.py
+  python export_onnx_embedder.py --output-dir /srv/careercraft/onnx_embedder
+"""
+
+import argparse
+import os
+
+from app.services.embedding_backends import (
+    SKILL_EMBEDDING_ONNX_DIR,
+    ONNX_FP32_FILE,
+    ONNX_INT8_FILE,
+    TOKENIZER_FILE,
+)
+from app.services.semantic_skill_matcher import MODEL_NAME
+
+HF_MODEL = f"sentence-transformers/{MODEL_NAME}"
+
+
+def export(output_dir: str, opset: int = 17) -> None:
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    tokenizer = AutoTokenizer.from_pretrained(HF_MODEL)
+    model = AutoModel.from_pretrained(HF_MODEL)
+    model.eval()
+
+    # tokenizer.json is all OnnxBackend needs (tokenizers library, no transformers)
+    tokenizer.backend_tokenizer.save(os.path.join(output_dir, TOKENIZER_FILE))
+
+    sample = tokenizer(["machine learning", "c++"], padding=True, return_tensors="pt")
+    fp32_path = os.path.join(output_dir, ONNX_FP32_FILE)
+
+    dynamic = {0: "batch", 1: "sequence"}
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            (sample["input_ids"], sample["attention_mask"], sample["token_type_ids"]),
+            fp32_path,
+            input_names=["input_ids", "attention_mask", "token_type_ids"],
+            output_names=["last_hidden_state"],
+            dynamic_axes={
+                "input_ids": dynamic,
+                "attention_mask": dynamic,
+                "token_type_ids": dynamic,
+                "last_hidden_state": dynamic,
+            },
+            opset_version=opset,
+        )
+    print(f"Wrote {fp32_path} ({os.path.getsize(fp32_path) / 1e6:.1f} MB)")
+
+    int8_path = os.path.join(output_dir, ONNX_INT8_FILE)
+    quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+    print(f"Wrote {int8_path} ({os.path.getsize(int8_path) / 1e6:.1f} MB)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the skill embedder to ONNX")
+    parser.add_argument(
+        "--output-dir",
+        default=SKILL_EMBEDDING_ONNX_DIR,
+        help="Directory to write to (default: SKILL_EMBEDDING_ONNX_DIR)"
+    )
+    parser.add_argument("--opset", type=int, default=17, help="ONNX opset version")
+    args = parser.parse_args()
+
+    export(args.output_dir, args.opset)
+
+
+if __name__ == "__main__":
+    main()
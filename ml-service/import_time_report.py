@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Import-time report for service startup.
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter and
+aggregates the per-module timings: the slowest top-level packages
+(summing the own time of their modules) and the slowest app.* modules. Heavy libraries (spaCy, sentence-transformers/torch,
+sklearn, textstat, pymupdf) should not appear here; they are imported on
+first use.
+
+Run from the ml-service directory:
+  python import_time_report.py
+  python import_time_report.py --module app.services.job_matcher --top 25
+"""
+
+import argparse
+import subprocess
+import sys
+from collections import defaultdict
+
+
+def collect(module: str):
+    """
+    Import a module in a fresh interpreter with -X importtime.
+
+    Returns:
+        List of (module name, self microseconds, cumulative microseconds, depth)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr.splitlines()[-1] + "\n")
+        sys.exit(result.returncode)
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        # nesting is shown as two spaces per level after the single separator space
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-module import-time report")
+    parser.add_argument("--module", default="app.main", help="Module to import (default: app.main)")
+    parser.add_argument("--top", type=int, default=15, help="Rows per table")
+    args = parser.parse_args()
+
+    rows = collect(args.module)
+
+    # Per top-level package: sum of its modules' own (self) time
+    packages = defaultdict(int)
+    for name, self_us, _, _ in rows:
+        packages[name.split(".")[0]] += self_us
+
+    # Application modules: own (self) time, so nested app imports are not double counted
+    app_modules = [(name, self_us, cumulative) for name, self_us, cumulative, _ in rows if name.startswith("app.") or name == "app"]
+
+    total = sum(cumulative for _, _, cumulative, depth in rows if depth == 0)
+
+    print("=" * 72)
+    print(f"Import-time report: import {args.module}")
+    print("=" * 72)
+    print(f"Total: {total / 1000:.1f} ms over {len(rows)} modules")
+
+    print()
+    print(f"{'top-level package':40}{'self ms':>16}{'share':>10}")
+    for name, self_us in sorted(packages.items(), key=lambda kv: kv[1], reverse=True)[:args.top]:
+        print(f"{name:40}{self_us / 1000:16.1f}{self_us / max(total, 1):10.1%}")
+
+    print()
+    print(f"{'app module':40}{'self ms':>16}{'cumulative ms':>16}")
+    for name, self_us, cumulative in sorted(app_modules, key=lambda r: r[2], reverse=True)[:args.top]:
+        print(f"{name:40}{self_us / 1000:16.1f}{cumulative / 1000:16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Test Script for Skills Section Extraction
+
+Checks extract_skills_from_section on common skill spellings. Needs no
+running service.
+
+Run from the ml-service directory:
+  python test_skill_extraction.py
+"""
+
+from app.services.skill_extractor import extract_skills_from_section
+
+
+def test_dotted_framework_names():
+    """"React.js" style names still yield the base skill"""
+    skills = extract_skills_from_section("Skills: React.js, Node.js, Express.js, Vue.js, MongoDB, Python")
+    assert skills == ["express", "mongodb", "node.js", "python", "react"], skills
+
+    # Undotted spellings of a dotted skill still match it
+    assert extract_skills_from_section("NodeJS, Node JS") == ["node.js"]
+
+
+def test_word_boundaries():
+    """Short skills do not match inside longer words"""
+    assert extract_skills_from_section("C++, C#") == ["c#", "c++"]
+    assert extract_skills_from_section("Reactive programming, GitHubber") == []
+
+
+if __name__ == "__main__":
+    for test in (test_dotted_framework_names, test_word_boundaries):
+        test()
+        print(f"✅ {test.__name__}")